@@ -0,0 +1,100 @@
+"""
+Benchmark of bid recommendations on synthetic keyword stats: loading daily
+report records into arrays, and recomputing the bids of every keyword.
+Needs NumPy (pip install 'searchadscli[bids]').
+
+Exits with status 1 when recomputing goes over its budget:
+
+    python benchmarks/bench_bids.py --keywords 200000 --budget-ms 1000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from searchadscli.utils.bids import load_keyword_stats, recommend_bids
+
+
+def keyword_stats(count: int, seed: int = 1) -> dict:
+    rng = np.random.default_rng(seed)
+    taps = rng.poisson(rng.gamma(1.5, 20, count)).astype(np.float64)
+    installs = rng.binomial(taps.astype(np.int64), rng.beta(2, 8, count))
+    return {
+        "keywordId": np.arange(count, dtype=np.int64),
+        "campaignId": rng.integers(1, 50, count),
+        "adGroupId": rng.integers(1, 200, count),
+        "keyword": np.array([f"keyword {idx}" for idx in range(count)], dtype=object),
+        "matchType": np.full(count, "EXACT", dtype=object),
+        "bid": rng.uniform(0.2, 5, count).round(2),
+        "taps": taps,
+        "installs": installs.astype(np.float64),
+        "spend": (taps * rng.uniform(0.1, 3, count)).round(2),
+    }
+
+
+def report_records(keywords: int, days: int, seed: int = 1):
+    # Daily keyword report records as they come out of the report cache
+    rng = random.Random(seed)
+    for day in range(days):
+        for keyword_id in range(keywords):
+            taps = rng.randint(0, 5)
+            yield {
+                "campaignId": keyword_id % 50,
+                "adGroupId": keyword_id % 200,
+                "keywordId": keyword_id,
+                "keyword": f"keyword {keyword_id}",
+                "matchType": "EXACT",
+                "bidAmount": "1.50",
+                "date": f"2024-01-{day + 1:02d}",
+                "taps": taps,
+                "installs": rng.randint(0, taps),
+                "localSpend": f"{taps * 1.2:.2f}",
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keywords", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000)
+    parser.add_argument(
+        "--load-keywords",
+        type=int,
+        default=20_000,
+        help="Keywords of the 30 day report loaded into arrays.",
+    )
+    args = parser.parse_args()
+
+    records = list(report_records(args.load_keywords, 30))
+    start = time.perf_counter()
+    load_keyword_stats(records)
+    elapsed = time.perf_counter() - start
+    print(
+        f"load       {len(records):>9,} records {elapsed * 1000:8.1f} ms "
+        f"{len(records) / elapsed:>12,.0f} records/s"
+    )
+
+    stats = keyword_stats(args.keywords)
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        recommend_bids(stats, target_cpa=2.5)
+        timings.append(time.perf_counter() - start)
+
+    recommend_ms = statistics.median(timings) * 1000
+    print(
+        f"recommend  {args.keywords:>9,} keywords {recommend_ms:7.1f} ms "
+        f"(budget {args.budget_ms:.0f} ms)"
+    )
+
+    if recommend_ms > args.budget_ms:
+        print("FAIL: recommending bids is over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
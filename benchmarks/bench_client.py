@@ -0,0 +1,78 @@
+"""
+Compare per-call latency of bare `requests.post` against the pooled
+`SearchAdsClient` using a local stub server.
+
+    python benchmarks/bench_client.py --calls 500
+
+The client's rate limit is raised far above what the stub server can
+serve, so the numbers measure the connection pool rather than the
+default 10 requests per second.
+"""
+
+import argparse
+import datetime as dt
+import statistics
+import time
+from types import SimpleNamespace
+
+import requests
+
+from searchadscli.utils.api_client import SearchAdsClient
+from stub_server import start_stub_server
+
+
+def timed_calls(call, calls: int) -> list[float]:
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        response = call()
+        response.content
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label: str, timings: list[float]):
+    timings_ms = sorted(t * 1000 for t in timings)
+    p95 = timings_ms[int(len(timings_ms) * 0.95) - 1]
+    print(
+        f"{label:<18} mean {statistics.mean(timings_ms):7.3f} ms"
+        f"  p50 {statistics.median(timings_ms):7.3f} ms  p95 {p95:7.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=300)
+    args = parser.parse_args()
+
+    server = start_stub_server()
+    host, port = server.server_address
+    base_url = f"http://{host}:{port}/api/v4"
+
+    # A context with a still-valid token so no OAuth round trip is made,
+    # and a rate limit that never holds a call back.
+    ctx = SimpleNamespace(
+        obj={
+            "config": {"rate_limit": 1_000_000},
+            "access_token": "benchmark",
+            "access_token_expiry": dt.datetime.utcnow() + dt.timedelta(hours=1),
+        }
+    )
+    client = SearchAdsClient(ctx, "1234", base_url=base_url)
+
+    def bare_call():
+        headers = {"Authorization": "Bearer benchmark", "X-AP-Context": "orgId=1234"}
+        return requests.post(f"{base_url}/campaigns/find", headers=headers, json={})
+
+    def pooled_call():
+        return client.post("campaigns/find", json={})
+
+    report("requests.post", timed_calls(bare_call, args.calls))
+    report("SearchAdsClient", timed_calls(pooled_call, args.calls))
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+End-to-end benchmark of CLI commands against the bundled fake Search Ads
+API (searchadscli/fake_server.py), at different account sizes. Every
+command runs as a real `searchadscli` process with a home directory of its
+own, so startup, OAuth, HTTP, rate limiting and planning are all measured.
+
+    python benchmarks/bench_e2e.py --sizes small medium --runs 3 --latency-ms 30
+    python benchmarks/bench_e2e.py --save baseline.json
+    python benchmarks/bench_e2e.py --baseline baseline.json --tolerance 0.2
+    python benchmarks/bench_e2e.py --daemon --baseline baseline.json
+
+Exits with status 1 when a command fails, or when a median is slower than
+the baseline by more than the tolerance.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+from Crypto.PublicKey import ECC
+
+from searchadscli.fake_server import SEED_COUNTRIES, FakeSearchAds, start_fake_server
+
+ORG_ID = "1"
+APP_ID = 1
+
+# Campaign sets of three campaigns with one country each, keywords in every
+# keyword ad group, negatives in every campaign, and what each run adds
+SIZES = {
+    "small": {
+        "campaign_sets": 2,
+        "keywords_per_adgroup": 200,
+        "negatives_per_campaign": 50,
+        "new_keywords": 200,
+        "new_negatives": 100,
+    },
+    "medium": {
+        "campaign_sets": 10,
+        "keywords_per_adgroup": 2_000,
+        "negatives_per_campaign": 500,
+        "new_keywords": 2_000,
+        "new_negatives": 1_000,
+    },
+    "large": {
+        "campaign_sets": 20,
+        "keywords_per_adgroup": 4_000,
+        "negatives_per_campaign": 2_000,
+        "new_keywords": 5_000,
+        "new_negatives": 3_000,
+    },
+}
+
+COMMANDS = ["get-campaigns", "setup-campaigns", "add-keywords", "add-negative-keywords"]
+
+
+def write_config(home: str, server, options: dict):
+    private_key_file = os.path.join(home, "private-key.pem")
+    with open(private_key_file, "wt") as f:
+        f.write(ECC.generate(curve="P-256").export_key(format="PEM"))
+
+    config = {
+        "private_key_file": private_key_file,
+        "client_id": f"SEARCHADS.{uuid.uuid4()}",
+        "team_id": f"SEARCHADS.{uuid.uuid4()}",
+        "key_id": str(uuid.uuid4()),
+        "org_id": ORG_ID,
+        "app_id": APP_ID,
+        "api_base_url": server.api_base_url,
+        "auth_url": server.auth_url,
+        **options,
+    }
+    with open(os.path.join(home, ".searchads_cli_config.json"), "w") as f:
+        json.dump(config, f)
+
+
+def new_countries():
+    # Setup creates campaigns in a country nothing was seeded in on every
+    # run, so it doesn't stop to ask about pausing campaigns
+    for first in reversed(string.ascii_uppercase):
+        for second in string.ascii_uppercase:
+            if first + second not in SEED_COUNTRIES:
+                yield first + second
+
+
+def command_args(command: str, home: str, size: dict, run: int, countries) -> tuple:
+    """
+    Arguments and stdin of one run of a command. Every run adds keywords
+    that don't exist yet, so each one does the same work.
+    """
+
+    if command == "get-campaigns":
+        return ["get-campaigns", "--format", "ndjson"], None
+
+    if command == "setup-campaigns":
+        # Continue, countries, default bid, three default budgets
+        return ["setup-campaigns"], f"\n{next(countries)}\n1\n\n\n\n"
+
+    path = os.path.join(home, f"{command}-{run}.txt")
+    if command == "add-keywords":
+        texts = [f"new keyword {run} {idx}" for idx in range(size["new_keywords"])]
+        args = ["add-keywords", "--type", "exact", "--countries", "US", "--file", path]
+    else:
+        texts = [f"new negative {run} {idx}" for idx in range(size["new_negatives"])]
+        args = ["add-negative-keywords", "--file", path]
+
+    with open(path, "w") as f:
+        f.write("\n".join(texts))
+    return args, None
+
+
+def run_command(
+    args: list[str], stdin: str | None, home: str, module: str = "searchadscli.main"
+) -> float:
+    env = {**os.environ, "HOME": home}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", module, *args],
+        input=stdin,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    elapsed = time.perf_counter() - start
+
+    if result.returncode != 0:
+        print(result.stdout[-2000:])
+        print(result.stderr[-2000:], file=sys.stderr)
+        raise RuntimeError(f"{' '.join(args)} exited with {result.returncode}")
+    return elapsed
+
+
+def start_daemon(home: str) -> subprocess.Popen:
+    daemon = subprocess.Popen(
+        [sys.executable, "-m", "searchadscli.main", "daemon"],
+        stdout=subprocess.DEVNULL,
+        env={**os.environ, "HOME": home},
+    )
+    socket_path = os.path.join(home, ".searchads_cli_daemon.sock")
+    while not os.path.exists(socket_path):
+        if daemon.poll() is not None:
+            raise RuntimeError("The daemon exited on startup")
+        time.sleep(0.05)
+    return daemon
+
+
+def bench_size(name: str, size: dict, args) -> dict:
+    api = FakeSearchAds()
+    api.seed(
+        ORG_ID,
+        APP_ID,
+        size["campaign_sets"],
+        size["keywords_per_adgroup"],
+        size["negatives_per_campaign"],
+    )
+    server = start_fake_server(
+        api=api,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=1,
+    )
+
+    options = {"adgroup_cache_ttl": 0}
+    if args.rate_limit:
+        options["rate_limit"] = args.rate_limit
+
+    results = {}
+    countries = new_countries()
+
+    with tempfile.TemporaryDirectory() as home:
+        write_config(home, server, options)
+
+        # Through the launcher, commands are forwarded to the daemon
+        daemon = start_daemon(home) if args.daemon else None
+        module = "searchadscli.launcher" if args.daemon else "searchadscli.main"
+
+        for command in args.commands:
+            timings = []
+            stats_before = dict(server.stats)
+
+            for run in range(args.runs):
+                command_line, stdin = command_args(command, home, size, run, countries)
+                timings.append(run_command(command_line, stdin, home, module))
+
+            responses = {
+                status: (count - stats_before.get(status, 0)) / args.runs
+                for status, count in server.stats.items()
+            }
+            results[f"{name}/{command}"] = {
+                "median": statistics.median(timings),
+                "min": min(timings),
+                "requests": sum(responses.values()),
+                "throttled": responses.get(429, 0),
+                "errors": responses.get(500, 0),
+            }
+
+        if daemon:
+            daemon.terminate()
+            daemon.wait()
+
+    server.shutdown()
+    server.server_close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"]
+    )
+    parser.add_argument("--commands", nargs="+", choices=COMMANDS, default=COMMANDS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--throttle-rate", type=float, default=0)
+    parser.add_argument("--retry-after", type=float, default=0.2)
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Requests per second the CLI may send. The CLI's default if not set.",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run the commands through a `searchadscli daemon`.",
+    )
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare against results saved earlier.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.sizes:
+        size = SIZES[name]
+        print(
+            f"{name}: {size['campaign_sets']} campaign sets, "
+            f"{size['keywords_per_adgroup']:,} keywords per ad group, "
+            f"{size['negatives_per_campaign']:,} negatives per campaign"
+        )
+        results.update(bench_size(name, size, args))
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(
+        f"{'command':<30} {'median':>8} {'min':>8} {'requests':>9} "
+        f"{'429s':>6} {'500s':>6} {'baseline':>9}"
+    )
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key, {}).get("median")
+        compared = (
+            f"{(result['median'] / previous - 1) * 100:+8.0f}%" if previous else ""
+        )
+        print(
+            f"{key:<30} {result['median']:7.2f}s {result['min']:7.2f}s "
+            f"{result['requests']:9.0f} {result['throttled']:6.0f} "
+            f"{result['errors']:6.0f} {compared:>9}"
+        )
+        if previous and result["median"] > previous * (1 + args.tolerance):
+            regressions.append(key)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    for key in regressions:
+        print(f"FAIL: {key} is more than {args.tolerance:.0%} slower than the baseline")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
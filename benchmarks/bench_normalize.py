@@ -0,0 +1,73 @@
+"""
+Benchmark of keyword normalization on scraped-looking search terms: the
+original list-scan dedup against the hashing normalizer.
+
+    python benchmarks/bench_normalize.py --keywords 1000000
+"""
+
+import argparse
+import random
+import time
+
+from searchadscli.utils.keyword_normalize import normalize_keywords
+
+WORDS = [
+    "photo", "editor", "free", "camera", "filter", "collage", "video", "maker",
+    "pro", "app", "best", "cute", "retro", "film", "ｆｒｅｅ", "édition", "beauty",
+]  # fmt: skip
+
+
+def search_terms(count: int, seed: int = 1) -> list[str]:
+    # Mixed case, padded spacing and full-width characters, with some repeats
+    rng = random.Random(seed)
+    terms = []
+    for _ in range(count):
+        term = " ".join(rng.choices(WORDS, k=rng.randint(1, 4)))
+        if rng.random() < 0.3:
+            term = term.title()
+        if rng.random() < 0.2:
+            term = "  " + term.replace(" ", "  ") + " "
+        terms.append(term + str(rng.randint(0, count // 2)))
+    return terms
+
+
+def list_scan_dedup(keywords: list[str]) -> list[str]:
+    # Mirrors validate_keywords before the normalizer.
+    sanitized_keywords = []
+    for keyword in keywords:
+        sanitized_keyword = keyword.strip().lower()
+        if sanitized_keyword not in sanitized_keywords:
+            sanitized_keywords.append(sanitized_keyword)
+    return sanitized_keywords
+
+
+def bench(label: str, call, keywords: list[str]):
+    start = time.perf_counter()
+    result = call(keywords)
+    elapsed = time.perf_counter() - start
+    unique = len(result[0] if isinstance(result, tuple) else result)
+    print(
+        f"{label:<10} {len(keywords):>9,} terms {elapsed:8.3f} s "
+        f"{len(keywords) / elapsed:>12,.0f} terms/s {unique:>9,} unique"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keywords", type=int, default=1_000_000)
+    parser.add_argument(
+        "--list-scan-keywords",
+        type=int,
+        default=10_000,
+        help="The list scan is quadratic, so it runs on a smaller sample.",
+    )
+    args = parser.parse_args()
+
+    sample = search_terms(args.list_scan_keywords)
+    bench("list scan", list_scan_dedup, sample)
+    bench("normalize", normalize_keywords, sample)
+    bench("normalize", normalize_keywords, search_terms(args.keywords))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Cold-start benchmark of the CLI entry point: the import time of
+`searchadscli.main` from `python -X importtime`, and the wall time of
+`searchadscli --help`. Also checks that the HTTP and crypto stacks aren't
+imported until a command needs them.
+
+Exits with status 1 when a median goes over its budget, so it can run in CI:
+
+    python benchmarks/bench_startup.py --runs 10 --import-budget-ms 300
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules only commands that call the API should load
+LAZY_MODULES = ["requests", "authlib", "Crypto", "rich.progress"]
+
+
+def import_times() -> dict[str, int]:
+    """
+    Cumulative import time in microseconds of every module imported by
+    `searchadscli.main`, from a fresh interpreter.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import searchadscli.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def help_time() -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "searchadscli.main", "--help"],
+        capture_output=True,
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def eagerly_loaded() -> list[str]:
+    code = (
+        "import sys, searchadscli.main; "
+        f"print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=300)
+    parser.add_argument("--help-budget-ms", type=float, default=600)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    import_ms = statistics.median(run["searchadscli.main"] for run in runs) / 1000
+    help_ms = statistics.median(help_time() for _ in range(args.runs)) * 1000
+
+    print("Slowest imports (cumulative, last run):")
+    for name, micros in sorted(runs[-1].items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+    print(
+        f"import searchadscli.main {import_ms:8.1f} ms (budget {args.import_budget_ms:.0f} ms)"
+    )
+    print(
+        f"searchadscli --help      {help_ms:8.1f} ms (budget {args.help_budget_ms:.0f} ms)"
+    )
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append("import time is over budget")
+    if help_ms > args.help_budget_ms:
+        failures.append("--help time is over budget")
+
+    loaded = eagerly_loaded()
+    if loaded:
+        failures.append(f"imported at startup: {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Micro-benchmark of the client secret step of a token refresh: the original
+parse-twice-and-sign path against the cached secret and memoized key.
+
+    python benchmarks/bench_token.py --iterations 200
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from authlib.jose import jwt
+from Crypto.PublicKey import ECC
+
+from searchadscli.utils import access_token
+
+
+def uncached_client_secret(config: dict) -> str:
+    # Mirrors the refresh path before secrets and keys were cached.
+    with open(config["private_key_file"], "rt") as file:
+        ECC.import_key(file.read())
+
+    issued_at_timestamp = int(time.time())
+    headers = {"alg": "ES256", "kid": config["key_id"]}
+    payload = {
+        "sub": config["client_id"],
+        "aud": "https://appleid.apple.com",
+        "iat": issued_at_timestamp,
+        "exp": issued_at_timestamp + 86400 * 180,
+        "iss": config["team_id"],
+    }
+
+    with open(config["private_key_file"], "rt") as file:
+        private_key = ECC.import_key(file.read())
+
+    return jwt.encode(
+        header=headers, payload=payload, key=private_key.export_key(format="PEM")
+    ).decode("UTF-8")
+
+
+def bench(label: str, call, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed / iterations * 1000:8.3f} ms per refresh")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        private_key_file = os.path.join(tmp, "private-key.pem")
+        with open(private_key_file, "wt") as f:
+            f.write(ECC.generate(curve="P-256").export_key(format="PEM"))
+
+        access_token.CLIENT_SECRET_PATH = os.path.join(tmp, "client_secret.json")
+
+        config = {
+            "private_key_file": private_key_file,
+            "client_id": "SEARCHADS.00000000-0000-0000-0000-000000000000",
+            "team_id": "SEARCHADS.00000000-0000-0000-0000-000000000000",
+            "key_id": "00000000-0000-0000-0000-000000000000",
+        }
+        ctx = SimpleNamespace(obj={"config": config})
+
+        bench("before", lambda: uncached_client_secret(config), args.iterations)
+        bench("after", lambda: access_token.get_client_secret(ctx), args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import datetime
+import sys
+import typer
+from searchadscli.utils.api_client import SearchAdsAPIError
+from searchadscli.utils.bids import (
+    REASONS,
+    require_numpy,
+    load_keyword_stats,
+    recommend_bids as recommend,
+    recommendation_records,
+    read_bid_updates,
+)
+from searchadscli.utils.campaigns_api import get_campaigns
+from searchadscli.utils.config import get_org_id, ReportLevel, Granularity
+from searchadscli.utils.keyword_plan import plan_bid_updates, apply_plan, print_plan
+from searchadscli.utils.output import OutputFormat, write_records
+from searchadscli.utils.report_cache import cached_report
+from searchadscli.utils.reports_api import DEFAULT_CHUNK_DAYS
+from rich.console import Console
+from rich.table import Table
+
+
+def recommend_bids(
+    ctx: typer.Context,
+    target_cpa: float,
+    days: int = 30,
+    campaign_ids: list[int] | None = None,
+    output: str = "bids.csv",
+    format: OutputFormat = OutputFormat.csv,
+    max_change: float = 0.25,
+    min_taps: int = 10,
+):
+    """
+    Suggest keyword bids that meet a target CPA from the keyword report of
+    the last `days` full days, and write them to `output` for `apply-bids`.
+
+    The report is read through the report cache, so only days that aren't
+    cached yet are fetched.
+    """
+
+    require_numpy()
+    org_id = get_org_id(ctx)
+    console = Console(stderr=True)
+
+    if not campaign_ids:
+        try:
+            with console.status("[dots2]Fetching campaigns..."):
+                campaign_ids = [
+                    campaign["id"]
+                    for campaign in get_campaigns(ctx, org_id, prefetch=True)
+                ]
+        except SearchAdsAPIError as e:
+            typer.echo(f"Failed to fetch campaigns. Status Code: {e.status_code}")
+            raise typer.Exit(code=1)
+
+    end = datetime.datetime.utcnow().date() - datetime.timedelta(days=1)
+    start = end - datetime.timedelta(days=days - 1)
+
+    records, failures, fetched = cached_report(
+        ctx,
+        org_id,
+        ReportLevel.keywords,
+        campaign_ids,
+        start,
+        end,
+        DEFAULT_CHUNK_DAYS[Granularity.daily],
+    )
+
+    with console.status(f"[dots2]Loading keyword report ({fetched} requests)..."):
+        stats = load_keyword_stats(records)
+
+    if failures:
+        for (campaign_id, chunk_start, chunk_end), error in failures:
+            messages = (
+                error.messages if isinstance(error, SearchAdsAPIError) else [str(error)]
+            )
+            for message in messages:
+                typer.echo(
+                    f"Failed to fetch campaign {campaign_id} {chunk_start} to {chunk_end}: {message}"
+                )
+        typer.echo("No bids recommended, the keyword report is incomplete.")
+        raise typer.Exit(code=1)
+
+    recommendations = recommend(stats, target_cpa, max_change, min_taps)
+
+    stream = sys.stdout if output == "-" else open(output, "w", newline="")
+    try:
+        count = write_records(
+            recommendation_records(recommendations), format, stream=stream
+        )
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    table = Table(title=f"Bids for a ${target_cpa:.2f} CPA, {start} to {end}")
+    table.add_column("Recommendation")
+    table.add_column("Keywords", justify="right", style="cyan")
+
+    reasons = recommendations["reason"].tolist()
+    for reason in REASONS.values():
+        table.add_row(reason, str(reasons.count(reason)))
+
+    console.print(table)
+    if output != "-":
+        typer.echo(
+            f"Wrote {count} keywords to {output}. Apply with: apply-bids {output}"
+        )
+
+
+def apply_bids(ctx: typer.Context, file: str, dry_run: bool = False):
+    """
+    Send the changed bids of a `recommend-bids` file as bulk bid updates.
+    """
+
+    org_id = get_org_id(ctx)
+
+    try:
+        updates = read_bid_updates(file)
+    except (OSError, ValueError) as e:
+        typer.echo(f"Error: Could not read {file}: {e}")
+        raise typer.Exit(code=1)
+
+    if not updates:
+        typer.echo("No bid changes to apply.")
+        return
+
+    plan = plan_bid_updates(updates)
+
+    if dry_run:
+        print_plan(plan)
+        return
+
+    failed = apply_plan(ctx, org_id, plan, "Updating bids")
+    if failed:
+        raise typer.Exit(code=1)
+
+    typer.echo(f"Updated the bids of {len(updates)} keywords.")
@@ -1,4 +1,5 @@
 import typer
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from searchadscli.utils.campaigns_api import (
     find_active_campaigns,
     pause_campaign,
@@ -6,7 +7,17 @@ from searchadscli.utils.campaigns_api import (
     create_campaign,
 )
 from searchadscli.utils.adgroups_api import create_adgroup
+from searchadscli.utils.campaign_index import invalidate_campaign_index
+from searchadscli.utils.api_client import SearchAdsAPIError
+from searchadscli.utils.concurrency import map_concurrently, get_concurrency
 from searchadscli.utils.config import get_org_id, CAMPAIGN_STRUCTURE, CampaignType
+from searchadscli.utils.output import (
+    OutputFormat,
+    write_records,
+    amount_of,
+    currency_of,
+)
+from searchadscli.utils.profiles import run_for_targets
 from rich.table import Table
 from rich.console import Console
 from rich.prompt import Prompt
@@ -14,43 +25,133 @@ from rich.prompt import IntPrompt
 from rich.prompt import FloatPrompt
 from rich.panel import Panel
 
-
-def list_campaigns(ctx: typer.Context):
+# Columns of `get-campaigns --format csv`
+CAMPAIGN_CSV_COLUMNS = {
+    "id": lambda campaign: campaign["id"],
+    "name": lambda campaign: campaign["name"],
+    "adamId": lambda campaign: campaign.get("adamId", ""),
+    "countriesOrRegions": lambda campaign: " ".join(
+        campaign.get("countriesOrRegions", [])
+    ),
+    "dailyBudget": lambda campaign: amount_of(campaign, "dailyBudgetAmount"),
+    "currency": lambda campaign: currency_of(campaign, "dailyBudgetAmount"),
+    "status": lambda campaign: campaign.get("status", ""),
+    "servingStatus": lambda campaign: campaign.get("servingStatus", ""),
+    "displayStatus": lambda campaign: campaign.get("displayStatus", ""),
+}
+
+
+def list_campaigns(ctx: typer.Context, format: OutputFormat = OutputFormat.table):
     """
     Fetch and display the names of Apple Search Ads campaigns.
+
+    Other formats than `table` are streamed to stdout page by page as the
+    campaigns are fetched.
     """
 
+    if ctx.obj.get("targets"):
+        list_campaigns_for_targets(ctx, format)
+        return
+
     orgId = get_org_id(ctx)
 
+    if format != OutputFormat.table:
+        try:
+            write_records(
+                get_campaigns(ctx, orgId, prefetch=True), format, CAMPAIGN_CSV_COLUMNS
+            )
+        except SearchAdsAPIError as e:
+            typer.echo(
+                f"Failed to fetch campaigns. Status Code: {e.status_code}", err=True
+            )
+            raise typer.Exit(code=1)
+        return
+
     console = Console()
 
-    with console.status("[dots2]Fetching campaigns..."):
-        response = get_campaigns(ctx, orgId)
-
-    if response.status_code == 200:
-        data = response.json()
-
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("Id")
-        table.add_column("Name")
-        table.add_column("Daily Budget")
-        table.add_column("Status")
-
-        for campaign in data.get("data", []):
-            daily_budget = f"{campaign['dailyBudgetAmount']['amount']} {campaign['dailyBudgetAmount']['currency']}"
-            name = campaign["name"]
-            formatted_name = name[:50] + "..." if len(name) > 50 else name
-            table.add_row(
-                str(campaign["id"]),
-                formatted_name,
-                daily_budget,
-                campaign["displayStatus"],
-            )
+    table = campaigns_table()
 
-        console.print(table)
+    try:
+        with console.status("[dots2]Fetching campaigns..."):
+            for campaign in get_campaigns(ctx, orgId, prefetch=True):
+                table.add_row(*campaign_row(campaign))
+    except SearchAdsAPIError as e:
+        typer.echo(f"Failed to fetch campaigns. Status Code: {e.status_code}")
+        return
 
+    console.print(table)
+
+
+def list_campaigns_for_targets(
+    ctx: typer.Context, format: OutputFormat = OutputFormat.table
+):
+    """
+    Fetch the campaigns of every selected org at the same time and show
+    them in one table, or one stream of records tagged with their profile.
+    """
+
+    console = Console(stderr=format != OutputFormat.table)
+    targets = ctx.obj["targets"]
+
+    def fetch(child: typer.Context) -> list[dict]:
+        return list(get_campaigns(child, get_org_id(child), prefetch=True))
+
+    with console.status(f"[dots2]Fetching campaigns for {len(targets)} orgs..."):
+        results = run_for_targets(ctx, fetch)
+
+    failures = [(label, error) for label, _, error in results if error]
+    records = (
+        (label, campaign)
+        for label, campaigns, error in results
+        if not error
+        for campaign in campaigns
+    )
+
+    if format == OutputFormat.table:
+        table = campaigns_table("Profile")
+        for label, campaign in records:
+            table.add_row(label, *campaign_row(campaign))
+        console.print(table)
     else:
-        typer.echo(f"Failed to fetch campaigns. Status Code: {response.status_code}")
+        write_records(
+            ({"profile": label, **campaign} for label, campaign in records),
+            format,
+            {"profile": lambda record: record["profile"], **CAMPAIGN_CSV_COLUMNS},
+        )
+
+    for label, error in failures:
+        reason = (
+            f"Status Code: {error.status_code}"
+            if isinstance(error, SearchAdsAPIError)
+            else str(error)
+        )
+        typer.echo(f"Failed to fetch campaigns for {label}. {reason}", err=True)
+
+    if failures:
+        raise typer.Exit(code=1)
+
+
+def campaigns_table(*leading_columns: str) -> Table:
+    table = Table(show_header=True, header_style="bold magenta")
+    for column in leading_columns:
+        table.add_column(column)
+    table.add_column("Id")
+    table.add_column("Name")
+    table.add_column("Daily Budget")
+    table.add_column("Status")
+    return table
+
+
+def campaign_row(campaign: dict) -> tuple[str, str, str, str]:
+    daily_budget = f"{campaign['dailyBudgetAmount']['amount']} {campaign['dailyBudgetAmount']['currency']}"
+    name = campaign["name"]
+    formatted_name = name[:50] + "..." if len(name) > 50 else name
+    return (
+        str(campaign["id"]),
+        formatted_name,
+        daily_budget,
+        campaign["displayStatus"],
+    )
 
 
 def create_campaigns(ctx: typer.Context):
@@ -70,29 +171,34 @@ def create_campaigns(ctx: typer.Context):
     targeting_prompt()
     countries = ask_country_targeting()
 
-    with console.status("[dots2]Checking for any active campaigns..."):
-        response = find_active_campaigns(ctx, orgId, countries)
-
-    if response.status_code == 200:
-        enabled_campaigns = response.json().get("data", [])
-
-        if enabled_campaigns:
-            for camp in enabled_campaigns:
-                typer.echo(
-                    f"Campaign: {camp['name']} - Status: {camp['displayStatus']}"
-                )
-
-            confirmation = Prompt.ask(
-                "Do you want to pause all enabled campaigns in these countries first?",
-                choices=["Y", "n"],
-                default="Y",
-            )
-            if confirmation.lower() == "y":
-                campaign_ids_to_pause = [
-                    campaign["id"] for campaign in enabled_campaigns
-                ]
-                for campaign_id in campaign_ids_to_pause:
-                    response = pause_campaign(ctx, orgId, campaign_id)
+    try:
+        with console.status("[dots2]Checking for any active campaigns..."):
+            enabled_campaigns = list(find_active_campaigns(ctx, orgId, countries))
+    except SearchAdsAPIError as e:
+        typer.echo(f"Error finding campaigns. Status code: {e.response.text}")
+        return
+
+    if enabled_campaigns:
+        for camp in enabled_campaigns:
+            typer.echo(f"Campaign: {camp['name']} - Status: {camp['displayStatus']}")
+
+        confirmation = Prompt.ask(
+            "Do you want to pause all enabled campaigns in these countries first?",
+            choices=["Y", "n"],
+            default="Y",
+        )
+        if confirmation.lower() == "y":
+            campaign_ids_to_pause = [campaign["id"] for campaign in enabled_campaigns]
+            pause_failed = False
+
+            with console.status("[dots2]Pausing campaigns..."):
+                for campaign_id, response, error in map_concurrently(
+                    lambda campaign_id: pause_campaign(ctx, orgId, campaign_id),
+                    campaign_ids_to_pause,
+                    get_concurrency(ctx),
+                ):
+                    if error:
+                        raise error
 
                     if response.status_code == 200:
                         typer.echo(f"Campaign {campaign_id} paused successfully!")
@@ -100,95 +206,155 @@ def create_campaigns(ctx: typer.Context):
                         typer.echo(
                             f"Failed to pause campaign {campaign_id}. Status Code: {response.text}"
                         )
-                        raise typer.Exit(code=1)
-
-        # Targeting criteria limits results, so let's hold off on this for now
-        # device = ask_device_targeting()
-        # age_min = ask_age_targeting("min")
-        # age_max = ask_age_targeting("max")
-        # gender = ask_for_gender_targeting()
-        default_bid = ask_for_default_bid()
-        discovery_budget = ask_budget(CampaignType.discovery)
-        competitor_budget = ask_budget(CampaignType.competitor)
-        exact_budget = ask_budget(CampaignType.exact)
-
-        campaign_budgets = {
-            CampaignType.discovery: discovery_budget,
-            CampaignType.competitor: competitor_budget,
-            CampaignType.exact: exact_budget,
-        }
+                        pause_failed = True
+
+            if pause_failed:
+                raise typer.Exit(code=1)
+
+    # Targeting criteria limits results, so let's hold off on this for now
+    # device = ask_device_targeting()
+    # age_min = ask_age_targeting("min")
+    # age_max = ask_age_targeting("max")
+    # gender = ask_for_gender_targeting()
+    default_bid = ask_for_default_bid()
+    discovery_budget = ask_budget(CampaignType.discovery)
+    competitor_budget = ask_budget(CampaignType.competitor)
+    exact_budget = ask_budget(CampaignType.exact)
+
+    campaign_budgets = {
+        CampaignType.discovery: discovery_budget,
+        CampaignType.competitor: competitor_budget,
+        CampaignType.exact: exact_budget,
+    }
 
-        success_messages = []
-        error_messages = []
+    with console.status("[dots2]Creating campaigns..."):
+        success_messages, error_messages = create_campaign_structure(
+            ctx, orgId, adam_id, campaign_budgets, countries, default_bid
+        )
+    # A daemon keeps the index between commands, pick up the new set
+    invalidate_campaign_index(ctx, orgId)
 
-        with console.status("[dots2]Creating campaigns..."):
-            for campaign_type, budget in campaign_budgets.items():
-                response = create_campaign(
-                    ctx, orgId, adam_id, budget, countries, campaign_type
-                )
+    for message in success_messages:
+        console.print(Panel(message, style="green", title="Success"))
 
-                response_data = response.json()
+    for message in error_messages:
+        console.print(Panel(message, style="red", title="Error"))
 
-                if response and not response_data.get("error"):
-                    campaign_data = response_data.get("data", {})
-                    campaign_id = campaign_data.get("id")
+    console.print("Campaign creation process finished!", style="bold")
 
-                    if campaign_id:
-                        campaign_adgroups = CAMPAIGN_STRUCTURE[campaign_type].get(
-                            "adgroups", []
-                        )
+    warning_message = (
+        "Do not modify any campaign or ad group names from the Apple Search Ads dashboard."
+        "\nThe SearchAds CLI relies on a particular naming convention for keyword management."
+    )
+    console.print(
+        Panel(
+            warning_message,
+            title="Warning",
+            style="bold yellow",
+            border_style="yellow",
+        )
+    )
 
-                        for adgroup in campaign_adgroups:
-                            adgroup_response = create_adgroup(
-                                ctx,
-                                orgId,
-                                campaign_id,
-                                adgroup.get("name"),
-                                default_bid,
-                                adgroup.get("searchMatch", False),
-                            )
-
-                            adgroup_data = adgroup_response.json()
-
-                            if adgroup_response and not adgroup_data.get("error"):
-                                success_messages.append(
-                                    f"Successfully created {adgroup.get('name')} adgroup for {campaign_type.value} campaign with ID: {campaign_id}"
-                                )
-                            else:
-                                error_messages.append(
-                                    f"Failed to create ad groups of type {adgroup.get('name')} for {campaign_type.value} campaign. Error: {adgroup_data.get('error')}"
-                                )
-                    else:
-                        error_messages.append(
-                            f"Unexpected response structure while creating {campaign_type.value} campaign. No ID found."
+
+def create_campaign_structure(
+    ctx: typer.Context,
+    orgId: str,
+    adam_id: int,
+    campaign_budgets: dict,
+    countries: list[str],
+    default_bid: float,
+):
+    """
+    Create the campaigns and their ad groups as a dependency graph.
+    All campaigns are created at once and each campaign's ad groups are
+    started as soon as its ID is known. Messages are returned in campaign
+    order, the same as creating everything one by one.
+    """
+
+    campaign_messages = {campaign_type: [] for campaign_type in campaign_budgets}
+    adgroup_futures = {campaign_type: [] for campaign_type in campaign_budgets}
+
+    with ThreadPoolExecutor(max_workers=get_concurrency(ctx)) as executor:
+        campaign_futures = {
+            executor.submit(
+                create_campaign, ctx, orgId, adam_id, budget, countries, campaign_type
+            ): campaign_type
+            for campaign_type, budget in campaign_budgets.items()
+        }
+
+        for future in as_completed(campaign_futures):
+            campaign_type = campaign_futures[future]
+            response = future.result()
+            response_data = response.json()
+
+            if response and not response_data.get("error"):
+                campaign_data = response_data.get("data", {})
+                campaign_id = campaign_data.get("id")
+
+                if campaign_id:
+                    campaign_adgroups = CAMPAIGN_STRUCTURE[campaign_type].get(
+                        "adgroups", []
+                    )
+
+                    for adgroup in campaign_adgroups:
+                        adgroup_future = executor.submit(
+                            create_adgroup,
+                            ctx,
+                            orgId,
+                            campaign_id,
+                            adgroup.get("name"),
+                            default_bid,
+                            adgroup.get("searchMatch", False),
+                        )
+                        adgroup_futures[campaign_type].append(
+                            (adgroup, campaign_id, adgroup_future)
                         )
                 else:
-                    error_messages.append(
-                        f"Failed to create {campaign_type.value} campaign. Error: {response_data.get('error')}"
+                    campaign_messages[campaign_type].append(
+                        (
+                            False,
+                            f"Unexpected response structure while creating {campaign_type.value} campaign. No ID found.",
+                        )
                     )
+            else:
+                campaign_messages[campaign_type].append(
+                    (
+                        False,
+                        f"Failed to create {campaign_type.value} campaign. Error: {response_data.get('error')}",
+                    )
+                )
 
-        for message in success_messages:
-            console.print(Panel(message, style="green", title="Success"))
+        for campaign_type, futures in adgroup_futures.items():
+            for adgroup, campaign_id, adgroup_future in futures:
+                adgroup_response = adgroup_future.result()
+                adgroup_data = adgroup_response.json()
 
-        for message in error_messages:
-            console.print(Panel(message, style="red", title="Error"))
+                if adgroup_response and not adgroup_data.get("error"):
+                    campaign_messages[campaign_type].append(
+                        (
+                            True,
+                            f"Successfully created {adgroup.get('name')} adgroup for {campaign_type.value} campaign with ID: {campaign_id}",
+                        )
+                    )
+                else:
+                    campaign_messages[campaign_type].append(
+                        (
+                            False,
+                            f"Failed to create ad groups of type {adgroup.get('name')} for {campaign_type.value} campaign. Error: {adgroup_data.get('error')}",
+                        )
+                    )
 
-        console.print("Campaign creation process finished!", style="bold")
+    success_messages = []
+    error_messages = []
 
-        warning_message = (
-            "Do not modify any campaign or ad group names from the Apple Search Ads dashboard."
-            "\nThe SearchAds CLI relies on a particular naming convention for keyword management."
-        )
-        console.print(
-            Panel(
-                warning_message,
-                title="Warning",
-                style="bold yellow",
-                border_style="yellow",
-            )
-        )
-    else:
-        typer.echo(f"Error finding campaigns. Status code: {response.text}")
+    for messages in campaign_messages.values():
+        for succeeded, message in messages:
+            if succeeded:
+                success_messages.append(message)
+            else:
+                error_messages.append(message)
+
+    return success_messages, error_messages
 
 
 def targeting_prompt():
@@ -2,6 +2,12 @@ import typer
 import re
 import os
 from searchadscli.utils.config import get_config, save_config
+from searchadscli.utils.profiles import (
+    DEFAULT_PROFILE,
+    get_profiles,
+    get_profile_config,
+)
+from searchadscli.utils.access_token import forget_access_token
 from rich.table import Table
 from rich.console import Console
 
@@ -19,11 +25,75 @@ def configure(
     key_id: str = typer.Option(None, "--key-id", help="Key ID."),
     org_id: str = typer.Option(None, "--org-id", help="Organization ID."),
     app_id: int = typer.Option(None, "--app-id", help="Apple App ID."),
+    pool_size: int = typer.Option(
+        None, "--pool-size", help="Number of pooled API connections to keep alive."
+    ),
+    adgroup_cache_ttl: int = typer.Option(
+        None,
+        "--adgroup-cache-ttl",
+        help="Seconds to keep ad group lists cached on disk between runs. 0 turns it off.",
+    ),
+    mirror_max_age: int = typer.Option(
+        None,
+        "--mirror-max-age",
+        help="Seconds after a sync that keyword commands trust the local mirror. 0 trusts it however old.",
+    ),
+    rate_limit: float = typer.Option(
+        None, "--rate-limit", help="Maximum API requests per second."
+    ),
+    org_rate_limit: list[str] = typer.Option(
+        None,
+        "--org-rate-limit",
+        help="Maximum API requests per second for one org, as ORG_ID=RATE. Can be repeated.",
+    ),
+    max_retries: int = typer.Option(
+        None,
+        "--max-retries",
+        help="Times a throttled or failed API request is retried. 0 turns retries off.",
+    ),
+    api_base_url: str = typer.Option(
+        None,
+        "--api-base-url",
+        help="Search Ads API URL, e.g. of a local fake server. 'default' resets it.",
+    ),
+    auth_url: str = typer.Option(
+        None,
+        "--auth-url",
+        help="OAuth token URL, e.g. of a local fake server. 'default' resets it.",
+    ),
 ):
-    config = get_config() if not all else {}
+    config_file = get_config()
+    profile = ctx.obj.get("profile")
+
+    if profile and profile != DEFAULT_PROFILE:
+        # Named profiles only store what differs from the default profile
+        inherited = get_profile_config(config_file, None)
+        profiles = config_file.setdefault("profiles", {})
+        config = {} if all else profiles.get(profile, {})
+        profiles[profile] = config
+    else:
+        inherited = {}
+        if all:
+            config_file = {"profiles": config_file.get("profiles", {})}
+        config = config_file
 
     # Flags list to check if any individual flag is set
-    individual_flags = [private_key_file, client_id, team_id, key_id, org_id, app_id]
+    individual_flags = [
+        private_key_file,
+        client_id,
+        team_id,
+        key_id,
+        org_id,
+        app_id,
+        pool_size,
+        adgroup_cache_ttl is not None,
+        mirror_max_age is not None,
+        rate_limit,
+        org_rate_limit,
+        max_retries is not None,
+        api_base_url,
+        auth_url,
+    ]
 
     # If any individual flag is set, update only that and return
     if any(individual_flags):
@@ -43,34 +113,53 @@ def configure(
             config["org_id"] = org_id
         if app_id:
             config["app_id"] = app_id
+        if pool_size:
+            config["pool_size"] = pool_size
+        if adgroup_cache_ttl is not None:
+            config["adgroup_cache_ttl"] = adgroup_cache_ttl
+        if mirror_max_age is not None:
+            config["mirror_max_age"] = mirror_max_age
+        if rate_limit:
+            config["rate_limit"] = rate_limit
+        if org_rate_limit:
+            org_rate_limits = config.setdefault("org_rate_limits", {})
+            for value in org_rate_limit:
+                limit_org_id, rate = validate_org_rate_limit(value)
+                org_rate_limits[limit_org_id] = rate
+        if max_retries is not None:
+            config["max_retries"] = max_retries
+        if api_base_url:
+            set_url(config, "api_base_url", api_base_url)
+        if auth_url:
+            set_url(config, "auth_url", auth_url)
 
     else:  # No individual flags set, check for missing values
-        if not config.get("private_key_file"):
+        if not {**inherited, **config}.get("private_key_file"):
             private_key_file = typer.prompt(
                 "Path to private key file", default="private-key.pem"
             ).strip()
             private_key_file = validate_pem_file(private_key_file, "private key file")
             config["private_key_file"] = private_key_file
 
-        if not config.get("client_id"):
+        if not {**inherited, **config}.get("client_id"):
             client_id = typer.prompt("Client ID").strip()
             client_id = validate_searchads_id(client_id, "client_id")
             config["client_id"] = client_id
 
-        if not config.get("team_id"):
+        if not {**inherited, **config}.get("team_id"):
             team_id = typer.prompt("Team ID").strip()
             team_id = validate_searchads_id(team_id, "team_id")
             config["team_id"] = team_id
 
-        if not config.get("key_id"):
+        if not {**inherited, **config}.get("key_id"):
             key_id = typer.prompt("Key ID").strip()
             key_id = validate_key_id(key_id)
             config["key_id"] = key_id
-        if not config.get("org_id"):
+        if not {**inherited, **config}.get("org_id"):
             org_id = typer.prompt("Apple Search Ads Organization ID").strip()
             config["org_id"] = org_id
 
-        if not config.get("app_id"):
+        if not {**inherited, **config}.get("app_id"):
             app_id = typer.prompt(
                 "Apple ID of the app you wish to run campaigns for (e.g. id571800810)"
             ).strip()
@@ -78,11 +167,14 @@ def configure(
             config["app_id"] = app_id
 
     # Save the updated config
-    save_config(config)
+    save_config(config_file)
+    config = get_profile_config(config_file, profile)
 
     # After saving the new configuration, clear the access_token_expiry value
+    # and any token stored on disk for these credentials
     if "access_token_expiry" in ctx.obj:
         del ctx.obj["access_token_expiry"]
+    forget_access_token(config)
 
     console = Console()
 
@@ -95,11 +187,26 @@ def configure(
     for key, value in config.items():
         table.add_row(key, str(value))
 
+    profiles = get_profiles(config_file)
+    if len(profiles) > 1:
+        table.add_row("profiles", ", ".join(profiles))
+
     # Print the table
     console.print(table)
     console.print("Configuration saved successfully!", style="bold")
 
 
+def set_url(config: dict, key: str, url: str):
+    if url == "default":
+        config.pop(key, None)
+        return
+
+    if not url.startswith(("https://", "http://")):
+        typer.echo(f"Error: {key} must be an http:// or https:// URL.")
+        raise typer.Exit(code=1)
+    config[key] = url.rstrip("/")
+
+
 def validate_pem_file(file_path: str, file_type: str) -> str:
     while not (file_path.endswith(".pem") and os.path.exists(file_path)):
         typer.echo(
@@ -131,6 +238,21 @@ def validate_key_id(value: str) -> str:
     return value
 
 
+def validate_org_rate_limit(value: str) -> tuple[str, float]:
+    org_id, _, rate = value.partition("=")
+
+    try:
+        rate = float(rate)
+    except ValueError:
+        rate = 0
+
+    if not org_id.strip() or rate <= 0:
+        typer.echo(f"Invalid org rate limit '{value}'. Use ORG_ID=RATE, e.g. 123456=5.")
+        raise typer.Exit(code=1)
+
+    return org_id.strip(), rate
+
+
 def validate_app_id(value: str) -> int:
     app_id = value[2:] if value.startswith("id") else value
 
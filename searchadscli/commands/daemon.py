@@ -0,0 +1,384 @@
+import json
+import os
+import queue
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+import typer
+from searchadscli.launcher import DAEMON_SOCKET_PATH, split_command, stop
+from searchadscli.utils.config import CONFIG_PATH
+
+# What a command leaves in ctx.obj that the next one may reuse: API
+# clients with their connection pools, rate limiters, the access token and
+# the campaign and ad group lists. Everything else is reset between
+# commands.
+WARM_KEYS = {
+    "clients",
+    "rate_limiters",
+    "access_token",
+    "access_token_expiry",
+    "campaign_indexes",
+    "adgroups",
+}
+CACHE_KEYS = {"campaign_indexes", "adgroups"}
+
+DEFAULT_CACHE_TTL = 60
+
+# Exit code of a command stopped with Ctrl-C
+INTERRUPTED = 130
+
+
+class Daemon:
+    """
+    Runs commands forwarded by the launcher, one at a time, in this process.
+    While a command runs, for example waiting at a prompt, other clients are
+    told the daemon is busy and run their command themselves.
+
+    Commands share one ctx.obj per config profile, so they reuse API
+    clients, the access token and campaign and ad group lists. Campaign and
+    ad group lists are dropped every `cache_ttl` seconds, since they may be
+    changed from elsewhere. Everything is dropped when the config file
+    changes.
+    """
+
+    def __init__(
+        self,
+        socket_path: str = DAEMON_SOCKET_PATH,
+        cache_ttl: int = DEFAULT_CACHE_TTL,
+        idle_timeout: int = 0,
+    ):
+        self.socket_path = socket_path
+        self.cache_ttl = cache_ttl
+        self.idle_timeout = idle_timeout
+        self.states = {}
+        self.cached_at = {}
+        # Held from accepting a command until it has finished
+        self.busy = threading.Lock()
+        self.pending = queue.Queue()
+        self.stopping = False
+        self.stop_requests = []
+
+    def serve(self):
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        # Commands run with the user's credentials, only the user may connect
+        umask = os.umask(0o177)
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(umask)
+
+        server.listen()
+        threading.Thread(target=self.accept, args=(server,), daemon=True).start()
+
+        # Commands run on the main thread, where Ctrl-C is delivered. The
+        # busy lock stays held on the way out, so late clients don't queue.
+        try:
+            while True:
+                try:
+                    conn = self.pending.get(timeout=self.idle_timeout or None)
+                except queue.Empty:
+                    if not self.busy.acquire(blocking=False):
+                        continue
+                    typer.echo(f"No commands for {self.idle_timeout} seconds, exiting.")
+                    return
+
+                with conn:
+                    if not self.handle(conn) or self.stopping:
+                        return
+                self.busy.release()
+        finally:
+            server.close()
+            os.unlink(self.socket_path)
+            for state in self.states.values():
+                close_state(state)
+            for conn in self.stop_requests:
+                with conn:
+                    try:
+                        conn.sendall(b"0\n")
+                    except OSError:
+                        pass
+
+    def accept(self, server: socket.socket):
+        """
+        Greet every client with "ready" and queue it for the main thread,
+        or with "busy" while a command runs. A busy daemon can still be
+        asked to stop, it does once the command has finished.
+        """
+
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+
+            if not self.stopping and self.busy.acquire(blocking=False):
+                try:
+                    conn.sendall(b"ready\n")
+                except OSError:
+                    conn.close()
+                    self.busy.release()
+                    continue
+                self.pending.put(conn)
+                continue
+
+            try:
+                conn.sendall(b"busy\n")
+                conn.settimeout(1)
+                kind = conn.recv(1)
+            except OSError:
+                kind = b""
+
+            if kind == b"S":
+                self.stopping = True
+                self.stop_requests.append(conn)
+            else:
+                conn.close()
+
+    def handle(self, conn: socket.socket) -> bool:
+        """
+        Run one forwarded command. Returns False when asked to stop.
+        """
+
+        try:
+            kind, fds, _, _ = socket.recv_fds(conn, 1, 3)
+        except OSError:
+            return True
+
+        try:
+            try:
+                request, pending = read_request(conn)
+            except (OSError, ValueError):
+                return True
+
+            if kind == b"S" or request.get("stop"):
+                conn.sendall(b"0\n")
+                return False
+
+            if len(fds) != 3:
+                code = 1
+            elif pending:
+                code = INTERRUPTED
+            else:
+                code = self.run(conn, request, fds)
+        except KeyboardInterrupt:
+            code = INTERRUPTED
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+        try:
+            conn.sendall(f"{code}\n".encode())
+        except OSError:
+            pass
+        return True
+
+    def run(self, conn: socket.socket, request: dict, fds: list[int]) -> int:
+        from searchadscli.main import app
+
+        args = request["args"]
+        state = self.state_for(args, request["env"])
+
+        finished = threading.Event()
+        lock = threading.Lock()
+        watcher = threading.Thread(
+            target=interrupt_on_request, args=(conn, finished, lock), daemon=True
+        )
+
+        with attached(fds, request["cwd"], request["env"]):
+            watcher.start()
+            try:
+                app(args=args, prog_name="searchadscli", obj=state)
+                code = 0
+            except SystemExit as e:
+                code = exit_code(e.code)
+            except KeyboardInterrupt:
+                code = INTERRUPTED
+            except Exception:
+                traceback.print_exc()
+                code = 1
+            finally:
+                with lock:
+                    finished.set()
+
+        try:
+            conn.shutdown(socket.SHUT_RD)
+        except OSError:
+            pass
+        watcher.join()
+        return code
+
+    def state_for(self, args: list[str], env: dict) -> dict:
+        """
+        The ctx.obj of the command's config profile, with everything but
+        the warm entries removed.
+        """
+
+        try:
+            config_version = os.stat(CONFIG_PATH).st_mtime_ns
+        except OSError:
+            config_version = None
+
+        options, _ = split_command(args)
+        profile = options.get("--config-profile") or env.get("SEARCHADS_CLI_PROFILE")
+        key = (profile, config_version)
+
+        if key not in self.states:
+            for stale in [k for k in self.states if k[1] != config_version]:
+                close_state(self.states.pop(stale))
+                self.cached_at.pop(stale)
+            self.states[key] = {}
+            self.cached_at[key] = time.monotonic()
+
+        state = self.states[key]
+        for name in set(state) - WARM_KEYS:
+            del state[name]
+
+        if time.monotonic() - self.cached_at[key] > self.cache_ttl:
+            for name in CACHE_KEYS:
+                state.pop(name, None)
+            self.cached_at[key] = time.monotonic()
+
+        # Request counters are reported per command
+        for client in state.get("clients", {}).values():
+            client.reset_stats()
+
+        return state
+
+
+def read_request(conn: socket.socket) -> tuple[dict, bool]:
+    """
+    Read the request line. Returns it, and whether an interrupt already
+    followed it.
+    """
+
+    data = b""
+    while b"\n" not in data:
+        chunk = conn.recv(65536)
+        if not chunk:
+            raise ConnectionError("The client disconnected")
+        data += chunk
+
+    line, _, rest = data.partition(b"\n")
+    return json.loads(line), bool(rest)
+
+
+def interrupt_on_request(
+    conn: socket.socket, finished: threading.Event, lock: threading.Lock
+):
+    # The client sends a line on Ctrl-C and closes the connection if it's
+    # killed. Either way, stop the command like Ctrl-C would.
+    try:
+        conn.recv(64)
+    except OSError:
+        pass
+
+    with lock:
+        if not finished.is_set():
+            os.kill(os.getpid(), signal.SIGINT)
+
+
+@contextmanager
+def attached(fds: list[int], cwd: str, env: dict):
+    """
+    Run with the client's stdin, stdout and stderr, working directory and
+    environment, and restore the daemon's own afterwards.
+    """
+
+    saved_fds = [os.dup(fd) for fd in (0, 1, 2)]
+    saved_streams = sys.stdin, sys.stdout, sys.stderr
+    saved_env = dict(os.environ)
+    saved_cwd = os.getcwd()
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    try:
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+        sys.stdin = open(0, "r", closefd=False)
+        sys.stdout = open(1, "w", buffering=1, closefd=False)
+        sys.stderr = open(2, "w", buffering=1, closefd=False)
+        os.environ.clear()
+        os.environ.update(env)
+        os.chdir(cwd)
+        yield
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except OSError:
+                pass
+
+        sys.stdin, sys.stdout, sys.stderr = saved_streams
+        for target, fd in enumerate(saved_fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+
+
+def exit_code(code) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    # sys.exit("message") prints the message and exits with 1
+    typer.echo(code, err=True)
+    return 1
+
+
+def close_state(state: dict):
+    for client in state.get("clients", {}).values():
+        client.close()
+
+
+def daemon_is_running(socket_path: str = DAEMON_SOCKET_PATH) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return True
+
+
+def run_daemon(cache_ttl: int = DEFAULT_CACHE_TTL, idle_timeout: int = 0):
+    """
+    Serve forwarded commands on the daemon socket until stopped.
+    """
+
+    if not hasattr(socket, "send_fds"):
+        typer.echo("Error: The daemon needs Unix sockets.")
+        raise typer.Exit(code=1)
+
+    if os.path.exists(DAEMON_SOCKET_PATH):
+        if daemon_is_running():
+            typer.echo(f"Error: A daemon is already listening on {DAEMON_SOCKET_PATH}.")
+            raise typer.Exit(code=1)
+        # Left behind by a daemon that was killed
+        os.unlink(DAEMON_SOCKET_PATH)
+
+    # Let `kill` clean up the socket like Ctrl-C does
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    typer.echo(
+        f"Listening on {DAEMON_SOCKET_PATH}. Stop with: searchadscli daemon --stop"
+    )
+    try:
+        Daemon(DAEMON_SOCKET_PATH, cache_ttl, idle_timeout).serve()
+    except KeyboardInterrupt:
+        pass
+
+
+def stop_daemon():
+    if not stop():
+        typer.echo("No daemon is running.")
+        raise typer.Exit(code=1)
+    typer.echo("Daemon stopped.")
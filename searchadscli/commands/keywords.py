@@ -1,39 +1,104 @@
+import json
 import typer
-from searchadscli.utils.adgroups_api import get_adgroups
-from searchadscli.utils.config import get_org_id, CampaignType, CAMPAIGN_STRUCTURE, CAMPAIGN_PREFIX
+from searchadscli.utils.adgroups_api import get_cached_adgroups
+from searchadscli.utils.config import get_org_id, CampaignType
 from searchadscli.utils.campaigns_api import find_active_campaigns
+from searchadscli.utils.campaign_index import get_campaign_index
+from searchadscli.utils.api_client import SearchAdsAPIError
+from searchadscli.utils.concurrency import map_concurrently, get_concurrency
+from searchadscli.utils.bulk import chunked, run_bulk, BULK_CHUNK_SIZE
+from searchadscli.utils.keyword_input import (
+    KeywordFileFormat,
+    read_keyword_rows,
+    keyword_texts,
+)
 from searchadscli.utils.keywords_api import (
-    add_keywords_to_adgroup_api,
-    remove_keywords_from_adgroup_api,
+    find_targeting_keywords,
+    find_negative_keywords,
     add_negative_keywords_to_campaign_api,
-    remove_negative_keywords_from_campaign_api,
 )
+from searchadscli.utils.keyword_audit import (
+    FINDINGS,
+    audit_campaign_set,
+    build_fix_plan,
+)
+from searchadscli.utils.keyword_plan import (
+    SIBLING_TYPES,
+    plan_add_keywords,
+    apply_plan,
+    print_plan,
+)
+from searchadscli.utils.keyword_normalize import normalize_keywords, describe_report
+from searchadscli.utils.mirror import get_mirror
+from searchadscli.utils.profiles import run_for_targets
 from rich import print
 from rich.table import Table
 from rich.console import Console
 from rich.prompt import Prompt
 
+# Number of keywords echoed back after they are entered
+KEYWORD_PREVIEW_LIMIT = 50
 
-def add_keywords(ctx: typer.Context, type: CampaignType):
+
+def add_keywords(
+    ctx: typer.Context,
+    type: CampaignType,
+    campaign: str | None = None,
+    countries: list[str] | None = None,
+    file: str | None = None,
+    file_format: KeywordFileFormat = KeywordFileFormat.auto,
+    dry_run: bool = False,
+):
     org_id = get_org_id(ctx)
     console = Console()
-    with console.status("[dots2]Finding campaigns..."):
-        find_campaign_response = find_active_campaigns(ctx, org_id, None, type)
 
-    if find_campaign_response.status_code != 200:
+    if type not in SIBLING_TYPES:
+        console.print(f"[red]Unknown campaign type.[/red]")
+        raise typer.Exit(code=1)
+
+    try:
+        with console.status("[dots2]Finding campaigns..."):
+            index = get_campaign_index(ctx, org_id)
+    except SearchAdsAPIError as e:
         console.print(
-            f"[red]Error fetching campaigns. Status code: {find_campaign_response.status_code}[/red]"
+            f"[red]Error fetching campaigns. Status code: {e.status_code}[/red]"
         )
         raise typer.Exit(code=1)
 
-    all_campaigns = find_campaign_response.json().get("data", [])
-
+    all_campaigns = index.of_type(type)
     if not all_campaigns:
         console.print(
             f"[red]No active SearchAdsCLI campaigns found for type: {type.value}[/red]"
         )
         raise typer.Exit(code=1)
 
+    if campaign or countries:
+        selected_campaign = select_campaign(ctx, all_campaigns, campaign, countries)
+    else:
+        selected_campaign = prompt_for_campaign(all_campaigns)
+
+    console.print(f"You chose: [green]{selected_campaign['name']}[/green]")
+
+    campaigns = index.campaign_set(selected_campaign)
+
+    description = f"Adding keywords to {type.value} campaign set..."
+    failed = 0
+
+    for keywords in keyword_batches(ctx, file, file_format):
+        plan = plan_add_keywords(ctx, org_id, campaigns, type, keywords)
+
+        if dry_run:
+            print_plan(plan)
+        else:
+            failed += len(apply_plan(ctx, org_id, plan, description))
+
+    if failed:
+        raise typer.Exit(code=1)
+
+
+def prompt_for_campaign(all_campaigns: list[dict]) -> dict:
+    console = Console()
+
     table = Table(title="Campaigns")
 
     table.add_column("#", justify="right", style="cyan", no_wrap=True)
@@ -50,107 +115,363 @@ def add_keywords(ctx: typer.Context, type: CampaignType):
             break
         console.print("[red]Invalid input! Please choose a valid number.[/red]")
 
-    selected_campaign = all_campaigns[int(choice) - 1]
-    console.print(f"You chose: [green]{selected_campaign['name']}[/green]")
+    return all_campaigns[int(choice) - 1]
 
-    campaigns = find_campaign_set_from(ctx, org_id, type, selected_campaign["name"])
-    campaigns[type] = selected_campaign
 
-    keywords = prompt_for_keywords()
+def select_campaign(
+    ctx: typer.Context,
+    all_campaigns: list[dict],
+    campaign: str | None,
+    countries: list[str] | None,
+) -> dict:
+    """
+    Pick a campaign by ID or name, or by the countries it runs in, without
+    prompting.
+    """
+
+    matches = all_campaigns
+
+    if campaign:
+        matches = [
+            item
+            for item in matches
+            if str(item["id"]) == campaign or item["name"] == campaign
+        ]
+
+    if countries:
+        wanted = {country.upper() for country in countries}
+        matches = [
+            item
+            for item in matches
+            if set(item.get("countriesOrRegions", [])) == wanted
+        ]
+
+    # Several apps can share a country set, prefer the configured app
+    if len(matches) > 1:
+        app_suffix = f"-{ctx.obj['config'].get('app_id')}"
+        matches = [item for item in matches if item["name"].endswith(app_suffix)]
+
+    if len(matches) != 1:
+        reason = "No campaign matches" if not matches else "Several campaigns match"
+        typer.echo(f"Error: {reason} the given --campaign/--countries.")
+        raise typer.Exit(code=1)
 
-    if type == CampaignType.exact:
-        add_keywords_to_exact(ctx, org_id, campaigns, keywords)
-        remove_keywords_from_competitor(ctx, org_id, campaigns, keywords)
-        add_keywords_to_discovery(ctx, org_id, campaigns, keywords)
-    elif type == CampaignType.competitor:
-        add_keywords_to_competitor(ctx, org_id, campaigns, keywords)
-        remove_keywords_from_exact(ctx, org_id, campaigns, keywords)
-        add_keywords_to_discovery(ctx, org_id, campaigns, keywords)
-    else:
-        console.print(f"[red]Unknown campaign type.[/red]")
+    return matches[0]
+
+
+def keyword_batches(
+    ctx: typer.Context,
+    file: str | None,
+    file_format: KeywordFileFormat = KeywordFileFormat.auto,
+):
+    """
+    Yield the keywords to work on, either as one prompted list or as
+    batches streamed from a file or stdin. Each batch holds enough
+    keywords to keep every concurrent bulk request busy.
+    """
+
+    if not file:
+        yield prompt_for_keywords()
+        return
+
+    found = False
+    for batch in chunked(
+        read_keyword_rows(file, file_format), get_concurrency(ctx) * BULK_CHUNK_SIZE
+    ):
+        found = True
+        yield batch
+
+    if not found:
+        typer.echo("Error: No keywords found in the input.")
         raise typer.Exit(code=1)
 
 
-def add_negative_keywords(ctx: typer.Context):
+def add_negative_keywords(
+    ctx: typer.Context,
+    file: str | None = None,
+    file_format: KeywordFileFormat = KeywordFileFormat.auto,
+):
+    console = Console()
+
+    if ctx.obj.get("targets"):
+        add_negative_keywords_for_targets(ctx, file, file_format)
+        return
+
     org_id = get_org_id(ctx)
 
-    with Console().status("[dots2]Fetching campaigns..."):
-        campaigns_reponse = find_active_campaigns(ctx, org_id)
+    try:
+        with console.status("[dots2]Fetching campaigns..."):
+            campaigns = list(find_active_campaigns(ctx, org_id))
+    except SearchAdsAPIError as e:
+        typer.echo(f"Failed to fetch campaigns. Status Code: {e.status_code}")
+        raise typer.Exit(code=1)
 
-    if campaigns_reponse.status_code != 200:
-        typer.echo(
-            f"Failed to fetch campaigns. Status Code: {campaigns_reponse.status_code}"
-        )
-        typer.Exit(code=1)
+    keyword_count, errors = send_negative_keywords(
+        ctx, org_id, campaigns, keyword_batches(ctx, file, file_format)
+    )
 
-    data = campaigns_reponse.json()
+    table = Table(title="Negative keywords")
+    table.add_column("Campaign Name", style="magenta")
+    table.add_column("Result")
 
-    keywords = prompt_for_keywords()
+    for row in negative_keyword_rows(campaigns, errors):
+        table.add_row(*row)
 
-    with Console().status("[dots2]Adding negative keywords to campaigns..."):
-        for campaign in data.get("data", []):
-            add_negative_keywords_to_campaign_api(ctx, org_id, campaign["id"], keywords)
+    console.print(table)
 
+    failed = sum(1 for messages in errors.values() if messages)
+    console.print(
+        f"Added {keyword_count} negative keywords to {len(campaigns) - failed} of {len(campaigns)} campaigns."
+    )
 
-def check_keywords():
-    # Run an audit on all keywords
-    # Makes sure there's no exact match keywords in the discovery-broad campaign
-    # Checks that all exact match keywords are negative keywords in search match campaign
-    pass
+    if failed:
+        raise typer.Exit(code=1)
 
 
-def find_campaign_set_from(
-    ctx: typer.Context, org_id: str, type: CampaignType, name: str
+def add_negative_keywords_for_targets(
+    ctx: typer.Context,
+    file: str | None,
+    file_format: KeywordFileFormat,
 ):
-    countries_string = name.split("_")[-1]
-    countries_string = countries_string.split("-")[0]
-
-    lookup_campaigns = [CampaignType.discovery]
+    """
+    Add the same negative keywords to every campaign of every selected org
+    at once, and report the results in one table.
+    """
 
-    if type == CampaignType.exact:
-        lookup_campaigns.append(CampaignType.competitor)
-    elif type == CampaignType.competitor:
-        lookup_campaigns.append(CampaignType.exact)
+    console = Console()
+    targets = ctx.obj["targets"]
 
-    lookup_names = [
-        f"{CAMPAIGN_PREFIX}_{lookup_type.value}_{countries_string}-{ctx.obj['config'].get('app_id')}"
-        for lookup_type in lookup_campaigns
+    # Read once up front, stdin can't be read again for each org
+    keywords = [
+        keyword
+        for batch in keyword_batches(ctx, file, file_format)
+        for keyword in keyword_texts(batch)
     ]
 
-    with Console().status("[dots2]Finding campaign set..."):
-        find_campaign_response = find_active_campaigns(
-            ctx, org_id, None, None, lookup_names
-        ).json()
+    def add_for_org(child: typer.Context):
+        org_id = get_org_id(child)
+        campaigns = list(find_active_campaigns(child, org_id))
+        _, errors = send_negative_keywords(child, org_id, campaigns, [keywords])
+        return campaigns, errors
+
+    with console.status(
+        f"[dots2]Adding {len(keywords)} negative keywords for {len(targets)} orgs..."
+    ):
+        results = run_for_targets(ctx, add_for_org)
 
-    if find_campaign_response.get("error"):
-        typer.echo("Error:", find_campaign_response["error"])
+    table = Table(title="Negative keywords")
+    table.add_column("Profile", style="cyan")
+    table.add_column("Campaign Name", style="magenta")
+    table.add_column("Result")
+
+    total = 0
+    failed_campaigns = 0
+    failed_orgs = 0
+    for label, result, error in results:
+        if error:
+            failed_orgs += 1
+            table.add_row(label, "", f"[red]Failed: {error_message(error)}[/red]")
+            continue
+
+        campaigns, errors = result
+        total += len(campaigns)
+        # Errors are collected per chunk, a campaign counts once however
+        # many of its chunks failed
+        failed_campaigns += len(
+            {campaign["id"] for campaign in campaigns if errors.get(campaign["id"])}
+        )
+        for row in negative_keyword_rows(campaigns, errors):
+            table.add_row(label, *row)
+
+    console.print(table)
+    console.print(
+        f"Added {len(keywords)} negative keywords to {total - failed_campaigns} of {total} campaigns in {len(targets) - failed_orgs} of {len(targets)} orgs."
+    )
+
+    if failed_campaigns or failed_orgs:
         raise typer.Exit(code=1)
 
-    result = {}
-    for item in find_campaign_response.get("data", []):
-        if CampaignType.discovery in item["name"]:
-            result[CampaignType.discovery] = item
-        elif CampaignType.exact in item["name"]:
-            result[CampaignType.exact] = item
-        elif CampaignType.competitor in item["name"]:
-            result[CampaignType.competitor] = item
 
-    return result
+def send_negative_keywords(
+    ctx: typer.Context, org_id: str, campaigns: list[dict], batches
+) -> tuple[int, dict]:
+    """
+    Add each batch of negative keywords to all campaigns. Returns the
+    number of keywords sent and the error messages for each campaign ID.
+    """
+
+    errors = {}
+    keyword_count = 0
+
+    for keywords in batches:
+        keywords = keyword_texts(keywords)
+        keyword_count += len(keywords)
+
+        batch_errors = send_in_chunks(
+            ctx,
+            org_id,
+            "Adding negative keywords to campaigns...",
+            negative_keyword_sender(ctx, org_id),
+            negative_keywords_by_campaign(
+                ctx, org_id, [campaign["id"] for campaign in campaigns], keywords
+            ),
+            print_errors=False,
+        )
 
+        for campaign_id, messages in batch_errors.items():
+            errors.setdefault(campaign_id, []).extend(messages)
 
-def validate_keywords(keywords: list[str]) -> list[str]:
-    sanitized_keywords = []
+    return keyword_count, errors
+
+
+def negative_keyword_rows(campaigns: list[dict], errors: dict) -> list[tuple]:
+    rows = []
+    for campaign in campaigns:
+        messages = errors.get(campaign["id"])
+        result = (
+            f"[red]Failed: {', '.join(dict.fromkeys(messages))}[/red]"
+            if messages
+            else "[green]Added[/green]"
+        )
+        rows.append((campaign["name"], result))
+    return rows
+
+
+def error_message(error: Exception) -> str:
+    if isinstance(error, SearchAdsAPIError):
+        return ", ".join(error.messages)
+    return str(error) or type(error).__name__
+
+
+def check_keywords(ctx: typer.Context, fix_plan: str | None = None):
+    """
+    Audit every SearchAdsCLI campaign set in the account:
+
+    - no exact match keywords in the Discovery broad ad group
+    - every Exact and Competitor keyword is an exact negative in Discovery
+    - every Exact and Competitor keyword has a broad copy in Discovery
+    - no keyword is targeted by both the Exact and Competitor campaigns
+
+    All keywords are loaded up front and compared with set operations. With
+    `fix_plan` the changes that would fix the findings are written there as
+    JSON batches.
+    """
+
+    org_id = get_org_id(ctx)
+    console = Console()
+
+    try:
+        with console.status("[dots2]Fetching campaigns..."):
+            campaign_sets = get_campaign_index(ctx, org_id).campaign_sets()
+    except SearchAdsAPIError as e:
+        typer.echo(f"Failed to fetch campaigns. Status Code: {e.status_code}")
+        raise typer.Exit(code=1)
+
+    set_campaigns = [
+        campaign
+        for campaign_set in campaign_sets.values()
+        for campaign in campaign_set.values()
+    ]
+
+    if not set_campaigns:
+        typer.echo("No active SearchAdsCLI campaigns found.")
+        raise typer.Exit(code=1)
+
+    mirror = get_mirror(ctx, org_id)
+
+    def load_keywords(campaign: dict) -> dict:
+        campaign_id = campaign["id"]
+        if mirror:
+            return {
+                "adgroups": mirror.campaign_adgroups(org_id, campaign_id),
+                "keywords": mirror.campaign_targeting_keywords(org_id, campaign_id),
+                "negatives": mirror.campaign_negative_keywords(org_id, campaign_id),
+            }
+        return {
+            "adgroups": get_cached_adgroups(ctx, org_id, campaign_id),
+            "keywords": list(find_targeting_keywords(ctx, org_id, campaign_id, [])),
+            "negatives": list(find_negative_keywords(ctx, org_id, campaign_id, [])),
+        }
 
-    for keyword in keywords:
-        sanitized_keyword = keyword.strip().lower()
+    keywords = {}
+    source = "local mirror" if mirror else "API"
+    with console.status(
+        f"[dots2]Loading keywords for {len(set_campaigns)} campaigns from the {source}..."
+    ):
+        for campaign, loaded, error in map_concurrently(
+            load_keywords, set_campaigns, get_concurrency(ctx)
+        ):
+            if error:
+                messages = (
+                    error.messages
+                    if isinstance(error, SearchAdsAPIError)
+                    else [str(error)]
+                )
+                typer.echo(
+                    f"Failed to load keywords for {campaign['name']}: {', '.join(messages)}"
+                )
+                raise typer.Exit(code=1)
+            keywords[campaign["id"]] = loaded
+
+    findings = {
+        suffix: audit_campaign_set(campaign_set, keywords)
+        for suffix, campaign_set in campaign_sets.items()
+    }
+
+    table = Table(title="Keyword audit")
+    table.add_column("Campaign Set", style="magenta")
+    table.add_column("Exact in Discovery-Broad", justify="right")
+    table.add_column("Missing Negatives", justify="right")
+    table.add_column("Missing in Discovery", justify="right")
+    table.add_column("Exact and Competitor", justify="right")
+
+    for suffix, set_findings in findings.items():
+        table.add_row(
+            suffix,
+            *(
+                (
+                    f"[red]{len(set_findings[name])}[/red]"
+                    if set_findings[name]
+                    else "[green]0[/green]"
+                )
+                for name in FINDINGS
+            ),
+        )
+
+    console.print(table)
+
+    for suffix, set_findings in findings.items():
+        if set_findings["duplicates"]:
+            preview = ", ".join(set_findings["duplicates"][:KEYWORD_PREVIEW_LIMIT])
+            console.print(
+                f"{suffix}: in both Exact and Competitor: {preview}", markup=False
+            )
+
+    issues = sum(
+        len(set_findings[name])
+        for set_findings in findings.values()
+        for name in FINDINGS
+    )
 
-        if sanitized_keyword not in sanitized_keywords:
-            sanitized_keywords.append(sanitized_keyword)
+    if fix_plan:
+        plan = build_fix_plan(campaign_sets, findings)
+        with open(fix_plan, "w") as f:
+            json.dump(plan, f, indent=2)
+        console.print(f"Wrote {len(plan)} fix batches to {fix_plan}.")
 
-    if len(sanitized_keywords) > 100:
-        typer.echo("Error: Please provide 100 or less keywords at a time.")
+    if issues:
+        console.print(f"[red]Found {issues} keyword issues.[/red]")
         raise typer.Exit(code=1)
 
+    console.print("[green]All campaign sets passed the audit.[/green]")
+
+
+def validate_keywords(keywords: list[str]) -> list[str]:
+    sanitized_keywords, report = normalize_keywords(keywords)
+
+    for line in describe_report(report):
+        Console().print(line, style="yellow", markup=False)
+
     return sanitized_keywords
 
 
@@ -186,8 +507,11 @@ def prompt_for_keywords():
         try:
             sanitized_keywords = validate_keywords(keywords_list)
             if sanitized_keywords:
+                preview = ", ".join(sanitized_keywords[:KEYWORD_PREVIEW_LIMIT])
+                if len(sanitized_keywords) > KEYWORD_PREVIEW_LIMIT:
+                    preview += ", ..."
                 console.print(
-                    f"You entered [bold]{len(sanitized_keywords)}[/bold] unique keywords: {', '.join(sanitized_keywords)}"
+                    f"You entered [bold]{len(sanitized_keywords)}[/bold] unique keywords: {preview}"
                 )
             else:
                 console.print("[yellow]Please enter at least one keyword.[/yellow]")
@@ -197,176 +521,72 @@ def prompt_for_keywords():
     return sanitized_keywords
 
 
-def add_keywords_to_exact(
-    ctx: typer.Context, org_id: str, campaigns: dict, keywords: list[str]
-):
-    add_keywords_to_campaign(ctx, org_id, campaigns, keywords, CampaignType.exact)
-
-
-def remove_keywords_from_exact(
-    ctx: typer.Context, org_id: str, campaigns: dict, keywords: list[str]
-):
-    remove_keywords_from_campaign(ctx, org_id, campaigns, keywords, CampaignType.exact)
-
-
-def add_keywords_to_discovery(
-    ctx: typer.Context, org_id: str, campaigns: dict, keywords: list[str]
-):
-    add_keywords_to_campaign(ctx, org_id, campaigns, keywords, CampaignType.discovery)
-    add_negative_keywords_to_campaign(
-        ctx, org_id, campaigns, keywords, CampaignType.discovery
-    )
-
-
-def add_keywords_to_competitor(
-    ctx: typer.Context, org_id: str, campaigns: dict, keywords: list[str]
-):
-    add_keywords_to_campaign(ctx, org_id, campaigns, keywords, CampaignType.competitor)
-
-
-def remove_keywords_from_competitor(
-    ctx: typer.Context, org_id: str, campaigns: dict, keywords: list[str]
-):
-    remove_keywords_from_campaign(
-        ctx, org_id, campaigns, keywords, CampaignType.competitor
-    )
-
-
-def add_keywords_to_campaign(
-    ctx: typer.Context,
-    org_id: str,
-    campaigns: dict,
-    keywords: list[str],
-    type: CampaignType,
-):
-    campaign = campaigns[type]
-    campaign_id = campaign["id"]
-    adgroups = CAMPAIGN_STRUCTURE[type].get("adgroups", [])
-
-    with Console().status("[dots2]Finding campaign adgroups..."):
-        campaign_adgroups_response = get_adgroups(ctx, org_id, campaign_id).json()
-
-    if campaign_adgroups_response.get("error"):
-        errors = campaign_adgroups_response["error"].get("errors", [])
-
-        for error in errors:
-            print(error.get("message", "Unknown error"))
-        raise typer.Exit(code=1)
-
-    campaign_adgroups = campaign_adgroups_response.get("data", [])
-
-    for adgroup in adgroups:
-        if "matchType" in adgroup:
-            for campaign_adgroup in campaign_adgroups:
-                if adgroup["name"] == campaign_adgroup["name"]:
-                    add_keywords_response = add_keywords_to_adgroup_api(
-                        ctx,
-                        org_id,
-                        campaign_id,
-                        campaign_adgroup["id"],
-                        keywords,
-                        adgroup["matchType"],
-                    )
-
-                    if add_keywords_response.status_code != 200:
-                        add_keywords_response_data = add_keywords_response.json()
-                        if add_keywords_response_data.get("error"):
-                            errors = add_keywords_response_data["error"].get(
-                                "errors", []
-                            )
-
-                            for error in errors:
-                                print(error.get("message", "Unknown error"))
-
-
-def remove_keywords_from_campaign(
-    ctx: typer.Context,
-    org_id: str,
-    campaigns: dict,
-    keywords: list[str],
-    type: CampaignType,
-):
-    campaign = campaigns[type]
-    campaign_id = campaign["id"]
-    adgroups = CAMPAIGN_STRUCTURE[type].get("adgroups", [])
+def negative_keywords_by_campaign(
+    ctx: typer.Context, org_id: str, campaign_ids: list, keywords: list[str]
+) -> dict:
+    """
+    Map each campaign to the negative keywords it still needs. Without a
+    synced mirror every campaign gets every keyword.
+    """
 
-    with Console().status("[dots2]Finding campaign adgroups..."):
-        campaign_adgroups_response = get_adgroups(ctx, org_id, campaign_id).json()
+    mirror = get_mirror(ctx, org_id)
+    if not mirror:
+        return {campaign_id: keywords for campaign_id in campaign_ids}
 
-    if campaign_adgroups_response.get("error"):
-        errors = campaign_adgroups_response["error"].get("errors", [])
+    result = {}
+    for campaign_id in campaign_ids:
+        existing = mirror.negative_keywords(org_id, campaign_id, keywords)
+        result[campaign_id] = [
+            keyword for keyword in keywords if keyword not in existing
+        ]
+    return result
 
-        for error in errors:
-            print(error.get("message", "Unknown error"))
-        raise typer.Exit(code=1)
 
-    campaign_adgroups = campaign_adgroups_response.get("data", [])
-
-    for adgroup in adgroups:
-        for campaign_adgroup in campaign_adgroups:
-            if adgroup["name"] == campaign_adgroup["name"]:
-                remove_keywords_response = remove_keywords_from_adgroup_api(
-                    ctx,
-                    org_id,
-                    campaign_id,
-                    campaign_adgroup["id"],
-                    keywords,
-                )
+def negative_keyword_sender(ctx: typer.Context, org_id: str):
+    mirror = get_mirror(ctx, org_id)
 
-                if remove_keywords_response.status_code != 200:
-                    remove_keywords_response_data = remove_keywords_response.json()
-                    if remove_keywords_response_data.get("error"):
-                        errors = remove_keywords_response_data["error"].get(
-                            "errors", []
-                        )
+    def add_chunk(campaign_id, chunk):
+        response = add_negative_keywords_to_campaign_api(
+            ctx, org_id, campaign_id, chunk
+        )
+        if mirror and response.status_code == 200:
+            mirror.upsert_negative_keywords(org_id, response.json()["data"])
+        return response
 
-                        for error in errors:
-                            print(error.get("message", "Unknown error"))
+    return add_chunk
 
 
-def add_negative_keywords_to_campaign(
+def send_in_chunks(
     ctx: typer.Context,
     org_id: str,
-    campaigns: dict,
-    keywords: list[str],
-    type: CampaignType,
-):
-    campaign = campaigns[type]
-    campaign_id = campaign["id"]
-
-    add_negative_keywords_response = add_negative_keywords_to_campaign_api(
-        ctx, org_id, campaign_id, keywords
+    description: str,
+    send,
+    keywords_by_target: dict,
+    print_errors: bool = True,
+) -> dict:
+    """
+    Send each target's keywords in API-sized chunks through the bulk
+    pipeline and return the error messages collected for each target.
+    """
+
+    batches = (
+        (target, chunk)
+        for target, keywords in keywords_by_target.items()
+        for chunk in chunked(keywords)
     )
 
-    if add_negative_keywords_response.status_code != 200:
-        add_negative_keywords_response_data = add_negative_keywords_response.json()
-        if add_negative_keywords_response_data.get("error"):
-            errors = add_negative_keywords_response_data["error"].get("errors", [])
-
-            for error in errors:
-                print(error.get("message", "Unknown error"))
-
-
-def remove_negative_keywords_from_campaign(
-    ctx: typer.Context,
-    org_id: str,
-    campaigns: dict,
-    keywords: list[str],
-    type: CampaignType,
-):
-    campaign = campaigns[type]
-    campaign_id = campaign["id"]
-
-    remove_negative_keywords_response = remove_negative_keywords_from_campaign_api(
-        ctx, org_id, campaign_id, keywords
+    errors = run_bulk(
+        send,
+        batches,
+        description,
+        concurrency=get_concurrency(ctx),
+        total=sum(len(keywords) for keywords in keywords_by_target.values()),
+        show_progress=not ctx.obj.get("quiet"),
     )
 
-    if remove_negative_keywords_response.status_code != 200:
-        remove_negative_keywords_response_data = (
-            remove_negative_keywords_response.json()
-        )
-        if remove_negative_keywords_response_data.get("error"):
-            errors = remove_negative_keywords_response_data["error"].get("errors", [])
+    if print_errors:
+        for messages in errors.values():
+            for message in messages:
+                print(message)
 
-            for error in errors:
-                print(error.get("message", "Unknown error"))
+    return errors
@@ -0,0 +1,114 @@
+import datetime
+import sys
+import typer
+from searchadscli.utils.api_client import SearchAdsAPIError
+from searchadscli.utils.campaigns_api import get_campaigns
+from searchadscli.utils.config import get_org_id, ReportLevel, Granularity
+from searchadscli.utils.report_cache import cached_report
+from searchadscli.utils.output import OutputFormat, write_records
+from searchadscli.utils.reports_api import (
+    MAX_CHUNK_DAYS,
+    DEFAULT_CHUNK_DAYS,
+    fetch_report,
+)
+from rich.console import Console
+
+
+def report(
+    ctx: typer.Context,
+    level: ReportLevel,
+    start: datetime.date,
+    end: datetime.date,
+    granularity: Granularity | None = None,
+    campaign_ids: list[int] | None = None,
+    output: str = "-",
+    format: OutputFormat = OutputFormat.csv,
+    chunk_days: int | None = None,
+    cache: bool | None = None,
+):
+    """
+    Fetch a campaign, ad group, keyword or search term report and write its
+    rows to `output` as they arrive.
+
+    The date range is split into chunks that are requested at the same time,
+    each one paginated on its own, within the org's rate limit. Ad group,
+    keyword and search term reports are requested per campaign, for the
+    given campaigns or all of them.
+
+    Daily reports go through the report cache unless `cache` is False: only
+    the days that aren't cached or may still change are fetched, and the
+    whole range is then written from the cache in date order. Other
+    granularities are never cached, asking for it prints a warning.
+    """
+
+    org_id = get_org_id(ctx)
+    console = Console(stderr=True)
+
+    if end < start:
+        typer.echo("Error: The end date is before the start date.")
+        raise typer.Exit(code=1)
+
+    max_days = MAX_CHUNK_DAYS[granularity]
+    chunk_days = chunk_days or DEFAULT_CHUNK_DAYS[granularity]
+    if chunk_days > max_days:
+        typer.echo(
+            f"Error: Reports by {granularity.value if granularity else 'total'} "
+            f"cover at most {max_days} days per request."
+        )
+        raise typer.Exit(code=1)
+
+    if level == ReportLevel.campaigns:
+        campaign_ids = [None]
+    elif not campaign_ids:
+        try:
+            with console.status("[dots2]Fetching campaigns..."):
+                campaign_ids = [
+                    campaign["id"]
+                    for campaign in get_campaigns(ctx, org_id, prefetch=True)
+                ]
+        except SearchAdsAPIError as e:
+            typer.echo(f"Failed to fetch campaigns. Status Code: {e.status_code}")
+            raise typer.Exit(code=1)
+
+    use_cache = cache is not False and granularity == Granularity.daily
+    if cache and not use_cache:
+        console.print(
+            "[yellow]Only daily reports are cached (--granularity daily), "
+            "fetching this one from the API.[/yellow]"
+        )
+    if use_cache:
+        records, failures, fetched = cached_report(
+            ctx, org_id, level, campaign_ids, start, end, chunk_days
+        )
+    else:
+        records, failures, fetched = fetch_report(
+            ctx, org_id, level, campaign_ids, start, end, granularity, chunk_days
+        )
+
+    stream = sys.stdout if output == "-" else open(output, "w", newline="")
+    try:
+        with console.status(
+            f"[dots2]Fetching {level.value} report ({fetched} requests)..."
+        ):
+            count = write_records(records, format, stream=stream)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    for (campaign_id, chunk_start, chunk_end), error in failures:
+        scope = f"campaign {campaign_id} " if campaign_id else ""
+        messages = (
+            error.messages if isinstance(error, SearchAdsAPIError) else [str(error)]
+        )
+        for message in messages:
+            typer.echo(
+                f"Failed to fetch {scope}{chunk_start} to {chunk_end}: {message}",
+                err=True,
+            )
+
+    if output != "-":
+        cached = " (missing days fetched, the rest from cache)" if use_cache else ""
+        typer.echo(f"Wrote {count} rows to {output}{cached}.")
+
+    if failures:
+        raise typer.Exit(code=1)
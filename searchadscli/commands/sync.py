@@ -0,0 +1,115 @@
+import typer
+import datetime
+from searchadscli.utils.adgroups_api import get_adgroups
+from searchadscli.utils.api_client import SearchAdsAPIError
+from searchadscli.utils.campaigns_api import get_campaigns
+from searchadscli.utils.concurrency import map_concurrently, get_concurrency
+from searchadscli.utils.config import get_org_id
+from searchadscli.utils.keywords_api import (
+    find_targeting_keywords,
+    find_negative_keywords,
+)
+from searchadscli.utils.mirror import Mirror
+from rich.console import Console
+from rich.table import Table
+
+
+def sync(ctx: typer.Context, full: bool = False):
+    """
+    Mirror campaigns, ad groups, targeting keywords and negative keywords
+    into the local SQLite database.
+
+    Campaigns and ad groups are always refreshed in full. Keywords are
+    refreshed incrementally, asking only for those modified since the
+    campaign was last synced, unless `full` is set.
+    """
+
+    org_id = get_org_id(ctx)
+    console = Console()
+    mirror = Mirror()
+
+    synced_at = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+
+    try:
+        with console.status("[dots2]Fetching campaigns..."):
+            campaigns = list(get_campaigns(ctx, org_id, prefetch=True))
+    except SearchAdsAPIError as e:
+        typer.echo(f"Failed to fetch campaigns. Status Code: {e.status_code}")
+        raise typer.Exit(code=1)
+
+    mirror.replace_campaigns(org_id, campaigns)
+
+    def sync_campaign(campaign: dict):
+        campaign_id = campaign["id"]
+        scope = f"keywords:{campaign_id}"
+        since = None if full else mirror.last_synced(org_id, scope)
+
+        conditions = []
+        if since:
+            conditions.append(
+                {
+                    "field": "modificationTime",
+                    "operator": "GREATER_THAN",
+                    "values": [since],
+                }
+            )
+
+        adgroups = list(get_adgroups(ctx, org_id, campaign_id))
+        mirror.replace_adgroups(org_id, campaign_id, adgroups)
+
+        targeting_keywords = list(
+            find_targeting_keywords(ctx, org_id, campaign_id, conditions)
+        )
+        mirror.upsert_targeting_keywords(
+            org_id, targeting_keywords, replace_campaign=None if since else campaign_id
+        )
+
+        negative_keywords = list(
+            find_negative_keywords(ctx, org_id, campaign_id, conditions)
+        )
+        mirror.upsert_negative_keywords(
+            org_id, negative_keywords, replace_campaign=None if since else campaign_id
+        )
+
+        mirror.mark_synced(org_id, scope, synced_at)
+
+        return len(adgroups), len(targeting_keywords), len(negative_keywords)
+
+    table = Table(title="Sync", show_header=True, header_style="bold magenta")
+    table.add_column("Campaign")
+    table.add_column("Ad Groups", justify="right")
+    table.add_column("Keywords Synced", justify="right")
+    table.add_column("Negative Keywords Synced", justify="right")
+
+    failed = 0
+    results = {}
+
+    with console.status(f"[dots2]Syncing {len(campaigns)} campaigns..."):
+        for campaign, counts, error in map_concurrently(
+            sync_campaign, campaigns, get_concurrency(ctx)
+        ):
+            results[campaign["id"]] = (counts, error)
+
+    for campaign in campaigns:
+        counts, error = results[campaign["id"]]
+        if error:
+            failed += 1
+            messages = (
+                error.messages if isinstance(error, SearchAdsAPIError) else [str(error)]
+            )
+            table.add_row(campaign["name"], f"[red]Failed: {', '.join(messages)}[/red]")
+        else:
+            table.add_row(campaign["name"], *(str(count) for count in counts))
+
+    # Keyword commands only trust the mirror once a sync has completed
+    if not failed:
+        mirror.mark_synced(org_id, "campaigns", synced_at)
+
+    console.print(table)
+    mirror.close()
+
+    if failed:
+        typer.echo(f"{failed} campaigns failed to sync.")
+        raise typer.Exit(code=1)
+
+    console.print(f"Synced {len(campaigns)} campaigns.", style="bold")
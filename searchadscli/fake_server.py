@@ -0,0 +1,686 @@
+"""
+In-memory stand-in for the Search Ads API and the Apple ID token endpoint,
+for running the CLI offline. It serves the OAuth token, campaign, ad group,
+targeting keyword and negative keyword endpoints the CLI uses, and can add
+latency, server errors and 429s to every API request.
+
+    python -m searchadscli.fake_server --port 8080 --campaign-sets 10 \\
+        --keywords-per-adgroup 1000 --latency-ms 40 --throttle-rate 0.02
+
+Then point a config profile at it:
+
+    searchadscli --config-profile fake config \\
+        --api-base-url http://127.0.0.1:8080/api/v4 \\
+        --auth-url http://127.0.0.1:8080/auth/oauth2/token
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from searchadscli.utils.config import CAMPAIGN_PREFIX, CAMPAIGN_STRUCTURE
+
+API_PREFIX = "/api/v4"
+TOKEN_PATH = "/auth/oauth2/token"
+
+# Most items the real API accepts in one bulk request
+MAX_BULK_ITEMS = 1000
+
+# Countries of the campaign sets created by `seed`, one set per country
+SEED_COUNTRIES = [
+    "US", "GB", "CA", "AU", "DE", "FR", "IT", "ES", "NL", "SE",
+    "NO", "DK", "FI", "IE", "NZ", "AT", "CH", "BE", "PT", "PL",
+    "JP", "KR", "MX", "BR", "AR", "CL", "CO", "IN", "SG", "HK",
+]  # fmt: skip
+
+
+def now() -> str:
+    return datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+
+
+def error_body(message: str, code: str = "INVALID_INPUT") -> dict:
+    return {
+        "data": None,
+        "error": {"errors": [{"messageCode": code, "message": message, "field": ""}]},
+    }
+
+
+def page(items: list, offset: int, limit: int) -> dict:
+    selected = items[offset : offset + limit]
+    return {
+        "data": selected,
+        "pagination": {
+            "totalResults": len(items),
+            "startIndex": offset,
+            "itemsPerPage": len(selected),
+        },
+    }
+
+
+def matches(item: dict, conditions: list[dict]) -> bool:
+    """
+    Check an object against `find` selector conditions.
+    """
+
+    for condition in conditions:
+        value = item.get(condition["field"])
+        values = condition.get("values", [])
+        operator = condition["operator"]
+
+        if operator == "EQUALS":
+            ok = value == values[0]
+        elif operator == "IN":
+            ok = value in values
+        elif operator == "STARTSWITH":
+            ok = isinstance(value, str) and value.startswith(values[0])
+        elif operator == "CONTAINS":
+            ok = values[0] in (value or "")
+        elif operator == "CONTAINS_ALL":
+            ok = set(values) <= set(value or [])
+        elif operator == "CONTAINS_ANY":
+            ok = bool(set(values) & set(value or []))
+        elif operator == "GREATER_THAN":
+            ok = value is not None and value > values[0]
+        elif operator == "LESS_THAN":
+            ok = value is not None and value < values[0]
+        else:
+            raise ValueError(f"Unsupported operator: {operator}")
+
+        if not ok:
+            return False
+    return True
+
+
+class FakeSearchAds:
+    """
+    Accounts of the fake API, by org ID. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1000)
+        self.campaigns = {}  # org -> {id: campaign}
+        self.adgroups = {}  # campaign id -> {id: ad group}
+        self.targeting_keywords = {}  # campaign id -> {id: keyword}
+        self.negative_keywords = {}  # campaign id -> {id: keyword}
+
+    def seed(
+        self,
+        org_id: str,
+        app_id: int,
+        campaign_sets: int,
+        keywords_per_adgroup: int,
+        negatives_per_campaign: int = 0,
+    ):
+        """
+        Create SearchAdsCLI campaign sets with their ad groups and keywords,
+        one set per country of SEED_COUNTRIES.
+        """
+
+        if campaign_sets > len(SEED_COUNTRIES):
+            raise ValueError(f"At most {len(SEED_COUNTRIES)} campaign sets")
+
+        for country in SEED_COUNTRIES[:campaign_sets]:
+            for campaign_type, structure in CAMPAIGN_STRUCTURE.items():
+                campaign = self.create_campaign(
+                    org_id,
+                    {
+                        "adamId": app_id,
+                        "name": f"{CAMPAIGN_PREFIX}_{campaign_type}_{country}-{app_id}",
+                        "countriesOrRegions": [country],
+                        "dailyBudgetAmount": {"amount": "50", "currency": "USD"},
+                        "status": "ENABLED",
+                    },
+                )
+
+                for adgroup_structure in structure["adgroups"]:
+                    adgroup = self.create_adgroup(
+                        campaign["id"],
+                        {
+                            "name": adgroup_structure["name"],
+                            "defaultBidAmount": {"amount": "1", "currency": "USD"},
+                            "automatedKeywordsOptIn": adgroup_structure.get(
+                                "searchMatch", False
+                            ),
+                        },
+                    )
+
+                    match_type = adgroup_structure.get("matchType")
+                    if match_type:
+                        self.create_targeting_keywords(
+                            campaign["id"],
+                            adgroup["id"],
+                            [
+                                {
+                                    "text": f"keyword {idx}",
+                                    "matchType": match_type.value,
+                                }
+                                for idx in range(keywords_per_adgroup)
+                            ],
+                        )
+
+                self.create_negative_keywords(
+                    campaign["id"],
+                    [
+                        {"text": f"negative {idx}", "matchType": "EXACT"}
+                        for idx in range(negatives_per_campaign)
+                    ],
+                )
+
+    def create_campaign(self, org_id: str, data: dict) -> dict:
+        with self.lock:
+            campaign = {
+                "id": next(self.ids),
+                "orgId": int(org_id),
+                "name": data["name"],
+                "adamId": data.get("adamId"),
+                "adChannelType": data.get("adChannelType", "SEARCH"),
+                "billingEvent": data.get("billingEvent", "TAPS"),
+                "dailyBudgetAmount": data.get("dailyBudgetAmount"),
+                "countriesOrRegions": data.get("countriesOrRegions", []),
+                "supplySources": data.get("supplySources", []),
+                "deleted": False,
+                "modificationTime": now(),
+            }
+            set_status(campaign, data.get("status", "ENABLED"))
+            self.campaigns.setdefault(str(org_id), {})[campaign["id"]] = campaign
+            self.adgroups[campaign["id"]] = {}
+            self.targeting_keywords[campaign["id"]] = {}
+            self.negative_keywords[campaign["id"]] = {}
+        return campaign
+
+    def create_adgroup(self, campaign_id: int, data: dict) -> dict:
+        with self.lock:
+            adgroup = {
+                "id": next(self.ids),
+                "campaignId": campaign_id,
+                "name": data["name"],
+                "defaultBidAmount": data.get("defaultBidAmount"),
+                "pricingModel": data.get("pricingModel", "CPC"),
+                "automatedKeywordsOptIn": data.get("automatedKeywordsOptIn", False),
+                "targetingDimensions": data.get("targetingDimensions"),
+                "startTime": data.get("startTime", now()),
+                "deleted": False,
+                "modificationTime": now(),
+            }
+            set_status(adgroup, data.get("status", "ENABLED"))
+            self.adgroups[campaign_id][adgroup["id"]] = adgroup
+        return adgroup
+
+    def create_targeting_keywords(
+        self, campaign_id: int, adgroup_id: int, keywords: list[dict]
+    ) -> list[dict]:
+        adgroup = self.adgroups[campaign_id][adgroup_id]
+        created = []
+        with self.lock:
+            for keyword in keywords:
+                item = {
+                    "id": next(self.ids),
+                    "campaignId": campaign_id,
+                    "adGroupId": adgroup_id,
+                    "text": keyword["text"],
+                    "matchType": keyword.get("matchType", "BROAD"),
+                    "bidAmount": keyword.get("bidAmount")
+                    or adgroup["defaultBidAmount"],
+                    "status": "ACTIVE",
+                    "deleted": False,
+                    "modificationTime": now(),
+                }
+                self.targeting_keywords[campaign_id][item["id"]] = item
+                created.append(item)
+        return created
+
+    def create_negative_keywords(
+        self, campaign_id: int, keywords: list[dict]
+    ) -> list[dict]:
+        created = []
+        with self.lock:
+            for keyword in keywords:
+                item = {
+                    "id": next(self.ids),
+                    "campaignId": campaign_id,
+                    "text": keyword["text"],
+                    "matchType": keyword.get("matchType", "EXACT"),
+                    "status": "ACTIVE",
+                    "deleted": False,
+                    "modificationTime": now(),
+                }
+                self.negative_keywords[campaign_id][item["id"]] = item
+                created.append(item)
+        return created
+
+    def handle(
+        self, method: str, path: str, org_id: str, query: dict, body
+    ) -> tuple[int, dict]:
+        """
+        Answer one API request with a status code and a response body.
+        """
+
+        for route_method, pattern, name in ROUTES:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                ids = [int(value) for value in match.groups()]
+                return getattr(self, name)(org_id, ids, query, body)
+
+        return 404, error_body(f"No route for {method} {path}", "NOT_FOUND")
+
+    def campaign(self, org_id: str, campaign_id: int) -> dict | None:
+        return self.campaigns.get(org_id, {}).get(campaign_id)
+
+    def get_campaigns(self, org_id, ids, query, body):
+        with self.lock:
+            campaigns = list(self.campaigns.get(org_id, {}).values())
+        return 200, page(campaigns, *query_pagination(query))
+
+    def find_campaigns(self, org_id, ids, query, body):
+        with self.lock:
+            campaigns = [
+                campaign
+                for campaign in self.campaigns.get(org_id, {}).values()
+                if matches(campaign, body.get("conditions") or [])
+            ]
+        return 200, page(campaigns, *selector_pagination(body))
+
+    def post_campaign(self, org_id, ids, query, body):
+        return 200, {"data": self.create_campaign(org_id, body)}
+
+    def put_campaign(self, org_id, ids, query, body):
+        campaign = self.campaign(org_id, ids[0])
+        if not campaign:
+            return 404, error_body("Campaign not found", "NOT_FOUND")
+
+        with self.lock:
+            update = body.get("campaign", {})
+            if "status" in update:
+                set_status(campaign, update["status"])
+            campaign["modificationTime"] = now()
+        return 200, {"data": campaign}
+
+    def get_adgroups(self, org_id, ids, query, body):
+        if not self.campaign(org_id, ids[0]):
+            return 404, error_body("Campaign not found", "NOT_FOUND")
+
+        with self.lock:
+            adgroups = list(self.adgroups[ids[0]].values())
+        return 200, page(adgroups, *query_pagination(query))
+
+    def post_adgroup(self, org_id, ids, query, body):
+        if not self.campaign(org_id, ids[0]):
+            return 404, error_body("Campaign not found", "NOT_FOUND")
+        return 200, {"data": self.create_adgroup(ids[0], body)}
+
+    def find_targeting_keywords(self, org_id, ids, query, body):
+        if not self.campaign(org_id, ids[0]):
+            return 404, error_body("Campaign not found", "NOT_FOUND")
+
+        with self.lock:
+            keywords = [
+                keyword
+                for keyword in self.targeting_keywords[ids[0]].values()
+                if matches(keyword, body.get("conditions") or [])
+            ]
+        return 200, page(keywords, *selector_pagination(body))
+
+    def post_targeting_keywords(self, org_id, ids, query, body):
+        campaign_id, adgroup_id = ids
+        if adgroup_id not in self.adgroups.get(campaign_id, {}):
+            return 404, error_body("Ad group not found", "NOT_FOUND")
+        if len(body) > MAX_BULK_ITEMS:
+            return 400, error_body(f"At most {MAX_BULK_ITEMS} keywords per request")
+
+        return 200, {
+            "data": self.create_targeting_keywords(campaign_id, adgroup_id, body)
+        }
+
+    def put_targeting_keywords(self, org_id, ids, query, body):
+        campaign_id, adgroup_id = ids
+        if adgroup_id not in self.adgroups.get(campaign_id, {}):
+            return 404, error_body("Ad group not found", "NOT_FOUND")
+        if len(body) > MAX_BULK_ITEMS:
+            return 400, error_body(f"At most {MAX_BULK_ITEMS} keywords per request")
+
+        updated = []
+        with self.lock:
+            keywords = self.targeting_keywords[campaign_id]
+            for update in body:
+                keyword = keywords.get(update["id"])
+                if keyword is None or keyword["adGroupId"] != adgroup_id:
+                    return 400, error_body(f"Keyword {update['id']} not found")
+                keyword.update(
+                    {key: value for key, value in update.items() if key != "id"}
+                )
+                keyword["modificationTime"] = now()
+                updated.append(keyword)
+        return 200, {"data": updated}
+
+    def delete_targeting_keywords(self, org_id, ids, query, body):
+        campaign_id, adgroup_id = ids
+        if adgroup_id not in self.adgroups.get(campaign_id, {}):
+            return 404, error_body("Ad group not found", "NOT_FOUND")
+
+        with self.lock:
+            keywords = self.targeting_keywords[campaign_id]
+            for keyword_id in body:
+                keyword = keywords.get(keyword_id)
+                if keyword and keyword["adGroupId"] == adgroup_id:
+                    del keywords[keyword_id]
+        return 200, {"data": None}
+
+    def find_negative_keywords(self, org_id, ids, query, body):
+        if not self.campaign(org_id, ids[0]):
+            return 404, error_body("Campaign not found", "NOT_FOUND")
+
+        with self.lock:
+            keywords = [
+                keyword
+                for keyword in self.negative_keywords[ids[0]].values()
+                if matches(keyword, body.get("conditions") or [])
+            ]
+        return 200, page(keywords, *selector_pagination(body))
+
+    def post_negative_keywords(self, org_id, ids, query, body):
+        if not self.campaign(org_id, ids[0]):
+            return 404, error_body("Campaign not found", "NOT_FOUND")
+        if len(body) > MAX_BULK_ITEMS:
+            return 400, error_body(f"At most {MAX_BULK_ITEMS} keywords per request")
+
+        return 200, {"data": self.create_negative_keywords(ids[0], body)}
+
+    def delete_negative_keywords(self, org_id, ids, query, body):
+        if not self.campaign(org_id, ids[0]):
+            return 404, error_body("Campaign not found", "NOT_FOUND")
+
+        with self.lock:
+            keywords = self.negative_keywords[ids[0]]
+            for keyword_id in body:
+                keywords.pop(keyword_id, None)
+        return 200, {"data": None}
+
+
+ROUTES = [
+    ("GET", r"/campaigns", "get_campaigns"),
+    ("POST", r"/campaigns", "post_campaign"),
+    ("POST", r"/campaigns/find", "find_campaigns"),
+    ("PUT", r"/campaigns/(\d+)", "put_campaign"),
+    ("GET", r"/campaigns/(\d+)/adgroups", "get_adgroups"),
+    ("POST", r"/campaigns/(\d+)/adgroups", "post_adgroup"),
+    (
+        "POST",
+        r"/campaigns/(\d+)/adgroups/targetingkeywords/find",
+        "find_targeting_keywords",
+    ),
+    (
+        "POST",
+        r"/campaigns/(\d+)/adgroups/(\d+)/targetingkeywords/bulk",
+        "post_targeting_keywords",
+    ),
+    (
+        "PUT",
+        r"/campaigns/(\d+)/adgroups/(\d+)/targetingkeywords/bulk",
+        "put_targeting_keywords",
+    ),
+    (
+        "POST",
+        r"/campaigns/(\d+)/adgroups/(\d+)/targetingkeywords/delete/bulk",
+        "delete_targeting_keywords",
+    ),
+    ("POST", r"/campaigns/(\d+)/negativekeywords/find", "find_negative_keywords"),
+    ("POST", r"/campaigns/(\d+)/negativekeywords/bulk", "post_negative_keywords"),
+    (
+        "POST",
+        r"/campaigns/(\d+)/negativekeywords/delete/bulk",
+        "delete_negative_keywords",
+    ),
+]
+
+
+def set_status(item: dict, status: str):
+    item["status"] = status
+    running = status == "ENABLED"
+    item["servingStatus"] = "RUNNING" if running else "NOT_RUNNING"
+    item["displayStatus"] = "RUNNING" if running else "PAUSED"
+
+
+def query_pagination(query: dict) -> tuple[int, int]:
+    offset = int(query.get("offset", ["0"])[0])
+    limit = int(query.get("limit", ["20"])[0])
+    return offset, limit
+
+
+def selector_pagination(body: dict) -> tuple[int, int]:
+    pagination = (body.get("pagination") or {}) if isinstance(body, dict) else {}
+    return pagination.get("offset", 0), pagination.get("limit", 20)
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def respond(self, status: int, body: dict, headers: dict | None = None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.count(status)
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def handle_request(self):
+        server = self.server
+        url = urlparse(self.path)
+        raw_body = self.read_body()
+
+        server.wait()
+
+        if url.path == TOKEN_PATH and self.command == "POST":
+            self.respond(
+                200,
+                {
+                    "access_token": f"fake-{next(server.tokens)}",
+                    "token_type": "Bearer",
+                    "expires_in": 3600,
+                },
+            )
+            return
+
+        if not url.path.startswith(API_PREFIX):
+            self.respond(404, error_body("Not found", "NOT_FOUND"))
+            return
+
+        if not (self.headers.get("Authorization") or "").startswith("Bearer "):
+            self.respond(401, error_body("Missing access token", "UNAUTHORIZED"))
+            return
+
+        fault = server.fault()
+        if fault == 429:
+            self.respond(
+                429,
+                error_body("Too many requests", "RATE_LIMIT_EXCEEDED"),
+                {"Retry-After": str(server.retry_after)},
+            )
+            return
+        if fault == 500:
+            self.respond(500, error_body("Internal server error", "SERVER_ERROR"))
+            return
+
+        org_id = (self.headers.get("X-AP-Context") or "").partition("orgId=")[2]
+
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+            status, response = server.api.handle(
+                self.command,
+                url.path[len(API_PREFIX) :].rstrip("/"),
+                org_id,
+                parse_qs(url.query),
+                body,
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            status, response = 400, error_body(str(e))
+
+        self.respond(status, response)
+
+    do_GET = handle_request
+    do_POST = handle_request
+    do_PUT = handle_request
+    do_DELETE = handle_request
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeServer(ThreadingHTTPServer):
+    """
+    HTTP server for a FakeSearchAds. Every API request waits `latency_ms`
+    plus up to `jitter_ms`, and then fails with a 429 at `throttle_rate` or
+    a 500 at `error_rate`. With `rate_limit`, requests over that many per
+    second are answered with a 429 as well. Token requests only get the
+    latency.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        api: FakeSearchAds | None = None,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        throttle_rate: float = 0,
+        rate_limit: float | None = None,
+        retry_after: float = 1,
+        seed: int | None = None,
+    ):
+        super().__init__(address, FakeHandler)
+        self.api = api or FakeSearchAds()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.tokens = itertools.count(1)
+
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.window_requests = 0
+        self.stats = {}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_base_url(self) -> str:
+        return f"{self.base_url}{API_PREFIX}"
+
+    @property
+    def auth_url(self) -> str:
+        return f"{self.base_url}{TOKEN_PATH}"
+
+    def wait(self):
+        with self.lock:
+            delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+
+    def fault(self) -> int | None:
+        with self.lock:
+            if self.rate_limit:
+                current = time.monotonic()
+                if current - self.window_start >= 1:
+                    self.window_start = current
+                    self.window_requests = 0
+                self.window_requests += 1
+                if self.window_requests > self.rate_limit:
+                    return 429
+
+            roll = self.random.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+    def count(self, status: int):
+        with self.lock:
+            self.stats[status] = self.stats.get(status, 0) + 1
+
+
+def start_fake_server(host: str = "127.0.0.1", port: int = 0, **options):
+    """
+    Start a fake server on a background thread and return it. Its URLs are
+    available as `server.api_base_url` and `server.auth_url`.
+    """
+
+    server = FakeServer((host, port), **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--org-id", default="1")
+    parser.add_argument("--app-id", type=int, default=1)
+    parser.add_argument("--campaign-sets", type=int, default=0)
+    parser.add_argument("--keywords-per-adgroup", type=int, default=0)
+    parser.add_argument("--negatives-per-campaign", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--throttle-rate", type=float, default=0)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--retry-after", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    api = FakeSearchAds()
+    api.seed(
+        args.org_id,
+        args.app_id,
+        args.campaign_sets,
+        args.keywords_per_adgroup,
+        args.negatives_per_campaign,
+    )
+
+    server = FakeServer(
+        (args.host, args.port),
+        api,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    print(f"API:   {server.api_base_url}")
+    print(f"OAuth: {server.auth_url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
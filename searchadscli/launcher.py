@@ -0,0 +1,140 @@
+"""
+Entry point of the `searchadscli` command.
+
+When `searchadscli daemon` is running, the command is handed to it together
+with this process' stdin, stdout and stderr, so it runs with the daemon's
+imports, access token, connections and caches, and prompts and output
+still go to this terminal. Otherwise, or while the daemon is busy with
+another command, it runs in this process.
+
+Only the standard library is imported here, so forwarding costs little
+more than starting the interpreter.
+"""
+
+import json
+import os
+import socket
+import sys
+
+# Here rather than in utils/config.py, which imports typer
+DAEMON_SOCKET_PATH = os.path.expanduser("~/.searchads_cli_daemon.sock")
+
+# Commands that always run in this process
+LOCAL_COMMANDS = {"daemon"}
+
+# Options before the command that take a value, as defined in main.py
+GLOBAL_VALUE_OPTIONS = {"--config-profile", "--orgs", "--trace-file", "--profile"}
+
+
+def split_command(args: list[str]) -> tuple[dict, str | None]:
+    """
+    The global options and the command name of a command line.
+    """
+
+    options = {}
+    args = iter(args)
+    for arg in args:
+        if not arg.startswith("-"):
+            return options, arg
+
+        name, has_value, value = arg.partition("=")
+        if name in GLOBAL_VALUE_OPTIONS and not has_value:
+            value = next(args, None)
+        options[name] = value if name in GLOBAL_VALUE_OPTIONS else True
+
+    return options, None
+
+
+def forward(args: list[str], socket_path: str = DAEMON_SOCKET_PATH) -> int | None:
+    """
+    Run a command in the daemon. Returns its exit code, or None when there
+    is no daemon to run it or it is busy with another command.
+    """
+
+    if os.environ.get("SEARCHADS_CLI_NO_DAEMON") or not hasattr(socket, "send_fds"):
+        return None
+
+    if split_command(args)[1] in LOCAL_COMMANDS or not os.path.exists(socket_path):
+        return None
+
+    try:
+        for fd in (0, 1, 2):
+            os.fstat(fd)
+    except OSError:
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+
+    request = {"args": args, "cwd": os.getcwd(), "env": dict(os.environ)}
+
+    with sock:
+        reader = sock.makefile("rb")
+        try:
+            if reader.readline() != b"ready\n":
+                return None
+        except OSError:
+            return None
+
+        socket.send_fds(sock, [b"R"], [0, 1, 2])
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        return wait_for_exit(sock, reader)
+
+
+def wait_for_exit(sock: socket.socket, reader) -> int:
+    # Ctrl-C reaches this process, pass it on to the command in the daemon
+    while True:
+        try:
+            line = reader.readline()
+        except KeyboardInterrupt:
+            sock.sendall(b"interrupt\n")
+            continue
+
+        if not line:
+            print(
+                "Error: The searchadscli daemon stopped while running the command.",
+                file=sys.stderr,
+            )
+            return 1
+        return int(line)
+
+
+def stop(socket_path: str = DAEMON_SOCKET_PATH) -> bool:
+    """
+    Ask a running daemon to exit, waiting for a command it is running to
+    finish. Returns False if none is running.
+    """
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return False
+
+    with sock:
+        reader = sock.makefile("rb")
+        try:
+            reader.readline()
+            sock.sendall(b"S" + json.dumps({"stop": True}).encode() + b"\n")
+            reader.readline()
+        except OSError:
+            pass
+    return True
+
+
+def run():
+    code = forward(sys.argv[1:])
+    if code is None:
+        from searchadscli.main import app
+
+        app(prog_name="searchadscli")
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    run()
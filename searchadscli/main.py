@@ -1,14 +1,24 @@
+import datetime
 import typer
 from typing_extensions import Annotated
-from searchadscli.utils.config import get_config, check_config_values, CampaignType
-from searchadscli.commands.campaign import list_campaigns, create_campaigns
-from searchadscli.commands.keywords import add_keywords as add_keywords_cmd
-from searchadscli.commands.keywords import add_negative_keywords as add_negative_keywords_cmd
-from searchadscli.commands.configure import configure as configure_cmd
-
+from searchadscli.utils.config import (
+    get_config,
+    check_config_values,
+    CampaignType,
+    ReportLevel,
+    Granularity,
+)
+from searchadscli.utils.concurrency import DEFAULT_CONCURRENCY
+from searchadscli.utils.keyword_input import KeywordFileFormat
+from searchadscli.utils.output import OutputFormat
+from searchadscli.utils.profiles import get_profile_config, resolve_targets
+from searchadscli.utils.tracing import Tracer, report_trace
 
 app = typer.Typer(rich_markup_mode="rich")
 
+# Command modules are imported inside each command so that `--help` and
+# commands that never call the API don't load the HTTP and crypto stacks.
+
 
 def validate_campaign_type(value: CampaignType) -> CampaignType:
     try:
@@ -21,12 +31,89 @@ def validate_campaign_type(value: CampaignType) -> CampaignType:
         raise typer.BadParameter(str(e))
 
 
+# Commands that can run for several orgs at once
+MULTI_TARGET_COMMANDS = {"get-campaigns", "add-negative-keywords"}
+
+
 @app.callback()
-def main(ctx: typer.Context):
+def main(
+    ctx: typer.Context,
+    config_profile: str = typer.Option(
+        None,
+        "--config-profile",
+        envvar="SEARCHADS_CLI_PROFILE",
+        help="Use a named profile from the config file.",
+    ),
+    all_profiles: bool = typer.Option(
+        False,
+        "--all-profiles",
+        help="Run get-campaigns or add-negative-keywords for every profile at once.",
+    ),
+    orgs: str = typer.Option(
+        None,
+        "--orgs",
+        help="Comma separated org IDs to run get-campaigns or add-negative-keywords for at once.",
+    ),
+    trace: bool = typer.Option(
+        False,
+        "--trace",
+        help="Time every API request and print a summary per endpoint at exit.",
+    ),
+    trace_file: str = typer.Option(
+        None,
+        "--trace-file",
+        help="Also write the trace as OpenTelemetry (OTLP) JSON to this file. Implies --trace.",
+    ),
+    profile: str = typer.Option(
+        None,
+        "--profile",
+        help="Profile the command, writing PATH.prof (pstats) and PATH.collapsed (flame graph stacks).",
+    ),
+):
     """Apple Search Ads CLI: A simple CLI to get started with Apple Search Ads Advanced."""
+    if profile:
+        from searchadscli.utils.profiling import Profiler, report_profile
+
+        profiler = Profiler(profile)
+        profiler.start()
+        # Closed last, so the summaries printed at exit are profiled too
+        ctx.call_on_close(lambda: report_profile(profiler))
+
     config = get_config()
     ctx.ensure_object(dict)
-    ctx.obj["config"] = config
+    ctx.obj["profile"] = config_profile
+    # `config` may be creating the profile, so it reads the file itself
+    if ctx.invoked_subcommand == "config":
+        ctx.obj["config"] = config
+    else:
+        ctx.obj["config"] = get_profile_config(config, config_profile)
+
+    if all_profiles or orgs:
+        if ctx.invoked_subcommand not in MULTI_TARGET_COMMANDS:
+            typer.echo(
+                f"Error: --all-profiles and --orgs only work with {', '.join(sorted(MULTI_TARGET_COMMANDS))}."
+            )
+            raise typer.Exit(code=1)
+
+        org_list = [org.strip() for org in orgs.split(",")] if orgs else None
+        ctx.obj["targets"] = resolve_targets(config, all_profiles, org_list)
+        if not ctx.obj["targets"]:
+            typer.echo("Error: No profile has an org ID. Set one with `config`.")
+            raise typer.Exit(code=1)
+    ctx.call_on_close(lambda: report_stats_on_close(ctx))
+
+    if trace or trace_file:
+        tracer = Tracer(f"searchadscli {ctx.invoked_subcommand}")
+        ctx.obj["tracer"] = tracer
+        ctx.call_on_close(lambda: report_trace(tracer, trace_file))
+
+
+def report_stats_on_close(ctx: typer.Context):
+    # Only commands that created API clients have anything to report
+    if ctx.obj.get("clients"):
+        from searchadscli.utils.api_client import report_request_stats
+
+        report_request_stats(ctx)
 
 
 @app.command()
@@ -43,24 +130,98 @@ def config(
     key_id: str = typer.Option(None, "--key-id", help="Key ID."),
     org_id: str = typer.Option(None, "--org-id", help="Organization ID."),
     app_id: int = typer.Option(None, "--app-id", help="Apple App ID."),
+    pool_size: int = typer.Option(
+        None, "--pool-size", help="Number of pooled API connections to keep alive."
+    ),
+    adgroup_cache_ttl: int = typer.Option(
+        None,
+        "--adgroup-cache-ttl",
+        help="Seconds to keep ad group lists cached on disk between runs. 0 turns it off.",
+    ),
+    mirror_max_age: int = typer.Option(
+        None,
+        "--mirror-max-age",
+        help="Seconds after a sync that keyword commands trust the local mirror. 0 trusts it however old.",
+    ),
+    rate_limit: float = typer.Option(
+        None, "--rate-limit", help="Maximum API requests per second."
+    ),
+    org_rate_limit: list[str] = typer.Option(
+        None,
+        "--org-rate-limit",
+        help="Maximum API requests per second for one org, as ORG_ID=RATE. Can be repeated.",
+    ),
+    max_retries: int = typer.Option(
+        None,
+        "--max-retries",
+        help="Times a throttled or failed API request is retried. 0 turns retries off.",
+    ),
+    api_base_url: str = typer.Option(
+        None,
+        "--api-base-url",
+        help="Search Ads API URL, e.g. of a local fake server. 'default' resets it.",
+    ),
+    auth_url: str = typer.Option(
+        None,
+        "--auth-url",
+        help="OAuth token URL, e.g. of a local fake server. 'default' resets it.",
+    ),
 ):
     """Set up the CLI with necessary authentication details."""
+    from searchadscli.commands.configure import configure as configure_cmd
+
     configure_cmd(
-        ctx, all, private_key_file, client_id, team_id, key_id, org_id, app_id
+        ctx,
+        all,
+        private_key_file,
+        client_id,
+        team_id,
+        key_id,
+        org_id,
+        app_id,
+        pool_size,
+        adgroup_cache_ttl,
+        mirror_max_age,
+        rate_limit,
+        org_rate_limit,
+        max_retries,
+        api_base_url,
+        auth_url,
     )
 
 
 @app.command()
-def get_campaigns(ctx: typer.Context):
+def get_campaigns(
+    ctx: typer.Context,
+    format: OutputFormat = typer.Option(
+        OutputFormat.table,
+        "--format",
+        case_sensitive=False,
+        help="Output format. json, ndjson and csv are streamed as campaigns are fetched.",
+    ),
+):
     """Fetch and display the names of Apple Search Ads campaigns."""
     check_config_values(ctx)
-    list_campaigns(ctx)
+    from searchadscli.commands.campaign import list_campaigns
+
+    list_campaigns(ctx, format)
 
 
 @app.command()
-def setup_campaigns(ctx: typer.Context):
+def setup_campaigns(
+    ctx: typer.Context,
+    concurrency: int = typer.Option(
+        DEFAULT_CONCURRENCY,
+        "--concurrency",
+        min=1,
+        help="Maximum number of campaign and ad group requests sent at the same time.",
+    ),
+):
     """Setup a new 3 campaign structure in given countries."""
     check_config_values(ctx)
+    ctx.obj["concurrency"] = concurrency
+    from searchadscli.commands.campaign import create_campaigns
+
     create_campaigns(ctx)
 
 
@@ -72,6 +233,36 @@ def add_keywords(
         case_sensitive=False,
         help="Provide 'exact' (default) or 'competitor' argument",
     ),
+    campaign: str = typer.Option(
+        None, "--campaign", help="Campaign ID or name to add keywords to."
+    ),
+    countries: str = typer.Option(
+        None,
+        "--countries",
+        help="Comma separated country codes of the campaign to add keywords to.",
+    ),
+    file: str = typer.Option(
+        None,
+        "--file",
+        help="Read keywords from a file, or '-' for stdin, instead of prompting.",
+    ),
+    file_format: KeywordFileFormat = typer.Option(
+        KeywordFileFormat.auto,
+        "--file-format",
+        case_sensitive=False,
+        help="Keyword file format. 'auto' picks it from the file extension.",
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_CONCURRENCY,
+        "--concurrency",
+        min=1,
+        help="Maximum number of keyword requests sent at the same time.",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Print the API calls that would be made without changing anything.",
+    ),
 ):
     """Add keywords to a campaign."""
     if type == CampaignType.discovery:
@@ -79,15 +270,285 @@ def add_keywords(
         raise typer.Exit(code=1)
 
     check_config_values(ctx)
-    add_keywords_cmd(ctx, type)
+    ctx.obj["concurrency"] = concurrency
+    country_list = (
+        [country.strip().upper() for country in countries.split(",")]
+        if countries
+        else None
+    )
+    from searchadscli.commands.keywords import add_keywords as add_keywords_cmd
+
+    add_keywords_cmd(ctx, type, campaign, country_list, file, file_format, dry_run)
 
 
 @app.command()
-def add_negative_keywords(ctx: typer.Context):
+def add_negative_keywords(
+    ctx: typer.Context,
+    file: str = typer.Option(
+        None,
+        "--file",
+        help="Read keywords from a file, or '-' for stdin, instead of prompting.",
+    ),
+    file_format: KeywordFileFormat = typer.Option(
+        KeywordFileFormat.auto,
+        "--file-format",
+        case_sensitive=False,
+        help="Keyword file format. 'auto' picks it from the file extension.",
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_CONCURRENCY,
+        "--concurrency",
+        min=1,
+        help="Maximum number of keyword requests sent at the same time.",
+    ),
+):
     """Add negative keywords to all campaigns"""
 
     check_config_values(ctx)
-    add_negative_keywords_cmd(ctx)
+    ctx.obj["concurrency"] = concurrency
+    from searchadscli.commands.keywords import (
+        add_negative_keywords as add_negative_keywords_cmd,
+    )
+
+    add_negative_keywords_cmd(ctx, file, file_format)
+
+
+@app.command()
+def audit_keywords(
+    ctx: typer.Context,
+    fix_plan: str = typer.Option(
+        None,
+        "--fix-plan",
+        help="Write the changes that fix the findings to this JSON file.",
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_CONCURRENCY,
+        "--concurrency",
+        min=1,
+        help="Maximum number of campaigns loaded at the same time.",
+    ),
+):
+    """Check keywords across campaign sets for conflicts and missing negatives"""
+
+    check_config_values(ctx)
+    ctx.obj["concurrency"] = concurrency
+    from searchadscli.commands.keywords import check_keywords as check_keywords_cmd
+
+    check_keywords_cmd(ctx, fix_plan)
+
+
+@app.command()
+def sync(
+    ctx: typer.Context,
+    full: bool = typer.Option(
+        False,
+        "--full",
+        help="Re-fetch every keyword instead of only those changed since the last sync.",
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_CONCURRENCY,
+        "--concurrency",
+        min=1,
+        help="Maximum number of campaigns synced at the same time.",
+    ),
+):
+    """Mirror campaigns, ad groups and keywords into a local database"""
+
+    check_config_values(ctx)
+    ctx.obj["concurrency"] = concurrency
+    from searchadscli.commands.sync import sync as sync_cmd
+
+    sync_cmd(ctx, full)
+
+
+@app.command()
+def report(
+    ctx: typer.Context,
+    level: ReportLevel = typer.Argument(
+        ...,
+        case_sensitive=False,
+        help="Report on campaigns, adgroups, keywords or searchterms.",
+    ),
+    start: datetime.datetime = typer.Option(
+        ..., "--start", formats=["%Y-%m-%d"], help="First day of the report."
+    ),
+    end: datetime.datetime = typer.Option(
+        ..., "--end", formats=["%Y-%m-%d"], help="Last day of the report."
+    ),
+    granularity: Granularity = typer.Option(
+        None,
+        "--granularity",
+        case_sensitive=False,
+        help="Break rows down by HOURLY, DAILY, WEEKLY or MONTHLY. Totals per chunk if not set.",
+    ),
+    campaign: list[int] = typer.Option(
+        None,
+        "--campaign",
+        help="Campaign ID to report on for adgroups, keywords and searchterms. Can be repeated. All campaigns if not set.",
+    ),
+    output: str = typer.Option(
+        "-", "--output", "-o", help="File to write the rows to, or '-' for stdout."
+    ),
+    format: OutputFormat = typer.Option(
+        OutputFormat.csv,
+        "--format",
+        case_sensitive=False,
+        help="Output format: csv, ndjson or json.",
+    ),
+    chunk_days: int = typer.Option(
+        None,
+        "--chunk-days",
+        min=1,
+        help="Days of data per report request. Chunks are fetched at the same time.",
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_CONCURRENCY,
+        "--concurrency",
+        min=1,
+        help="Maximum number of report requests sent at the same time.",
+    ),
+    cache: bool = typer.Option(
+        None,
+        "--cache/--no-cache",
+        help="Keep daily reports on disk and only fetch days that are missing or may still change. Only --granularity daily reports are cached, which is the default for them.",
+        show_default=False,
+    ),
+):
+    """Download a campaign, ad group, keyword or search term report"""
+
+    if format == OutputFormat.table:
+        typer.echo("Error: Reports are written as csv, ndjson or json.")
+        raise typer.Exit(code=1)
+
+    check_config_values(ctx)
+    ctx.obj["concurrency"] = concurrency
+    from searchadscli.commands.report import report as report_cmd
+
+    report_cmd(
+        ctx,
+        level,
+        start.date(),
+        end.date(),
+        granularity,
+        campaign,
+        output,
+        format,
+        chunk_days,
+        cache,
+    )
+
+
+@app.command()
+def recommend_bids(
+    ctx: typer.Context,
+    target_cpa: float = typer.Option(
+        ..., "--target-cpa", min=0.01, help="Cost per install to aim for, in USD."
+    ),
+    days: int = typer.Option(
+        30,
+        "--days",
+        min=1,
+        max=365,
+        help="Full days of keyword performance to base the bids on.",
+    ),
+    campaign: list[int] = typer.Option(
+        None,
+        "--campaign",
+        help="Campaign ID to recommend bids for. Can be repeated. All campaigns if not set.",
+    ),
+    output: str = typer.Option(
+        "bids.csv",
+        "--output",
+        "-o",
+        help="File to write the bids to, or '-' for stdout.",
+    ),
+    format: OutputFormat = typer.Option(
+        OutputFormat.csv,
+        "--format",
+        case_sensitive=False,
+        help="Output format: csv, ndjson or json.",
+    ),
+    max_change: float = typer.Option(
+        0.25,
+        "--max-change",
+        min=0.01,
+        max=1,
+        help="Largest change of a bid in one run, as a fraction of the current bid.",
+    ),
+    min_taps: int = typer.Option(
+        10,
+        "--min-taps",
+        min=0,
+        help="Taps a keyword needs before its bid is changed.",
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_CONCURRENCY,
+        "--concurrency",
+        min=1,
+        help="Maximum number of report requests sent at the same time.",
+    ),
+):
+    """Recommend keyword bids for a target CPA from keyword performance"""
+
+    if format == OutputFormat.table:
+        typer.echo("Error: Bids are written as csv, ndjson or json.")
+        raise typer.Exit(code=1)
+
+    check_config_values(ctx)
+    ctx.obj["concurrency"] = concurrency
+    from searchadscli.commands.bids import recommend_bids as recommend_bids_cmd
+
+    recommend_bids_cmd(
+        ctx, target_cpa, days, campaign, output, format, max_change, min_taps
+    )
+
+
+@app.command()
+def apply_bids(
+    ctx: typer.Context,
+    file: str = typer.Argument(..., help="File written by recommend-bids."),
+    concurrency: int = typer.Option(
+        DEFAULT_CONCURRENCY,
+        "--concurrency",
+        min=1,
+        help="Maximum number of bid updates sent at the same time.",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Print the API calls that would be made without changing anything.",
+    ),
+):
+    """Apply the bids of a recommend-bids file"""
+
+    check_config_values(ctx)
+    ctx.obj["concurrency"] = concurrency
+    from searchadscli.commands.bids import apply_bids as apply_bids_cmd
+
+    apply_bids_cmd(ctx, file, dry_run)
+
+
+@app.command()
+def daemon(
+    stop: bool = typer.Option(False, "--stop", help="Stop the running daemon."),
+    cache_ttl: int = typer.Option(
+        60,
+        "--cache-ttl",
+        help="Seconds campaign and ad group lists are reused between commands.",
+    ),
+    idle_timeout: int = typer.Option(
+        0,
+        "--idle-timeout",
+        help="Exit after this many seconds without commands. 0 runs until stopped.",
+    ),
+):
+    """Keep the access token, API connections and caches warm for later commands."""
+    from searchadscli.commands.daemon import run_daemon, stop_daemon
+
+    if stop:
+        stop_daemon()
+    else:
+        run_daemon(cache_ttl, idle_timeout)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,22 @@
 import os
+import time
+import functools
 import datetime as dt
-import requests
-from authlib.jose import jwt
-from Crypto.PublicKey import ECC
+from typing import TYPE_CHECKING
 import typer
+from searchadscli.utils.config import TOKEN_CACHE_PATH, CLIENT_SECRET_PATH
+from searchadscli.utils.store import locked_json_store
+from searchadscli.utils.tracing import SPAN_KIND_CLIENT, trace_span
+
+# authlib, pycryptodome and requests are imported where they are used, so
+# commands that don't talk to the API don't pay for loading them
+if TYPE_CHECKING:
+    from authlib.jose import ECKey
+
+# Re-sign the client secret once it has less than a day left.
+CLIENT_SECRET_RENEWAL_SECONDS = 86400
+
+TOKEN_URL = "https://appleid.apple.com/auth/oauth2/token"
 
 
 def get_access_token(ctx: typer.Context):
@@ -20,19 +33,112 @@ def get_access_token(ctx: typer.Context):
             return ctx.obj.get("access_token")
 
     config = ctx.obj["config"]
-    private_key_file = config["private_key_file"]
-    client_id = config["client_id"]
-    team_id = config["team_id"]
-    key_id = config["key_id"]
+    cache_key = token_cache_key(config)
+
+    # Share one token between every CLI process using these credentials.
+    # Holding the lock while refreshing makes parallel processes wait for
+    # the first refresh instead of all hitting the token endpoint.
+    with trace_span(ctx, "get_access_token") as span, locked_json_store(
+        TOKEN_CACHE_PATH
+    ) as tokens:
+        cached = tokens.get(cache_key)
+        if cached and time.time() < cached["expires_at"]:
+            span["searchads.token_source"] = "cache"
+            access_token = cached["access_token"]
+            access_token_expiry = dt.datetime.utcfromtimestamp(cached["expires_at"])
+        else:
+            span["searchads.token_source"] = "token endpoint"
+            access_token, access_token_expiry = request_access_token(ctx)
+            tokens[cache_key] = {
+                "access_token": access_token,
+                "expires_at": access_token_expiry.replace(
+                    tzinfo=dt.timezone.utc
+                ).timestamp(),
+            }
+
+    ctx.obj["access_token"] = access_token
+    ctx.obj["access_token_expiry"] = access_token_expiry
+
+    return access_token
+
+
+def token_cache_key(config: dict) -> str:
+    key = f"{config.get('client_id')}:{config.get('org_id')}"
+    # Tokens from another token endpoint, like a local fake, aren't shared
+    if config.get("auth_url"):
+        key += f"@{config['auth_url']}"
+    return key
+
+
+def forget_access_token(config: dict):
+    """
+    Drop the stored token for these credentials so the next call refreshes it.
+    """
 
-    audience = "https://appleid.apple.com"
-    alg = "ES256"
+    with locked_json_store(TOKEN_CACHE_PATH) as tokens:
+        tokens.pop(token_cache_key(config), None)
 
-    # Load private key file.
-    if os.path.isfile(private_key_file):
-        with open(private_key_file, "rt") as file:
-            private_key = ECC.import_key(file.read())
+
+def request_access_token(ctx: typer.Context):
+    """
+    Exchange the client secret for a new access token.
+    Returns the token and its expiry, 5 minutes early to leave a buffer.
+    """
+
+    config = ctx.obj["config"]
+    client_secret = get_client_secret(ctx)
+
+    # Now use client_secret to request access_token
+    url = config.get("auth_url") or TOKEN_URL
+    headers = {
+        "Content-Type": "application/x-www-form-urlencoded",
+    }
+    data = {
+        "grant_type": "client_credentials",
+        "client_id": config["client_id"],
+        "client_secret": client_secret,
+        "scope": "searchadsorg",  # Assuming you always request this scope
+    }
+
+    import requests
+
+    with trace_span(
+        ctx,
+        "POST oauth2/token",
+        SPAN_KIND_CLIENT,
+        **{"http.request.method": "POST", "url.full": url},
+    ) as span:
+        response = requests.post(url, headers=headers, data=data)
+        span["http.response.status_code"] = response.status_code
+
+    if response.status_code == 200:
+        response_json = response.json()
+        access_token = response_json["access_token"]
+
+        # Calculate token expiry time (subtracting 5 minutes for a buffer)
+        token_lifetime = dt.timedelta(seconds=response_json["expires_in"] - 300)
+        access_token_expiry = dt.datetime.utcnow() + token_lifetime
+
+        return access_token, access_token_expiry
     else:
+        typer.echo("Failed to obtain access token!")
+        # The stored client secret may have been revoked, sign a new one next time
+        forget_client_secret(config)
+        response.raise_for_status()
+
+
+def get_client_secret(ctx: typer.Context) -> str:
+    """
+    Get a signed client secret.
+    The secret is valid for 180 days, so it is stored next to the config and
+    only re-signed when it is close to expiring or the credentials change.
+    """
+
+    config = ctx.obj["config"]
+    private_key_file = config["private_key_file"]
+
+    # Load private key file.
+    if not os.path.isfile(private_key_file):
         typer.echo(
             "Error: invalid private key file. Please configure the CLI with `configure --private-key-file`"
         )
@@ -40,8 +146,69 @@ def get_access_token(ctx: typer.Context):
             del ctx.obj["private_key_file"]
         raise typer.Exit(code=1)
 
+    cache_key = client_secret_cache_key(config)
+    key_fingerprint = f"{os.path.abspath(private_key_file)}:{os.stat(private_key_file).st_mtime_ns}"
+
+    with locked_json_store(CLIENT_SECRET_PATH) as secrets:
+        cached = secrets.get(cache_key)
+        if (
+            cached
+            and cached["key_fingerprint"] == key_fingerprint
+            and time.time() < cached["expires_at"] - CLIENT_SECRET_RENEWAL_SECONDS
+        ):
+            return cached["client_secret"]
+
+        client_secret, expiration_timestamp = sign_client_secret(config)
+        secrets[cache_key] = {
+            "client_secret": client_secret,
+            "expires_at": expiration_timestamp,
+            "key_fingerprint": key_fingerprint,
+        }
+
+    return client_secret
+
+
+def client_secret_cache_key(config: dict) -> str:
+    return f"{config.get('client_id')}:{config.get('team_id')}:{config.get('key_id')}"
+
+
+def forget_client_secret(config: dict):
+    with locked_json_store(CLIENT_SECRET_PATH) as secrets:
+        secrets.pop(client_secret_cache_key(config), None)
+
+
+@functools.lru_cache(maxsize=None)
+def load_private_key(private_key_file: str, mtime_ns: int) -> "ECKey":
+    """
+    Parse the private key once per process.
+    `mtime_ns` is part of the cache key so a replaced key file is re-read.
+    """
+
+    from authlib.jose import ECKey
+    from Crypto.PublicKey import ECC
+
+    with open(private_key_file, "rt") as file:
+        private_key = ECC.import_key(file.read())
+
+    return ECKey.import_key(private_key.export_key(format="PEM"))
+
+
+def sign_client_secret(config: dict):
+    """
+    Sign a new ES256 client secret.
+    Returns the secret and its expiration timestamp.
+    """
+
+    private_key_file = config["private_key_file"]
+    client_id = config["client_id"]
+    team_id = config["team_id"]
+    key_id = config["key_id"]
+
+    audience = "https://appleid.apple.com"
+    alg = "ES256"
+
     # Define the issue timestamp.
-    issued_at_timestamp = int(dt.datetime.utcnow().timestamp())
+    issued_at_timestamp = int(time.time())
     # Define the expiration timestamp, which may not exceed 180 days from the issue timestamp.
     expiration_timestamp = issued_at_timestamp + 86400 * 180
 
@@ -58,41 +225,14 @@ def get_access_token(ctx: typer.Context):
     payload["exp"] = expiration_timestamp
     payload["iss"] = team_id
 
-    # Open the private key.
-    with open(private_key_file, "rt") as file:
-        private_key = ECC.import_key(file.read())
+    private_key = load_private_key(
+        private_key_file, os.stat(private_key_file).st_mtime_ns
+    )
+
+    from authlib.jose import jwt
 
     client_secret = jwt.encode(
-        header=headers, payload=payload, key=private_key.export_key(format="PEM")
+        header=headers, payload=payload, key=private_key
     ).decode("UTF-8")
 
-    # Now use client_secret to request access_token
-    url = "https://appleid.apple.com/auth/oauth2/token"
-    headers = {
-        "Host": "appleid.apple.com",
-        "Content-Type": "application/x-www-form-urlencoded",
-    }
-    data = {
-        "grant_type": "client_credentials",
-        "client_id": config["client_id"],
-        "client_secret": client_secret,
-        "scope": "searchadsorg",  # Assuming you always request this scope
-    }
-
-    response = requests.post(url, headers=headers, data=data)
-
-    if response.status_code == 200:
-        response_json = response.json()
-        access_token = response_json["access_token"]
-
-        # Calculate token expiry time (subtracting 5 minutes for a buffer)
-        token_lifetime = dt.timedelta(seconds=response_json["expires_in"] - 300)
-        access_token_expiry = dt.datetime.utcnow() + token_lifetime
-
-        ctx.obj["access_token"] = access_token
-        ctx.obj["access_token_expiry"] = access_token_expiry
-
-        return access_token
-    else:
-        typer.echo("Failed to obtain access token!")
-        response.raise_for_status()
+    return client_secret, expiration_timestamp
@@ -1,7 +1,13 @@
+import time
+import threading
 import typer
-import requests
 import datetime
-from searchadscli.utils.access_token import get_access_token
+from searchadscli.utils.api_client import get_client
+from searchadscli.utils.config import ADGROUP_CACHE_PATH
+from searchadscli.utils.pagination import paginate
+from searchadscli.utils.store import locked_json_store
+
+_adgroups_lock = threading.Lock()
 
 
 def create_adgroup(
@@ -15,11 +21,7 @@ def create_adgroup(
     age_max: int | None = None,
     gender: str = "ALL",
 ):
-    access_token = get_access_token(ctx)
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "X-AP-Context": f"orgId={orgId}",
-    }
+    client = get_client(ctx, orgId)
 
     current_time = datetime.datetime.utcnow() + datetime.timedelta(seconds=5)
     formatted_time = current_time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
@@ -52,25 +54,77 @@ def create_adgroup(
     if targeting_dimensions:
         data["targetingDimensions"] = targeting_dimensions
 
-    return requests.post(
-        f"https://api.searchads.apple.com/api/v4/campaigns/{campaign_id}/adgroups",
-        headers=headers,
-        json=data,
-    )
+    response = client.post(f"campaigns/{campaign_id}/adgroups", json=data)
+
+    # The campaign's ad group list changed, don't serve it from the cache
+    invalidate_adgroups(ctx, orgId, campaign_id)
+
+    return response
 
 
 def get_adgroups(
     ctx: typer.Context,
     orgId: str,
     campaign_id: str,
+    prefetch: bool = False,
 ):
-    access_token = get_access_token(ctx)
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "X-AP-Context": f"orgId={orgId}",
-    }
+    client = get_client(ctx, orgId)
+
+    def fetch_page(offset: int, limit: int):
+        return client.get(
+            f"campaigns/{campaign_id}/adgroups",
+            params={"offset": offset, "limit": limit},
+        )
+
+    return paginate(fetch_page, prefetch=prefetch)
+
+
+def get_cached_adgroups(
+    ctx: typer.Context,
+    orgId: str,
+    campaign_id: str,
+) -> list[dict]:
+    """
+    Get a campaign's ad groups, fetching them at most once per run.
+    When `adgroup_cache_ttl` is configured, lists are also kept on disk for
+    that many seconds so later runs can skip the lookup.
+    Raises SearchAdsAPIError if the ad groups can't be fetched.
+    """
+
+    cache_key = f"{orgId}:{campaign_id}"
+    ttl = ctx.obj["config"].get("adgroup_cache_ttl") or 0
+
+    with _adgroups_lock:
+        cache = ctx.obj.setdefault("adgroups", {})
+        if cache_key in cache:
+            return cache[cache_key]
+
+    if ttl:
+        with locked_json_store(ADGROUP_CACHE_PATH) as stored:
+            entry = stored.get(cache_key)
+            if entry and time.time() < entry["fetched_at"] + ttl:
+                with _adgroups_lock:
+                    cache[cache_key] = entry["adgroups"]
+                return entry["adgroups"]
+
+    adgroups = list(get_adgroups(ctx, orgId, campaign_id))
+
+    with _adgroups_lock:
+        cache[cache_key] = adgroups
+
+    if ttl:
+        with locked_json_store(ADGROUP_CACHE_PATH) as stored:
+            stored[cache_key] = {"fetched_at": time.time(), "adgroups": adgroups}
+
+    return adgroups
+
+
+def invalidate_adgroups(ctx: typer.Context, orgId: str, campaign_id: str):
+    cache_key = f"{orgId}:{campaign_id}"
+
+    with _adgroups_lock:
+        ctx.obj.setdefault("adgroups", {}).pop(cache_key, None)
 
-    return requests.get(
-        f"https://api.searchads.apple.com/api/v4/campaigns/{campaign_id}/adgroups",
-        headers=headers,
-    )
+    if ctx.obj["config"].get("adgroup_cache_ttl"):
+        with locked_json_store(ADGROUP_CACHE_PATH) as stored:
+            stored.pop(cache_key, None)
@@ -0,0 +1,239 @@
+import threading
+import time
+import typer
+import requests
+from requests.adapters import HTTPAdapter
+from searchadscli.utils.access_token import get_access_token
+from searchadscli.utils.rate_limit import get_rate_limiter
+from searchadscli.utils.tracing import (
+    SPAN_KIND_CLIENT,
+    endpoint_of,
+    trace_span,
+)
+from searchadscli.utils.retry import (
+    RETRY_STATUS_CODES,
+    DEFAULT_MAX_RETRIES,
+    retry_after_seconds,
+    backoff_delay,
+    is_idempotent,
+    never_reached_server,
+)
+
+API_BASE_URL = "https://api.searchads.apple.com/api/v4"
+DEFAULT_POOL_SIZE = 10
+
+_clients_lock = threading.Lock()
+
+
+class SearchAdsAPIError(Exception):
+    """
+    Raised when the Search Ads API answers with a non-200 status.
+    """
+
+    def __init__(self, response: requests.Response):
+        self.response = response
+        self.status_code = response.status_code
+        super().__init__(f"Search Ads API error. Status Code: {self.status_code}")
+
+    @property
+    def messages(self) -> list[str]:
+        try:
+            errors = self.response.json().get("error", {}).get("errors", [])
+        except ValueError:
+            return [self.response.text]
+        return [error.get("message", "Unknown error") for error in errors] or [
+            self.response.text
+        ]
+
+
+class SearchAdsClient:
+    """
+    Pooled client for the Search Ads API.
+    Keeps one keep-alive session per org so every API helper reuses the same
+    connections, base URL and `X-AP-Context` header.
+
+    Every request waits for the org's rate limiter. Throttled (429) and
+    transient 5xx responses and connection errors are retried with
+    jittered exponential backoff, honoring `Retry-After`. Requests that
+    create something are only retried when the server can't have applied
+    them: the connection failed, or a 429 came with `Retry-After`.
+    """
+
+    def __init__(
+        self,
+        ctx: typer.Context,
+        orgId: str,
+        base_url: str = API_BASE_URL,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ):
+        self.ctx = ctx
+        self.orgId = orgId
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.rate_limiter = get_rate_limiter(ctx, orgId)
+
+        self.stats = {"requests": 0, "throttled": 0, "retried": 0, "failed": 0}
+        self.stats_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["X-AP-Context"] = f"orgId={orgId}"
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def count(self, name: str):
+        with self.stats_lock:
+            self.stats[name] += 1
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        with trace_span(
+            self.ctx,
+            endpoint_of(method, path),
+            SPAN_KIND_CLIENT,
+            **{
+                "http.request.method": method,
+                "url.path": path,
+                "searchads.org_id": self.orgId,
+            },
+        ) as span:
+            response = self.send(method, path, span, **kwargs)
+            span["http.response.status_code"] = response.status_code
+            span["http.request.body.size"] = len(response.request.body or b"")
+            span["http.response.body.size"] = len(response.content)
+            return response
+
+    def send(self, method: str, path: str, span: dict, **kwargs) -> requests.Response:
+        extra_headers = kwargs.pop("headers", None) or {}
+        idempotent = is_idempotent(method, path)
+        span["searchads.retries"] = 0
+        span["searchads.throttled"] = 0
+        span["searchads.rate_limit_wait_ms"] = 0.0
+
+        for attempt in range(self.max_retries + 1):
+            waiting_since = time.perf_counter()
+            self.rate_limiter.acquire()
+            span["searchads.rate_limit_wait_ms"] += (
+                time.perf_counter() - waiting_since
+            ) * 1000
+            self.count("requests")
+
+            access_token = get_access_token(self.ctx)
+            headers = {"Authorization": f"Bearer {access_token}"}
+            headers.update(extra_headers)
+
+            try:
+                response = self.session.request(
+                    method, self.url(path), headers=headers, **kwargs
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries or not (
+                    idempotent or never_reached_server(e)
+                ):
+                    self.count("failed")
+                    raise
+                delay = backoff_delay(attempt)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return response
+
+                retry_after = retry_after_seconds(response)
+
+                if response.status_code == 429:
+                    self.count("throttled")
+                    span["searchads.throttled"] += 1
+
+                # A create that timed out or failed may still have been
+                # applied. Only a 429 with Retry-After says it wasn't.
+                rejected = response.status_code == 429 and retry_after is not None
+                if attempt == self.max_retries or not (idempotent or rejected):
+                    self.count("failed")
+                    return response
+
+                delay = backoff_delay(attempt, retry_after)
+
+                # Hold back every thread for this org, not just this one
+                if response.status_code == 429:
+                    self.rate_limiter.pause(
+                        delay if retry_after is None else retry_after
+                    )
+
+            self.count("retried")
+            span["searchads.retries"] += 1
+            time.sleep(delay)
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> requests.Response:
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+def get_client(ctx: typer.Context, orgId: str) -> SearchAdsClient:
+    """
+    Return the shared client for an org, creating it on first use.
+    """
+
+    with _clients_lock:
+        clients = ctx.obj.setdefault("clients", {})
+        client = clients.get(orgId)
+
+        if client is None:
+            config = ctx.obj["config"]
+            pool_size = config.get("pool_size") or DEFAULT_POOL_SIZE
+            max_retries = config.get("max_retries")
+            if max_retries is None:
+                max_retries = DEFAULT_MAX_RETRIES
+            client = SearchAdsClient(
+                ctx,
+                orgId,
+                base_url=config.get("api_base_url") or API_BASE_URL,
+                pool_size=int(pool_size),
+                max_retries=int(max_retries),
+            )
+            clients[orgId] = client
+
+        return client
+
+
+def get_request_stats(ctx: typer.Context) -> dict:
+    """
+    Request counters summed over every client used so far.
+    """
+
+    totals = {"requests": 0, "throttled": 0, "retried": 0, "failed": 0}
+    for client in ctx.obj.get("clients", {}).values():
+        for name, value in client.stats.items():
+            totals[name] += value
+    return totals
+
+
+def report_request_stats(ctx: typer.Context):
+    """
+    Print the request counters to stderr when anything was throttled or
+    retried.
+    """
+
+    stats = get_request_stats(ctx)
+    if stats["throttled"] or stats["retried"] or stats["failed"]:
+        typer.echo(
+            f"API requests: {stats['requests']}, throttled: {stats['throttled']}, "
+            f"retried: {stats['retried']}, failed after retries: {stats['failed']}",
+            err=True,
+        )
@@ -0,0 +1,229 @@
+import csv
+import json
+import os
+import typer
+from typing import Iterable, Iterator
+
+# Taps at the org-wide conversion rate blended into every keyword's own, so
+# keywords with a handful of taps don't get extreme bids
+PRIOR_TAPS = 20
+
+DEFAULT_MAX_CHANGE = 0.25
+DEFAULT_MIN_TAPS = 10
+
+# Same range ask_for_default_bid accepts
+MIN_BID = 0.01
+MAX_BID = 100
+
+REASONS = {
+    "no_bid": "no bid",
+    "no_data": "not enough data",
+    "raise": "CPA below target",
+    "lower": "CPA above target",
+    "keep": "on target",
+}
+
+
+def require_numpy():
+    """
+    NumPy is an optional dependency, only needed for bid recommendations.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        typer.echo(
+            "Error: Bid recommendations need NumPy. "
+            "Install it with: pip install 'searchadscli[bids]'"
+        )
+        raise typer.Exit(code=1)
+    return numpy
+
+
+def load_keyword_stats(records: Iterable[dict]) -> dict:
+    """
+    Sum the taps, installs and spend of daily keyword report records per
+    keyword into NumPy arrays, one entry per keyword. The bid is the one
+    on the latest record of each keyword. Deleted keywords are left out.
+    """
+
+    np = require_numpy()
+
+    # Per keyword
+    index = {}
+    keyword_ids = []
+    campaign_ids = []
+    adgroup_ids = []
+    texts = []
+    match_types = []
+    bids = []
+
+    # Per record: the index of its keyword and its metrics
+    rows = []
+    taps = []
+    installs = []
+    spend = []
+
+    for record in records:
+        if record.get("deleted") or record.get("keywordId") is None:
+            continue
+
+        keyword_id = record["keywordId"]
+        idx = index.get(keyword_id)
+        if idx is None:
+            idx = index[keyword_id] = len(keyword_ids)
+            keyword_ids.append(keyword_id)
+            campaign_ids.append(record.get("campaignId") or 0)
+            adgroup_ids.append(record.get("adGroupId") or 0)
+            texts.append(record.get("keyword", ""))
+            match_types.append(record.get("matchType", ""))
+            bids.append(0.0)
+
+        if record.get("bidAmount"):
+            bids[idx] = float(record["bidAmount"])
+
+        rows.append(idx)
+        taps.append(record.get("taps") or 0)
+        installs.append(record.get("installs") or 0)
+        spend.append(float(record.get("localSpend") or 0))
+
+    rows = np.array(rows, dtype=np.int64)
+    count = len(keyword_ids)
+
+    return {
+        "keywordId": np.array(keyword_ids, dtype=np.int64),
+        "campaignId": np.array(campaign_ids, dtype=np.int64),
+        "adGroupId": np.array(adgroup_ids, dtype=np.int64),
+        "keyword": np.array(texts, dtype=object),
+        "matchType": np.array(match_types, dtype=object),
+        "bid": np.array(bids, dtype=np.float64),
+        "taps": np.bincount(rows, weights=taps, minlength=count),
+        "installs": np.bincount(rows, weights=installs, minlength=count),
+        "spend": np.bincount(rows, weights=spend, minlength=count),
+    }
+
+
+def recommend_bids(
+    stats: dict,
+    target_cpa: float,
+    max_change: float = DEFAULT_MAX_CHANGE,
+    min_taps: int = DEFAULT_MIN_TAPS,
+) -> dict:
+    """
+    Suggest a bid for every keyword at once from its CPA.
+
+    A keyword's expected CPA is what its taps actually cost divided by its
+    conversion rate, with the org-wide rate blended in for keywords with
+    few taps. Its bid is scaled by the target CPA over the expected CPA,
+    by at most `max_change` of the current bid per run, since taps usually
+    cost less than the bid. Keywords with fewer than `min_taps` taps keep
+    their bid, unless they already spent the target CPA.
+
+    Returns `stats` with `cpa`, `recommendedBid` and `reason` added.
+    """
+
+    np = require_numpy()
+
+    taps = stats["taps"]
+    installs = stats["installs"]
+    spend = stats["spend"]
+    bid = stats["bid"]
+
+    total_taps = taps.sum()
+    org_rate = installs.sum() / total_taps if total_taps else 0.0
+    rate = (installs + PRIOR_TAPS * org_rate) / (taps + PRIOR_TAPS)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected_cpa = (spend / taps) / rate
+        scale = np.where(taps > 0, target_cpa / expected_cpa, 1.0)
+    scale = np.nan_to_num(scale, nan=1.0, posinf=1 + max_change)
+
+    recommended = bid * np.clip(scale, 1 - max_change, 1 + max_change)
+    recommended = np.clip(np.round(recommended, 2), MIN_BID, MAX_BID)
+
+    has_bid = bid > 0
+    enough_data = (taps >= min_taps) | (spend >= target_cpa)
+    changes = has_bid & enough_data
+    recommended = np.where(changes, recommended, bid)
+
+    reason = np.select(
+        [
+            ~has_bid,
+            ~enough_data,
+            recommended > bid,
+            recommended < bid,
+        ],
+        [REASONS["no_bid"], REASONS["no_data"], REASONS["raise"], REASONS["lower"]],
+        REASONS["keep"],
+    )
+
+    cpa = np.full_like(spend, np.nan)
+    np.divide(spend, installs, out=cpa, where=installs > 0)
+
+    return {**stats, "cpa": cpa, "recommendedBid": recommended, "reason": reason}
+
+
+def recommendation_records(recommendations: dict) -> Iterator[dict]:
+    """
+    One plain record per keyword, for writing with `write_records`.
+    """
+
+    columns = {
+        "campaignId": recommendations["campaignId"].tolist(),
+        "adGroupId": recommendations["adGroupId"].tolist(),
+        "keywordId": recommendations["keywordId"].tolist(),
+        "keyword": recommendations["keyword"].tolist(),
+        "matchType": recommendations["matchType"].tolist(),
+        "taps": recommendations["taps"].astype(int).tolist(),
+        "installs": recommendations["installs"].astype(int).tolist(),
+        "spend": recommendations["spend"].round(2).tolist(),
+        "cpa": [
+            None if cpa != cpa else cpa
+            for cpa in recommendations["cpa"].round(2).tolist()
+        ],
+        "currentBid": recommendations["bid"].tolist(),
+        "recommendedBid": recommendations["recommendedBid"].tolist(),
+        "reason": recommendations["reason"].tolist(),
+    }
+
+    for values in zip(*columns.values()):
+        yield dict(zip(columns, values))
+
+
+def read_bid_updates(path: str) -> list[dict]:
+    """
+    Read a file written by `recommend-bids`, as CSV or NDJSON by its
+    extension. Returns `{campaignId, adGroupId, id, bid}` for every keyword
+    whose recommended bid differs from its current one.
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+
+    with open(path, "r", encoding="utf-8-sig", newline="") as stream:
+        if extension in (".ndjson", ".jsonl"):
+            rows = [json.loads(line) for line in stream if line.strip()]
+        elif extension == ".json":
+            rows = json.load(stream)
+        else:
+            rows = list(csv.DictReader(stream))
+
+    updates = []
+    for row_number, row in enumerate(rows, 1):
+        try:
+            bid = round(float(row["recommendedBid"]), 2)
+            current = row.get("currentBid")
+            if current not in (None, "") and bid == round(float(current), 2):
+                continue
+
+            updates.append(
+                {
+                    "campaignId": int(row["campaignId"]),
+                    "adGroupId": int(row["adGroupId"]),
+                    "id": int(row["keywordId"]),
+                    "bid": bid,
+                }
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            typer.echo(f"Skipping row {row_number}: {e!r}", err=True)
+
+    return updates
@@ -0,0 +1,101 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from typing import Callable, Hashable, Iterable, Iterator
+import requests
+from rich.progress import (
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    BarColumn,
+    MofNCompleteColumn,
+    TimeElapsedColumn,
+)
+from searchadscli.utils.api_client import SearchAdsAPIError
+from searchadscli.utils.concurrency import DEFAULT_CONCURRENCY
+
+# Largest number of keywords sent in a single bulk request
+BULK_CHUNK_SIZE = 1000
+
+
+def chunked(items: Iterable, size: int = BULK_CHUNK_SIZE) -> Iterator[list]:
+    """
+    Split any iterable into lists of at most `size` items without
+    materializing it.
+    """
+
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def run_bulk(
+    send: Callable[[Hashable, list], requests.Response],
+    batches: Iterable[tuple[Hashable, list]],
+    description: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    total: int | None = None,
+    show_progress: bool = True,
+) -> dict[Hashable, list[str]]:
+    """
+    Send `(target, chunk)` batches through `send(target, chunk)` with at most
+    `concurrency` requests in flight. Pacing and retries are left to the
+    API client.
+
+    Batches are pulled lazily so arbitrarily large inputs stay bounded in
+    memory. Progress and keyword throughput are shown while it runs.
+    Returns the error messages collected for each target.
+    """
+
+    errors = {}
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("{task.fields[throughput]}"),
+        TimeElapsedColumn(),
+        transient=True,
+        disable=not show_progress,
+    ) as progress:
+        task = progress.add_task(description, total=total, throughput="")
+        started_at = time.monotonic()
+        completed = 0
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            in_flight = {}
+            batches = iter(batches)
+
+            while True:
+                for target, chunk in islice(batches, concurrency * 2 - len(in_flight)):
+                    future = executor.submit(send, target, chunk)
+                    in_flight[future] = (target, len(chunk))
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    target, size = in_flight.pop(future)
+                    errors.setdefault(target, [])
+
+                    try:
+                        response = future.result()
+                        if response.status_code != 200:
+                            errors[target].extend(SearchAdsAPIError(response).messages)
+                    except Exception as e:
+                        errors[target].append(str(e))
+
+                    completed += size
+                    elapsed = time.monotonic() - started_at
+                    progress.update(
+                        task,
+                        advance=size,
+                        throughput=(
+                            f"{completed / elapsed:,.0f} kw/s" if elapsed else ""
+                        ),
+                    )
+
+    return errors
@@ -0,0 +1,142 @@
+import threading
+import typer
+from searchadscli.utils.campaigns_api import find_active_campaigns
+from searchadscli.utils.config import CAMPAIGN_PREFIX, CampaignType
+from searchadscli.utils.keyword_audit import campaign_set_key
+
+_indexes_lock = threading.Lock()
+
+
+def campaign_key(name: str) -> tuple[CampaignType, tuple[str, ...], str] | None:
+    """
+    `(type, countries, app id)` of a SearchAdsCLI campaign name such as
+    `SearchAdsCLI_exact_US-GB-1234`, or None for other campaigns.
+    """
+
+    key = campaign_set_key(name)
+    if not key:
+        return None
+
+    type, suffix = key
+    countries, _, app_id = suffix.rpartition("-")
+    if not countries or not app_id:
+        return None
+
+    return type, tuple(countries.split("-")), app_id
+
+
+class CampaignIndex:
+    """
+    The running SearchAdsCLI campaigns of an org, keyed by
+    `(type, countries, app id)`, so campaign pickers and sibling lookups
+    don't need API calls of their own.
+
+    When several campaigns share a key, e.g. an old copy and a re-created
+    one, the enabled and most recently modified one is used. The others are
+    kept in `collisions` so they can be reported.
+    """
+
+    def __init__(self, campaigns: list[dict]):
+        by_key = {}
+        for campaign in campaigns:
+            key = campaign_key(campaign["name"])
+            if key:
+                by_key.setdefault(key, []).append(campaign)
+
+        self.campaigns = {}
+        self.collisions = {}
+        for key, matches in by_key.items():
+            matches.sort(key=campaign_preference, reverse=True)
+            self.campaigns[key] = matches[0]
+            if len(matches) > 1:
+                self.collisions[key] = matches
+
+    def __len__(self) -> int:
+        return len(self.campaigns)
+
+    def get(
+        self, type: CampaignType, countries: tuple[str, ...], app_id
+    ) -> dict | None:
+        return self.campaigns.get((type, tuple(countries), str(app_id)))
+
+    def of_type(self, type: CampaignType) -> list[dict]:
+        return [
+            campaign
+            for (campaign_type, _, _), campaign in self.campaigns.items()
+            if campaign_type == type
+        ]
+
+    def campaign_set(self, campaign: dict) -> dict[CampaignType, dict]:
+        """
+        The campaigns of every type that share `campaign`'s countries and
+        app, including `campaign` itself.
+        """
+
+        key = campaign_key(campaign["name"])
+        if not key:
+            return {}
+
+        _, countries, app_id = key
+        campaign_set = {}
+        for type in CampaignType:
+            sibling = self.get(type, countries, app_id)
+            if sibling:
+                campaign_set[type] = sibling
+        return campaign_set
+
+    def campaign_sets(self) -> dict[str, dict]:
+        """
+        Every campaign set keyed by its `<countries>-<app id>` name suffix,
+        each mapping campaign type to campaign.
+        """
+
+        campaign_sets = {}
+        for (type, countries, app_id), campaign in self.campaigns.items():
+            suffix = f"{'-'.join(countries)}-{app_id}"
+            campaign_sets.setdefault(suffix, {})[type] = campaign
+        return campaign_sets
+
+
+def campaign_preference(campaign: dict) -> tuple:
+    return (
+        campaign.get("status") == "ENABLED",
+        campaign.get("modificationTime") or "",
+        campaign.get("id") or 0,
+    )
+
+
+def get_campaign_index(ctx: typer.Context, orgId: str) -> CampaignIndex:
+    """
+    Return the campaign index of an org, loading it with a single `find`
+    for every running SearchAdsCLI campaign on first use. Campaigns that
+    share a name are reported once, when the index is loaded.
+    """
+
+    with _indexes_lock:
+        indexes = ctx.obj.setdefault("campaign_indexes", {})
+        index = indexes.get(orgId)
+
+        if index is None:
+            campaigns = find_active_campaigns(
+                ctx, orgId, name_prefix=f"{CAMPAIGN_PREFIX}_", prefetch=True
+            )
+            index = indexes[orgId] = CampaignIndex(list(campaigns))
+            warn_collisions(index)
+
+        return index
+
+
+def warn_collisions(index: CampaignIndex):
+    for matches in index.collisions.values():
+        used, *ignored = matches
+        typer.echo(
+            f"Warning: {len(matches)} running campaigns are named like "
+            f"{used['name']}. Using campaign {used['id']}, ignoring "
+            f"{', '.join(str(campaign['id']) for campaign in ignored)}.",
+            err=True,
+        )
+
+
+def invalidate_campaign_index(ctx: typer.Context, orgId: str):
+    with _indexes_lock:
+        ctx.obj.setdefault("campaign_indexes", {}).pop(orgId, None)
@@ -1,6 +1,6 @@
 import typer
-import requests
-from searchadscli.utils.access_token import get_access_token
+from searchadscli.utils.api_client import get_client
+from searchadscli.utils.pagination import paginate, find_selector
 from searchadscli.utils.config import CAMPAIGN_PREFIX, CampaignType
 
 
@@ -10,36 +10,33 @@ def find_active_campaigns(
     countries: list | None = None,
     type: CampaignType | None = None,
     names: list[str] | None = None,
+    prefetch: bool = False,
+    name_prefix: str | None = None,
 ):
-    access_token = get_access_token(ctx)
+    client = get_client(ctx, orgId)
 
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "X-AP-Context": f"orgId={orgId}",
-    }
+    if type:
+        name_prefix = f"{CAMPAIGN_PREFIX}_{type.value}"
 
-    data = {
-        "pagination": {"offset": 0, "limit": 1000},
-        "conditions": [
-            {"field": "servingStatus", "operator": "EQUALS", "values": ["RUNNING"]},
-        ],
-    }
+    conditions = [
+        {"field": "servingStatus", "operator": "EQUALS", "values": ["RUNNING"]},
+    ]
 
     if names:
         condition = {"field": "name", "operator": "IN", "values": names}
-        data["conditions"].append(condition)
+        conditions.append(condition)
     else:
-        if type:
-            data["conditions"].append(
+        if name_prefix:
+            conditions.append(
                 {
                     "field": "name",
                     "operator": "STARTSWITH",
-                    "values": [f"{CAMPAIGN_PREFIX}_{type.value}"],
+                    "values": [name_prefix],
                 }
             )
 
         if countries:
-            data["conditions"].append(
+            conditions.append(
                 {
                     "field": "countriesOrRegions",
                     "operator": "CONTAINS_ALL",
@@ -47,37 +44,28 @@ def find_active_campaigns(
                 }
             )
 
-    return requests.post(
-        "https://api.searchads.apple.com/api/v4/campaigns/find",
-        headers=headers,
-        json=data,
-    )
+    def fetch_page(offset: int, limit: int):
+        return client.post(
+            "campaigns/find", json=find_selector(conditions, offset, limit)
+        )
+
+    return paginate(fetch_page, prefetch=prefetch)
 
 
 def pause_campaign(ctx: typer.Context, orgId: str, campaign_id: str):
-    access_token = get_access_token(ctx)
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "X-AP-Context": f"orgId={orgId}",
-    }
+    client = get_client(ctx, orgId)
     data = {"campaign": {"status": "PAUSED"}}
 
-    return requests.put(
-        f"https://api.searchads.apple.com/api/v4/campaigns/{campaign_id}",
-        headers=headers,
-        json=data,
-    )
+    return client.put(f"campaigns/{campaign_id}", json=data)
 
 
-def get_campaigns(ctx: typer.Context, orgId: str):
-    access_token = get_access_token(ctx)
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "X-AP-Context": f"orgId={orgId}",
-    }
-    return requests.get(
-        "https://api.searchads.apple.com/api/v4/campaigns", headers=headers
-    )
+def get_campaigns(ctx: typer.Context, orgId: str, prefetch: bool = False):
+    client = get_client(ctx, orgId)
+
+    def fetch_page(offset: int, limit: int):
+        return client.get("campaigns", params={"offset": offset, "limit": limit})
+
+    return paginate(fetch_page, prefetch=prefetch)
 
 
 def create_campaign(
@@ -88,11 +76,7 @@ def create_campaign(
     countries: list[str],
     type: str,
 ):
-    access_token = get_access_token(ctx)
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "X-AP-Context": f"orgId={orgId}",
-    }
+    client = get_client(ctx, orgId)
 
     countries_string = "-".join(countries)
     name = f"{CAMPAIGN_PREFIX}_{type.value}_{countries_string}-{app_id}"
@@ -108,8 +92,4 @@ def create_campaign(
         "status": "ENABLED",
         "supplySources": ["APPSTORE_SEARCH_RESULTS"],
     }
-    return requests.post(
-        "https://api.searchads.apple.com/api/v4/campaigns",
-        headers=headers,
-        json=data,
-    )
+    return client.post("campaigns", json=data)
@@ -0,0 +1,91 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, TypeVar
+import typer
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_CONCURRENCY = 8
+
+
+def map_concurrently(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Iterator[tuple[T, R | None, Exception | None]]:
+    """
+    Call `fn` for every item with at most `concurrency` calls in flight.
+    Yields `(item, result, error)` as each call finishes, so one failure
+    never stops the others.
+    """
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(fn, item): item for item in items}
+
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                yield item, future.result(), None
+            except Exception as e:
+                yield item, None, e
+
+
+def iterate_concurrently(
+    fn: Callable[[T], Iterable[R]],
+    items: Iterable[T],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    buffer_size: int = 1000,
+) -> Iterator[tuple[T, R | None, Exception | None]]:
+    """
+    Consume the iterables returned by `fn` for every item with at most
+    `concurrency` running at once, and yield `(item, value, None)` for
+    each value as soon as it is produced. A failing item yields
+    `(item, None, error)` once and the others carry on. At most
+    `buffer_size` values wait to be consumed, so memory stays bounded.
+    """
+
+    items = list(items)
+    values = queue.Queue(maxsize=buffer_size)
+    stopped = threading.Event()
+    finished = object()
+
+    def put(entry):
+        while not stopped.is_set():
+            try:
+                values.put(entry, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def run(item):
+        try:
+            for value in fn(item):
+                if stopped.is_set():
+                    return
+                put((item, value, None))
+        except Exception as e:
+            put((item, None, e))
+        finally:
+            put((item, finished, None))
+
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    try:
+        for item in items:
+            executor.submit(run, item)
+
+        remaining = len(items)
+        while remaining:
+            item, value, error = values.get()
+            if value is finished:
+                remaining -= 1
+            else:
+                yield item, value, error
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_concurrency(ctx: typer.Context) -> int:
+    return ctx.obj.get("concurrency") or DEFAULT_CONCURRENCY
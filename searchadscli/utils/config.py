@@ -4,6 +4,11 @@ import json
 from enum import Enum
 
 CONFIG_PATH = os.path.expanduser("~/.searchads_cli_config.json")
+TOKEN_CACHE_PATH = os.path.expanduser("~/.searchads_cli_tokens.json")
+CLIENT_SECRET_PATH = os.path.expanduser("~/.searchads_cli_client_secret.json")
+ADGROUP_CACHE_PATH = os.path.expanduser("~/.searchads_cli_adgroups.json")
+MIRROR_PATH = os.path.expanduser("~/.searchads_cli_mirror.sqlite3")
+REPORT_CACHE_PATH = os.path.expanduser("~/.searchads_cli_reports.sqlite3")
 
 REQUIRED_CONFIG_VALUES = [
     "private_key_file",
@@ -26,6 +31,20 @@ class MatchType(str, Enum):
     broad = "BROAD"
 
 
+class ReportLevel(str, Enum):
+    campaigns = "campaigns"
+    adgroups = "adgroups"
+    keywords = "keywords"
+    searchterms = "searchterms"
+
+
+class Granularity(str, Enum):
+    hourly = "HOURLY"
+    daily = "DAILY"
+    weekly = "WEEKLY"
+    monthly = "MONTHLY"
+
+
 CAMPAIGN_PREFIX = "SearchAdsCLI"
 CAMPAIGN_STRUCTURE = {
     "exact": {
@@ -55,16 +74,21 @@ def get_org_id(ctx: typer.Context):
 def check_config_values(ctx: typer.Context):
     """Check if all required configuration values are set."""
 
-    config = ctx.obj["config"]
-
-    missing_values = [
-        key for key in REQUIRED_CONFIG_VALUES if key not in config or not config[key]
-    ]
-
-    if missing_values:
-        missing_values_str = ", ".join(missing_values)
-        message = f"Missing config value(s) for: {missing_values_str}\n\nRun searchads config to set up"
-        raise typer.Exit(message)
+    targets = ctx.obj.get("targets") or [(None, ctx.obj["config"])]
+
+    for label, config in targets:
+        missing_values = [
+            key
+            for key in REQUIRED_CONFIG_VALUES
+            if key not in config or not config[key]
+        ]
+
+        if missing_values:
+            missing_values_str = ", ".join(missing_values)
+            if label:
+                missing_values_str += f" in {label}"
+            message = f"Missing config value(s) for: {missing_values_str}\n\nRun searchads config to set up"
+            raise typer.Exit(message)
 
     return True
 
@@ -0,0 +1,155 @@
+from searchadscli.utils.bulk import chunked
+from searchadscli.utils.config import (
+    CAMPAIGN_PREFIX,
+    CAMPAIGN_STRUCTURE,
+    CampaignType,
+    MatchType,
+)
+
+# Discovery ad groups that hold the broad match copies of exact keywords
+BROAD_ADGROUP_NAMES = {
+    adgroup["name"]
+    for adgroup in CAMPAIGN_STRUCTURE[CampaignType.discovery]["adgroups"]
+    if adgroup.get("matchType") == MatchType.broad
+}
+
+FINDINGS = ("conflicts", "missing_negatives", "missing_discovery", "duplicates")
+
+
+def campaign_set_key(name: str) -> tuple[CampaignType, str] | None:
+    """
+    Split a SearchAdsCLI campaign name into its type and the
+    "<countries>-<app id>" suffix shared by the campaigns of one set.
+    """
+
+    parts = name.split("_", 2)
+    if len(parts) != 3 or parts[0] != CAMPAIGN_PREFIX:
+        return None
+
+    try:
+        return CampaignType(parts[1]), parts[2]
+    except ValueError:
+        return None
+
+
+def live(rows: list[dict]) -> list[dict]:
+    return [row for row in rows if not row.get("deleted")]
+
+
+def texts_of(rows: list[dict], match_type: MatchType) -> set[str]:
+    return {row["text"].lower() for row in rows if row["matchType"] == match_type}
+
+
+def audit_campaign_set(campaign_set: dict, keywords: dict) -> dict:
+    """
+    Check one campaign set against the structure add-keywords maintains.
+
+    `keywords` maps campaign ID to a dict with the campaign's `adgroups`,
+    targeting `keywords` and `negatives`. Returns sorted lists of:
+
+    - conflicts: exact match keywords in a Discovery broad ad group
+    - missing_negatives: Exact or Competitor keywords that aren't exact
+      negatives in the Discovery campaign
+    - missing_discovery: Exact or Competitor keywords without a broad copy
+      in Discovery
+    - duplicates: keywords targeted by both the Exact and Competitor campaigns
+    """
+
+    def campaign_keywords(type: CampaignType) -> list[dict]:
+        campaign = campaign_set.get(type)
+        return live(keywords[campaign["id"]]["keywords"]) if campaign else []
+
+    exact = texts_of(campaign_keywords(CampaignType.exact), MatchType.exact)
+    competitor = texts_of(campaign_keywords(CampaignType.competitor), MatchType.exact)
+    targeted = exact | competitor
+
+    findings = {name: [] for name in FINDINGS}
+    findings["duplicates"] = sorted(exact & competitor)
+
+    discovery = campaign_set.get(CampaignType.discovery)
+    if not discovery:
+        return findings
+
+    discovery_keywords = keywords[discovery["id"]]
+    broad_adgroup_ids = {
+        adgroup["id"]
+        for adgroup in discovery_keywords["adgroups"]
+        if adgroup["name"] in BROAD_ADGROUP_NAMES
+    }
+    broad_rows = [
+        row
+        for row in live(discovery_keywords["keywords"])
+        if row["adGroupId"] in broad_adgroup_ids
+    ]
+
+    negatives = texts_of(live(discovery_keywords["negatives"]), MatchType.exact)
+    broad = texts_of(broad_rows, MatchType.broad)
+
+    findings["conflicts"] = sorted(
+        (row for row in broad_rows if row["matchType"] == MatchType.exact),
+        key=lambda row: row["text"],
+    )
+    findings["missing_negatives"] = sorted(targeted - negatives)
+    findings["missing_discovery"] = sorted(targeted - broad)
+    findings["broad_adgroup_id"] = min(broad_adgroup_ids, default=None)
+
+    return findings
+
+
+def build_fix_plan(campaign_sets: dict, findings: dict) -> list[dict]:
+    """
+    Turn audit findings into API-sized batches of changes. Duplicates
+    between Exact and Competitor are left out, since only the account owner
+    knows which campaign a keyword belongs in.
+    """
+
+    plan = []
+
+    for suffix, set_findings in findings.items():
+        discovery = campaign_sets[suffix].get(CampaignType.discovery)
+        if not discovery:
+            continue
+
+        conflicts_by_adgroup = {}
+        for row in set_findings["conflicts"]:
+            conflicts_by_adgroup.setdefault(row["adGroupId"], []).append(row["id"])
+
+        for adgroup_id, keyword_ids in conflicts_by_adgroup.items():
+            for chunk in chunked(keyword_ids):
+                plan.append(
+                    {
+                        "action": "remove_keywords",
+                        "campaignId": discovery["id"],
+                        "adGroupId": adgroup_id,
+                        "target": discovery["name"],
+                        "keywordIds": chunk,
+                    }
+                )
+
+        for chunk in chunked(set_findings["missing_negatives"]):
+            plan.append(
+                {
+                    "action": "add_negative_keywords",
+                    "campaignId": discovery["id"],
+                    "target": discovery["name"],
+                    "keywords": chunk,
+                }
+            )
+
+        broad_adgroup_id = set_findings.get("broad_adgroup_id")
+        if broad_adgroup_id is None:
+            continue
+
+        for chunk in chunked(set_findings["missing_discovery"]):
+            plan.append(
+                {
+                    "action": "add_keywords",
+                    "campaignId": discovery["id"],
+                    "adGroupId": broad_adgroup_id,
+                    "target": discovery["name"],
+                    "matchType": MatchType.broad.value,
+                    "keywords": chunk,
+                }
+            )
+
+    return plan
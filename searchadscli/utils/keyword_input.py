@@ -0,0 +1,185 @@
+import csv
+import io
+import json
+import math
+import os
+import sys
+from enum import Enum
+from typing import Iterator, TextIO
+import typer
+from searchadscli.utils.config import MatchType
+from searchadscli.utils.keyword_normalize import KeywordNormalizer, describe_report
+
+
+class KeywordFileFormat(str, Enum):
+    auto = "auto"
+    lines = "lines"
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+FORMAT_EXTENSIONS = {
+    ".csv": KeywordFileFormat.csv,
+    ".ndjson": KeywordFileFormat.ndjson,
+    ".jsonl": KeywordFileFormat.ndjson,
+}
+
+TEXT_COLUMNS = ("text", "keyword")
+BID_COLUMNS = ("bid", "bidAmount", "bid_amount")
+MATCH_TYPE_COLUMNS = ("matchType", "match_type")
+
+
+def read_keyword_rows(
+    path: str, file_format: KeywordFileFormat = KeywordFileFormat.auto
+) -> Iterator[dict]:
+    """
+    Stream keyword rows from a file, or stdin when `path` is "-".
+
+    Each row is a dict with a normalized `text` and optional `bid` and
+    `matchType`. Rows are parsed one at a time and duplicates are dropped,
+    so large files never have to fit in memory. Invalid rows are skipped
+    with a warning, and a summary of what was dropped is printed at the end.
+    """
+
+    if file_format == KeywordFileFormat.auto:
+        extension = os.path.splitext(path)[1].lower()
+        file_format = FORMAT_EXTENSIONS.get(extension, KeywordFileFormat.lines)
+
+    if path == "-":
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig")
+        yield from unique_keyword_rows(parse_keyword_rows(stream, file_format))
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as stream:
+            yield from unique_keyword_rows(parse_keyword_rows(stream, file_format))
+
+
+def parse_keyword_rows(
+    stream: TextIO, file_format: KeywordFileFormat
+) -> Iterator[dict]:
+    if file_format == KeywordFileFormat.csv:
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        columns = {name.strip(): idx for idx, name in enumerate(header)}
+        text_column = find_column(columns, TEXT_COLUMNS)
+
+        if text_column is None:
+            # No recognised header, the first column holds the keywords
+            columns = {}
+            text_column = 0
+            if header:
+                yield {"text": header[0]}
+
+        bid_column = find_column(columns, BID_COLUMNS)
+        match_type_column = find_column(columns, MATCH_TYPE_COLUMNS)
+
+        for values in reader:
+            row = {"text": column_value(values, text_column)}
+            if bid_column is not None:
+                row["bid"] = column_value(values, bid_column)
+            if match_type_column is not None:
+                row["matchType"] = column_value(values, match_type_column)
+            yield row
+
+    elif file_format == KeywordFileFormat.ndjson:
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                typer.echo(f"Skipping line {line_number}: invalid JSON.", err=True)
+                continue
+
+            if isinstance(record, str):
+                yield {"text": record}
+                continue
+
+            if not isinstance(record, dict):
+                typer.echo(
+                    f"Skipping line {line_number}: expected a JSON object or string.",
+                    err=True,
+                )
+                continue
+
+            yield {
+                "text": first_of(record, TEXT_COLUMNS),
+                "bid": first_of(record, BID_COLUMNS),
+                "matchType": first_of(record, MATCH_TYPE_COLUMNS),
+            }
+
+    else:
+        for line in stream:
+            yield {"text": line}
+
+
+def unique_keyword_rows(rows: Iterator[dict]) -> Iterator[dict]:
+    normalizer = KeywordNormalizer()
+
+    for row_number, row in enumerate(rows, 1):
+        raw = str(row.get("text") or "")
+        if not raw.strip():
+            continue
+
+        keyword = {}
+
+        # Validate before deduping, so a rejected row doesn't hide a later
+        # valid one with the same text
+        try:
+            bid = row.get("bid")
+            if bid not in (None, ""):
+                keyword["bid"] = parse_bid(bid)
+
+            match_type = row.get("matchType")
+            if match_type not in (None, ""):
+                keyword["matchType"] = MatchType(str(match_type).strip().upper())
+        except (TypeError, ValueError) as e:
+            typer.echo(f"Skipping row {row_number} ({raw.strip()}): {e}", err=True)
+            continue
+
+        text = normalizer.add(raw)
+        if text is None:
+            continue
+
+        yield {"text": text, **keyword}
+
+    for line in describe_report(normalizer.report()):
+        typer.echo(line, err=True)
+
+
+def parse_bid(value) -> float:
+    bid = round(float(value), 2)
+    if not math.isfinite(bid) or bid <= 0:
+        raise ValueError(f"bid must be a positive amount, got {value!r}")
+    return bid
+
+
+def find_column(columns: dict, names: tuple) -> int | None:
+    for name in names:
+        if name in columns:
+            return columns[name]
+    return None
+
+
+def first_of(record: dict, names: tuple):
+    for name in names:
+        if record.get(name) is not None:
+            return record[name]
+    return None
+
+
+def column_value(values: list, idx: int) -> str:
+    return values[idx] if idx < len(values) else ""
+
+
+def keyword_texts(keywords: list) -> list[str]:
+    """
+    Plain keyword texts from a list of keyword strings or keyword rows.
+    """
+
+    return [
+        keyword["text"] if isinstance(keyword, dict) else keyword
+        for keyword in keywords
+    ]
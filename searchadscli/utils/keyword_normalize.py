@@ -0,0 +1,156 @@
+import re
+import unicodedata
+from typing import Iterable
+
+# Apple Search Ads rejects keyword text longer than this
+MAX_KEYWORD_LENGTH = 80
+
+# Control, format and separator characters that can't appear in keyword text
+INVALID_CHARACTERS = re.compile(
+    r"[\x00-\x1f\x7f-\x9f\u200b-\u200f\u202a-\u202e\u2060-\u206f\ufeff]"
+)
+
+# Number of collapsed, too long and invalid keywords kept as examples in a
+# report
+REPORT_EXAMPLE_LIMIT = 10
+
+
+class KeywordNormalizer:
+    """
+    Normalize and dedupe keywords one at a time, keeping the first
+    occurrence of each. Counts what was dropped so callers can report it.
+
+    Keywords are NFKC normalized, lowercased and have their whitespace
+    collapsed, so "Ｐhoto  Editor" and "photo editor" are the same keyword.
+    """
+
+    def __init__(self):
+        # Normalized keyword -> its first raw form, or None when that was
+        # already normalized
+        self.seen = {}
+        self.total = 0
+        self.unique = 0
+        self.duplicates = 0
+        self.collapsed = 0
+        self.too_long = 0
+        self.invalid = 0
+        self.examples = {}
+        self.too_long_examples = []
+        self.invalid_examples = []
+
+    def add(self, raw: str) -> str | None:
+        """
+        Return the normalized keyword, or None if it is empty, invalid or
+        already seen.
+        """
+
+        self.total += 1
+        keyword = normalize_keyword(raw)
+
+        if not keyword:
+            return None
+
+        raw = raw.strip()
+        if keyword in self.seen:
+            self.duplicates += 1
+            first = self.seen[keyword] or keyword
+            if raw != first:
+                self.note_collapsed(keyword, first, raw)
+            return None
+
+        # Rejected keywords aren't recorded as seen, so every repeat is
+        # counted as rejected rather than as a duplicate
+        if len(keyword) > MAX_KEYWORD_LENGTH:
+            self.too_long += 1
+            note_example(self.too_long_examples, keyword)
+            return None
+
+        if INVALID_CHARACTERS.search(keyword):
+            self.invalid += 1
+            note_example(self.invalid_examples, keyword)
+            return None
+
+        self.seen[keyword] = raw if raw != keyword else None
+        self.unique += 1
+        return keyword
+
+    def note_collapsed(self, keyword: str, first: str, raw: str):
+        self.collapsed += 1
+        if keyword in self.examples or len(self.examples) < REPORT_EXAMPLE_LIMIT:
+            variants = self.examples.setdefault(keyword, [first])
+            if raw not in variants:
+                variants.append(raw)
+
+    def report(self) -> dict:
+        return {
+            "total": self.total,
+            "unique": self.unique,
+            "duplicates": self.duplicates,
+            "collapsed": self.collapsed,
+            "too_long": self.too_long,
+            "invalid": self.invalid,
+            "examples": self.examples,
+            "too_long_examples": self.too_long_examples,
+            "invalid_examples": self.invalid_examples,
+        }
+
+
+def note_example(examples: list[str], keyword: str):
+    if len(examples) < REPORT_EXAMPLE_LIMIT and keyword not in examples:
+        examples.append(keyword)
+
+
+def normalize_keyword(raw: str) -> str:
+    text = raw if raw.isascii() else unicodedata.normalize("NFKC", raw)
+    return " ".join(text.lower().split())
+
+
+def normalize_keywords(keywords: Iterable[str]) -> tuple[list[str], dict]:
+    """
+    Normalize and dedupe keywords in one pass, keeping input order.
+    Returns the keywords and a report of what was dropped.
+    """
+
+    normalizer = KeywordNormalizer()
+    result = []
+
+    for raw in keywords:
+        keyword = normalizer.add(raw)
+        if keyword is not None:
+            result.append(keyword)
+
+    return result, normalizer.report()
+
+
+def describe_report(report: dict) -> list[str]:
+    """
+    Human readable lines for a normalization report, empty when nothing
+    was dropped.
+    """
+
+    lines = []
+
+    if report["duplicates"]:
+        line = f"{report['duplicates']} duplicate keywords removed"
+        if report["collapsed"]:
+            line += f", {report['collapsed']} only after normalizing case, spacing or Unicode"
+        lines.append(line + ".")
+
+    for keyword, variants in report["examples"].items():
+        lines.append(
+            f"  {', '.join(repr(variant) for variant in variants)} -> {keyword!r}"
+        )
+
+    if report["too_long"]:
+        lines.append(
+            f"{report['too_long']} keywords longer than {MAX_KEYWORD_LENGTH} characters skipped: "
+            + ", ".join(report["too_long_examples"])
+        )
+
+    if report["invalid"]:
+        lines.append(
+            f"{report['invalid']} keywords with invalid characters skipped: "
+            + ", ".join(repr(keyword) for keyword in report["invalid_examples"])
+        )
+
+    return lines
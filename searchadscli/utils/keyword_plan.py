@@ -0,0 +1,417 @@
+import typer
+from rich.console import Console
+from rich.table import Table
+from searchadscli.utils.adgroups_api import get_cached_adgroups
+from searchadscli.utils.api_client import SearchAdsAPIError
+from searchadscli.utils.bulk import chunked, run_bulk, BULK_CHUNK_SIZE
+from searchadscli.utils.concurrency import map_concurrently, get_concurrency
+from searchadscli.utils.config import CAMPAIGN_STRUCTURE, CampaignType, MatchType
+from searchadscli.utils.keyword_input import keyword_texts
+from searchadscli.utils.keywords_api import (
+    find_targeting_keywords,
+    add_keywords_to_adgroup_api,
+    update_keyword_bids_api,
+    delete_keywords_by_id_api,
+    add_negative_keywords_to_campaign_api,
+)
+from searchadscli.utils.mirror import get_mirror
+
+# Campaign whose keywords are removed when keywords are added to a type
+SIBLING_TYPES = {
+    CampaignType.exact: CampaignType.competitor,
+    CampaignType.competitor: CampaignType.exact,
+}
+
+
+def plan_add_keywords(
+    ctx: typer.Context,
+    org_id: str,
+    campaigns: dict,
+    type: CampaignType,
+    keywords: list[str | dict],
+) -> dict:
+    """
+    Compile adding keywords to an Exact or Competitor campaign into a plan
+    of API calls across its campaign set:
+
+    - add the keywords to the campaign's ad groups
+    - remove them from the sibling Exact or Competitor campaign
+    - add broad match copies to Discovery and exact negatives to it
+
+    Everything the plan needs is read up front, once per campaign, and the
+    resulting writes don't depend on each other. With a synced mirror,
+    keywords that are already in place are left out and the sibling
+    lookups need no API calls.
+
+    Returns `{"reads": [...], "operations": [...]}`. Each operation is one
+    API call.
+    """
+
+    mirror = get_mirror(ctx, org_id)
+    texts = keyword_texts(keywords)
+    sibling_type = SIBLING_TYPES[type]
+
+    involved = [
+        campaign_type
+        for campaign_type in (type, sibling_type, CampaignType.discovery)
+        if campaign_type in campaigns
+    ]
+    reads = []
+    operations = []
+
+    adgroups = load_adgroups(ctx, org_id, [campaigns[t] for t in involved], reads)
+
+    # Keywords for the chosen campaign, with their bids and match types
+    campaign = campaigns[type]
+    for adgroup, structure in structured_adgroups(type, adgroups[campaign["id"]]):
+        if "matchType" in structure:
+            plan_targeting_keywords(
+                operations,
+                org_id,
+                mirror,
+                campaign,
+                adgroup,
+                keywords,
+                structure["matchType"],
+            )
+
+    # Remove them from the sibling campaign
+    if sibling_type in campaigns:
+        sibling = campaigns[sibling_type]
+        sibling_adgroups = [
+            adgroup
+            for adgroup, _ in structured_adgroups(sibling_type, adgroups[sibling["id"]])
+        ]
+        existing = find_existing_keyword_ids(
+            ctx, org_id, mirror, sibling, sibling_adgroups, texts, reads
+        )
+        for adgroup in sibling_adgroups:
+            keyword_ids = dict.fromkeys(existing.get(adgroup["id"], []))
+            for chunk in chunked(keyword_ids):
+                operations.append(
+                    {
+                        "action": "remove_keywords",
+                        "campaignId": sibling["id"],
+                        "adGroupId": adgroup["id"],
+                        "target": f"{sibling['name']} / {adgroup['name']}",
+                        "keywordIds": chunk,
+                    }
+                )
+
+    # Broad copies and exact negatives in Discovery
+    if CampaignType.discovery in campaigns:
+        discovery = campaigns[CampaignType.discovery]
+        for adgroup, structure in structured_adgroups(
+            CampaignType.discovery, adgroups[discovery["id"]]
+        ):
+            if "matchType" in structure:
+                plan_targeting_keywords(
+                    operations,
+                    org_id,
+                    mirror,
+                    discovery,
+                    adgroup,
+                    texts,
+                    structure["matchType"],
+                )
+
+        negatives = texts
+        if mirror:
+            existing = mirror.negative_keywords(org_id, discovery["id"], texts)
+            negatives = [text for text in texts if text not in existing]
+
+        for chunk in chunked(negatives):
+            operations.append(
+                {
+                    "action": "add_negative_keywords",
+                    "campaignId": discovery["id"],
+                    "target": discovery["name"],
+                    "keywords": chunk,
+                }
+            )
+
+    return {"reads": reads, "operations": operations}
+
+
+def plan_bid_updates(updates: list[dict]) -> dict:
+    """
+    Compile `{campaignId, adGroupId, id, bid}` bid changes into a plan of
+    bulk bid updates, one per ad group and chunk of keywords.
+    """
+
+    by_adgroup = {}
+    for update in updates:
+        key = (update["campaignId"], update["adGroupId"])
+        by_adgroup.setdefault(key, []).append(
+            {"id": update["id"], "bid": update["bid"]}
+        )
+
+    operations = []
+    for (campaign_id, adgroup_id), bids in by_adgroup.items():
+        for chunk in chunked(bids):
+            operations.append(
+                {
+                    "action": "update_bids",
+                    "campaignId": campaign_id,
+                    "adGroupId": adgroup_id,
+                    "target": f"campaign {campaign_id} / ad group {adgroup_id}",
+                    "bids": chunk,
+                }
+            )
+
+    return {"reads": [], "operations": operations}
+
+
+def plan_targeting_keywords(
+    operations: list,
+    org_id: str,
+    mirror,
+    campaign: dict,
+    adgroup: dict,
+    keywords: list[str | dict],
+    match_type: MatchType,
+):
+    bid_updates = []
+    if mirror:
+        keywords, bid_updates = mirror.diff_targeting_keywords(
+            org_id, adgroup["id"], keywords, match_type
+        )
+
+    target = f"{campaign['name']} / {adgroup['name']}"
+
+    for chunk in chunked(keywords):
+        operations.append(
+            {
+                "action": "add_keywords",
+                "campaignId": campaign["id"],
+                "adGroupId": adgroup["id"],
+                "target": target,
+                "matchType": match_type.value,
+                "keywords": chunk,
+            }
+        )
+
+    for chunk in chunked(bid_updates):
+        operations.append(
+            {
+                "action": "update_bids",
+                "campaignId": campaign["id"],
+                "adGroupId": adgroup["id"],
+                "target": target,
+                "bids": chunk,
+            }
+        )
+
+
+def load_adgroups(
+    ctx: typer.Context, org_id: str, campaigns: list[dict], reads: list
+) -> dict:
+    """
+    Fetch the ad groups of every campaign concurrently, once each.
+    """
+
+    result = {}
+    for campaign in campaigns:
+        if ctx.obj.get("adgroups", {}).get(f"{org_id}:{campaign['id']}") is None:
+            reads.append(
+                {
+                    "action": "get_adgroups",
+                    "target": campaign["name"],
+                }
+            )
+
+    with Console().status("[dots2]Finding campaign adgroups..."):
+        for campaign, adgroups, error in map_concurrently(
+            lambda campaign: get_cached_adgroups(ctx, org_id, campaign["id"]),
+            campaigns,
+            get_concurrency(ctx),
+        ):
+            if error:
+                exit_with_error(error)
+            result[campaign["id"]] = adgroups
+
+    return result
+
+
+def find_existing_keyword_ids(
+    ctx: typer.Context,
+    org_id: str,
+    mirror,
+    campaign: dict,
+    adgroups: list[dict],
+    texts: list[str],
+    reads: list,
+) -> dict[int, list[int]]:
+    """
+    Map each of the ad groups to the IDs of its keywords among `texts`,
+    using one find per chunk of texts for the whole campaign.
+    """
+
+    found = {}
+
+    if mirror:
+        for adgroup in adgroups:
+            existing = mirror.targeting_keywords(org_id, adgroup["id"], texts)
+            found[adgroup["id"]] = [keyword_id for keyword_id, _ in existing.values()]
+        return found
+
+    if not adgroups:
+        return found
+
+    adgroup_ids = [adgroup["id"] for adgroup in adgroups]
+    chunks = list(chunked(texts))
+    reads.extend(
+        {"action": "find_keywords", "target": campaign["name"]} for _ in chunks
+    )
+
+    def find(chunk: list[str]) -> list[dict]:
+        conditions = [
+            {"field": "adGroupId", "operator": "IN", "values": adgroup_ids},
+            {"field": "text", "operator": "IN", "values": chunk},
+        ]
+        return list(find_targeting_keywords(ctx, org_id, campaign["id"], conditions))
+
+    with Console().status("[dots2]Finding existing keywords..."):
+        for _, keywords, error in map_concurrently(find, chunks, get_concurrency(ctx)):
+            if error:
+                exit_with_error(error)
+            for keyword in keywords:
+                if not keyword.get("deleted"):
+                    found.setdefault(keyword["adGroupId"], []).append(keyword["id"])
+
+    return found
+
+
+def structured_adgroups(type: CampaignType, campaign_adgroups: list[dict]):
+    """
+    Pair the campaign's ad groups with their entry in CAMPAIGN_STRUCTURE.
+    """
+
+    structure = {
+        adgroup["name"]: adgroup for adgroup in CAMPAIGN_STRUCTURE[type]["adgroups"]
+    }
+    return [
+        (adgroup, structure[adgroup["name"]])
+        for adgroup in campaign_adgroups
+        if adgroup["name"] in structure
+    ]
+
+
+def exit_with_error(error: Exception):
+    messages = error.messages if isinstance(error, SearchAdsAPIError) else [str(error)]
+    for message in messages:
+        typer.echo(message)
+    raise typer.Exit(code=1)
+
+
+def operation_items(operation: dict) -> list:
+    return (
+        operation.get("keywords")
+        or operation.get("keywordIds")
+        or operation.get("bids", [])
+    )
+
+
+def execute_operation(ctx: typer.Context, org_id: str, operation: dict, mirror):
+    action = operation["action"]
+    campaign_id = operation["campaignId"]
+
+    if action == "add_keywords":
+        response = add_keywords_to_adgroup_api(
+            ctx,
+            org_id,
+            campaign_id,
+            operation["adGroupId"],
+            operation["keywords"],
+            MatchType(operation["matchType"]),
+        )
+        if mirror and response.status_code == 200:
+            mirror.upsert_targeting_keywords(org_id, response.json()["data"])
+
+    elif action == "update_bids":
+        response = update_keyword_bids_api(
+            ctx, org_id, campaign_id, operation["adGroupId"], operation["bids"]
+        )
+        if mirror and response.status_code == 200:
+            mirror.upsert_targeting_keywords(org_id, response.json()["data"])
+
+    elif action == "remove_keywords":
+        response = delete_keywords_by_id_api(
+            ctx, org_id, campaign_id, operation["adGroupId"], operation["keywordIds"]
+        )
+        if mirror and response.status_code == 200:
+            mirror.forget_targeting_keyword_ids(org_id, operation["keywordIds"])
+
+    elif action == "add_negative_keywords":
+        response = add_negative_keywords_to_campaign_api(
+            ctx, org_id, campaign_id, operation["keywords"]
+        )
+        if mirror and response.status_code == 200:
+            mirror.upsert_negative_keywords(org_id, response.json()["data"])
+
+    else:
+        raise ValueError(f"Unknown plan action: {action}")
+
+    return response
+
+
+def apply_plan(
+    ctx: typer.Context, org_id: str, plan: dict, description: str
+) -> dict[int, list[str]]:
+    """
+    Send every operation of the plan in parallel through the bulk pipeline.
+    Returns the error messages of the failed operations by index.
+    """
+
+    operations = plan["operations"]
+    mirror = get_mirror(ctx, org_id)
+
+    errors = run_bulk(
+        lambda idx, items: execute_operation(ctx, org_id, operations[idx], mirror),
+        ((idx, operation_items(operation)) for idx, operation in enumerate(operations)),
+        description,
+        concurrency=get_concurrency(ctx),
+        total=sum(len(operation_items(operation)) for operation in operations),
+        show_progress=not ctx.obj.get("quiet"),
+    )
+
+    failed = {idx: messages for idx, messages in errors.items() if messages}
+    for idx, messages in failed.items():
+        operation = operations[idx]
+        for message in dict.fromkeys(messages):
+            target = operation.get("target", operation["campaignId"])
+            typer.echo(f"{operation['action']} {target}: {message}")
+
+    return failed
+
+
+def print_plan(plan: dict):
+    """
+    Print the plan's reads and writes with the number of API calls each
+    needs.
+    """
+
+    console = Console()
+
+    table = Table(title="Plan")
+    table.add_column("#", justify="right", style="cyan")
+    table.add_column("Action")
+    table.add_column("Target", style="magenta")
+    table.add_column("Keywords", justify="right")
+
+    for idx, operation in enumerate(plan["operations"], 1):
+        table.add_row(
+            str(idx),
+            operation["action"],
+            operation["target"],
+            str(len(operation_items(operation))),
+        )
+
+    console.print(table)
+
+    reads = len(plan["reads"])
+    writes = len(plan["operations"])
+    console.print(
+        f"{reads} read calls made while planning, {writes} write calls to apply "
+        f"(up to {BULK_CHUNK_SIZE} keywords each, sent in parallel)."
+    )
@@ -1,7 +1,43 @@
 import typer
-import requests
 from searchadscli.utils.config import MatchType
-from searchadscli.utils.access_token import get_access_token
+from searchadscli.utils.api_client import get_client
+from searchadscli.utils.pagination import paginate, find_selector
+
+
+def find_targeting_keywords(
+    ctx: typer.Context,
+    orgId: str,
+    campaign_id: str,
+    conditions: list[dict],
+    prefetch: bool = False,
+):
+    client = get_client(ctx, orgId)
+
+    def fetch_page(offset: int, limit: int):
+        return client.post(
+            f"campaigns/{campaign_id}/adgroups/targetingkeywords/find",
+            json=find_selector(conditions, offset, limit),
+        )
+
+    return paginate(fetch_page, prefetch=prefetch)
+
+
+def find_negative_keywords(
+    ctx: typer.Context,
+    orgId: str,
+    campaign_id: str,
+    conditions: list[dict],
+    prefetch: bool = False,
+):
+    client = get_client(ctx, orgId)
+
+    def fetch_page(offset: int, limit: int):
+        return client.post(
+            f"campaigns/{campaign_id}/negativekeywords/find",
+            json=find_selector(conditions, offset, limit),
+        )
+
+    return paginate(fetch_page, prefetch=prefetch)
 
 
 def add_keywords_to_adgroup_api(
@@ -9,116 +45,88 @@ def add_keywords_to_adgroup_api(
     orgId: str,
     campaign_id: str,
     adgroup_id: str,
-    keywords: list[str],
+    keywords: list[str | dict],
     match_type: MatchType,
 ):
-    access_token = get_access_token(ctx)
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "X-AP-Context": f"orgId={orgId}",
-    }
+    client = get_client(ctx, orgId)
 
-    data = [{"text": keyword, "matchType": match_type.value} for keyword in keywords]
+    data = [keyword_payload(keyword, match_type) for keyword in keywords]
 
-    return requests.post(
-        f"https://api.searchads.apple.com/api/v4/campaigns/{campaign_id}/adgroups/{adgroup_id}/targetingkeywords/bulk",
-        headers=headers,
+    return client.post(
+        f"campaigns/{campaign_id}/adgroups/{adgroup_id}/targetingkeywords/bulk",
         json=data,
     )
 
 
-def remove_keywords_from_adgroup_api(
+def update_keyword_bids_api(
     ctx: typer.Context,
     orgId: str,
     campaign_id: str,
     adgroup_id: str,
-    keywords: list[str],
+    bid_updates: list[dict],
 ):
-    access_token = get_access_token(ctx)
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "X-AP-Context": f"orgId={orgId}",
-    }
-
-    data = {
-        "pagination": {"offset": 0, "limit": 1000},
-        "conditions": [
-            {"field": "adGroupId", "operator": "EQUALS", "values": [adgroup_id]},
-            {"field": "text", "operator": "IN", "values": keywords},
-        ],
-    }
-
-    keywords_response = requests.post(
-        f"https://api.searchads.apple.com/api/v4/campaigns/{campaign_id}/adgroups/targetingkeywords/find",
-        headers=headers,
+    client = get_client(ctx, orgId)
+
+    data = [
+        {
+            "id": update["id"],
+            "bidAmount": {"amount": str(update["bid"]), "currency": "USD"},
+        }
+        for update in bid_updates
+    ]
+
+    return client.put(
+        f"campaigns/{campaign_id}/adgroups/{adgroup_id}/targetingkeywords/bulk",
         json=data,
     )
 
-    if keywords_response.status_code != 200:
-        return keywords_response
 
-    keyword_ids = [item["id"] for item in keywords_response.json()["data"]]
+def keyword_payload(keyword: str | dict, match_type: MatchType) -> dict:
+    """
+    Build a targeting keyword. Keyword rows may override the ad group's
+    match type and carry their own bid.
+    """
 
-    return requests.post(
-        f"https://api.searchads.apple.com/api/v4/campaigns/{campaign_id}/adgroups/{adgroup_id}/targetingkeywords/delete/bulk",
-        headers=headers,
-        json=keyword_ids,
-    )
+    if isinstance(keyword, str):
+        return {"text": keyword, "matchType": match_type.value}
+
+    data = {
+        "text": keyword["text"],
+        "matchType": (keyword.get("matchType") or match_type).value,
+    }
 
+    if keyword.get("bid") is not None:
+        data["bidAmount"] = {"amount": str(keyword["bid"]), "currency": "USD"}
 
-def add_negative_keywords_to_campaign_api(
+    return data
+
+
+def delete_keywords_by_id_api(
     ctx: typer.Context,
     orgId: str,
     campaign_id: str,
-    keywords: list[str],
+    adgroup_id: str,
+    keyword_ids: list[int],
 ):
-    access_token = get_access_token(ctx)
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "X-AP-Context": f"orgId={orgId}",
-    }
-
-    data = [{"text": keyword, "matchType": "EXACT"} for keyword in keywords]
+    client = get_client(ctx, orgId)
 
-    return requests.post(
-        f"https://api.searchads.apple.com/api/v4/campaigns/{campaign_id}/negativekeywords/bulk",
-        headers=headers,
-        json=data,
+    return client.post(
+        f"campaigns/{campaign_id}/adgroups/{adgroup_id}/targetingkeywords/delete/bulk",
+        json=keyword_ids,
     )
 
 
-def remove_negative_keywords_from_campaign_api(
+def add_negative_keywords_to_campaign_api(
     ctx: typer.Context,
     orgId: str,
     campaign_id: str,
     keywords: list[str],
 ):
-    access_token = get_access_token(ctx)
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "X-AP-Context": f"orgId={orgId}",
-    }
+    client = get_client(ctx, orgId)
 
-    data = {
-        "pagination": {"offset": 0, "limit": 1000},
-        "conditions": [
-            {"field": "text", "operator": "IN", "values": keywords},
-        ],
-    }
+    data = [{"text": keyword, "matchType": "EXACT"} for keyword in keywords]
 
-    keywords_response = requests.post(
-        f"https://api.searchads.apple.com/api/v4/campaigns/{campaign_id}/negativekeywords/find",
-        headers=headers,
+    return client.post(
+        f"campaigns/{campaign_id}/negativekeywords/bulk",
         json=data,
     )
-
-    if keywords_response.status_code != 200:
-        return keywords_response
-    
-    keyword_ids = [item["id"] for item in keywords_response.json()["data"]]
-
-    return requests.post(
-        f"https://api.searchads.apple.com/api/v4/campaigns/{campaign_id}/negativekeywords/delete/bulk",
-        headers=headers,
-        json=keyword_ids,
-    )
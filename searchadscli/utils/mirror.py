@@ -0,0 +1,437 @@
+import os
+import json
+import datetime
+import sqlite3
+import threading
+import typer
+from searchadscli.utils.config import MIRROR_PATH, MatchType
+
+# Stay well below SQLite's limit on bound parameters per statement
+QUERY_CHUNK_SIZE = 500
+
+# Seconds after a completed sync that keyword commands trust the mirror.
+# Campaigns changed elsewhere, e.g. in the Search Ads web UI, only show up
+# after the next sync.
+DEFAULT_MIRROR_MAX_AGE = 24 * 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    org_id TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT,
+    serving_status TEXT,
+    countries TEXT,
+    modification_time TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (org_id, id)
+);
+CREATE INDEX IF NOT EXISTS campaigns_name ON campaigns (org_id, name);
+
+CREATE TABLE IF NOT EXISTS adgroups (
+    org_id TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    campaign_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT,
+    modification_time TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (org_id, id)
+);
+CREATE INDEX IF NOT EXISTS adgroups_campaign ON adgroups (org_id, campaign_id);
+
+CREATE TABLE IF NOT EXISTS targeting_keywords (
+    org_id TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    campaign_id INTEGER NOT NULL,
+    adgroup_id INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    match_type TEXT NOT NULL,
+    bid TEXT,
+    status TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    modification_time TEXT,
+    PRIMARY KEY (org_id, id)
+);
+CREATE INDEX IF NOT EXISTS targeting_keywords_text
+    ON targeting_keywords (org_id, adgroup_id, text);
+CREATE INDEX IF NOT EXISTS targeting_keywords_campaign
+    ON targeting_keywords (org_id, campaign_id);
+
+CREATE TABLE IF NOT EXISTS negative_keywords (
+    org_id TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    campaign_id INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    match_type TEXT NOT NULL,
+    status TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    modification_time TEXT,
+    PRIMARY KEY (org_id, id)
+);
+CREATE INDEX IF NOT EXISTS negative_keywords_text
+    ON negative_keywords (org_id, campaign_id, text);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    org_id TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    synced_at TEXT NOT NULL,
+    PRIMARY KEY (org_id, scope)
+);
+"""
+
+
+class Mirror:
+    """
+    Local SQLite copy of an account's campaigns, ad groups, targeting
+    keywords and campaign negative keywords, filled by `searchadscli sync`.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: str = MIRROR_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def last_synced(self, org_id: str, scope: str) -> str | None:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT synced_at FROM sync_state WHERE org_id = ? AND scope = ?",
+                (org_id, scope),
+            ).fetchone()
+        return row[0] if row else None
+
+    def sync_age(self, org_id: str) -> float | None:
+        """
+        Seconds since the last completed sync of an org, or None if it was
+        never synced.
+        """
+
+        synced_at = self.last_synced(org_id, "campaigns")
+        if synced_at is None:
+            return None
+
+        age = datetime.datetime.utcnow() - datetime.datetime.fromisoformat(synced_at)
+        return age.total_seconds()
+
+    def mark_synced(self, org_id: str, scope: str, synced_at: str):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (org_id, scope, synced_at),
+            )
+
+    def replace_campaigns(self, org_id: str, campaigns: list[dict]):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM campaigns WHERE org_id = ?", (org_id,))
+            self.conn.executemany(
+                "INSERT INTO campaigns VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        org_id,
+                        campaign["id"],
+                        campaign["name"],
+                        campaign.get("status"),
+                        campaign.get("servingStatus"),
+                        ",".join(campaign.get("countriesOrRegions", [])),
+                        campaign.get("modificationTime"),
+                        json.dumps(campaign),
+                    )
+                    for campaign in campaigns
+                ],
+            )
+
+            # Drop everything that belonged to campaigns which no longer exist
+            for table in ("adgroups", "targeting_keywords", "negative_keywords"):
+                self.conn.execute(
+                    f"""
+                    DELETE FROM {table} WHERE org_id = ? AND campaign_id NOT IN
+                    (SELECT id FROM campaigns WHERE org_id = ?)
+                    """,
+                    (org_id, org_id),
+                )
+
+    def replace_adgroups(self, org_id: str, campaign_id: int, adgroups: list[dict]):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM adgroups WHERE org_id = ? AND campaign_id = ?",
+                (org_id, campaign_id),
+            )
+            self.conn.executemany(
+                "INSERT INTO adgroups VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        org_id,
+                        adgroup["id"],
+                        campaign_id,
+                        adgroup["name"],
+                        adgroup.get("status"),
+                        adgroup.get("modificationTime"),
+                        json.dumps(adgroup),
+                    )
+                    for adgroup in adgroups
+                ],
+            )
+
+    def upsert_targeting_keywords(
+        self, org_id: str, keywords: list[dict], replace_campaign: int | None = None
+    ):
+        """
+        Store targeting keywords as returned by the API. With
+        `replace_campaign` the campaign's existing rows are dropped first.
+        """
+
+        with self.lock, self.conn:
+            if replace_campaign is not None:
+                self.conn.execute(
+                    "DELETE FROM targeting_keywords WHERE org_id = ? AND campaign_id = ?",
+                    (org_id, replace_campaign),
+                )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO targeting_keywords VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        org_id,
+                        keyword["id"],
+                        keyword["campaignId"],
+                        keyword["adGroupId"],
+                        keyword["text"].lower(),
+                        keyword["matchType"],
+                        (keyword.get("bidAmount") or {}).get("amount"),
+                        keyword.get("status"),
+                        int(bool(keyword.get("deleted"))),
+                        keyword.get("modificationTime"),
+                    )
+                    for keyword in keywords
+                ],
+            )
+
+    def upsert_negative_keywords(
+        self, org_id: str, keywords: list[dict], replace_campaign: int | None = None
+    ):
+        with self.lock, self.conn:
+            if replace_campaign is not None:
+                self.conn.execute(
+                    "DELETE FROM negative_keywords WHERE org_id = ? AND campaign_id = ?",
+                    (org_id, replace_campaign),
+                )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO negative_keywords VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        org_id,
+                        keyword["id"],
+                        keyword["campaignId"],
+                        keyword["text"].lower(),
+                        keyword["matchType"],
+                        keyword.get("status"),
+                        int(bool(keyword.get("deleted"))),
+                        keyword.get("modificationTime"),
+                    )
+                    for keyword in keywords
+                ],
+            )
+
+    def targeting_keywords(
+        self, org_id: str, adgroup_id: int, texts: list[str]
+    ) -> dict[tuple[str, str], tuple[int, str | None]]:
+        """
+        Map (text, match type) of the ad group's keywords among `texts` to
+        their keyword ID and bid.
+        """
+
+        found = {}
+        for chunk in query_chunks(texts):
+            with self.lock:
+                rows = self.conn.execute(
+                    f"""
+                    SELECT text, match_type, id, bid FROM targeting_keywords
+                    WHERE org_id = ? AND adgroup_id = ? AND deleted = 0
+                    AND text IN ({", ".join("?" * len(chunk))})
+                    """,
+                    (org_id, adgroup_id, *chunk),
+                ).fetchall()
+            for text, match_type, keyword_id, bid in rows:
+                found[(text, match_type)] = (keyword_id, bid)
+        return found
+
+    def negative_keywords(
+        self, org_id: str, campaign_id: int, texts: list[str]
+    ) -> set[str]:
+        found = set()
+        for chunk in query_chunks(texts):
+            with self.lock:
+                rows = self.conn.execute(
+                    f"""
+                    SELECT text FROM negative_keywords
+                    WHERE org_id = ? AND campaign_id = ? AND deleted = 0
+                    AND text IN ({", ".join("?" * len(chunk))})
+                    """,
+                    (org_id, campaign_id, *chunk),
+                ).fetchall()
+            found.update(text for (text,) in rows)
+        return found
+
+    def forget_targeting_keywords(self, org_id: str, adgroup_id: int, texts: list):
+        for chunk in query_chunks(texts):
+            with self.lock, self.conn:
+                self.conn.execute(
+                    f"""
+                    UPDATE targeting_keywords SET deleted = 1
+                    WHERE org_id = ? AND adgroup_id = ?
+                    AND text IN ({", ".join("?" * len(chunk))})
+                    """,
+                    (org_id, adgroup_id, *chunk),
+                )
+
+    def forget_targeting_keyword_ids(self, org_id: str, keyword_ids: list[int]):
+        for chunk in query_chunks(keyword_ids):
+            with self.lock, self.conn:
+                self.conn.execute(
+                    f"""
+                    UPDATE targeting_keywords SET deleted = 1
+                    WHERE org_id = ? AND id IN ({", ".join("?" * len(chunk))})
+                    """,
+                    (org_id, *chunk),
+                )
+
+    def campaign_adgroups(self, org_id: str, campaign_id: int) -> list[dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, name FROM adgroups WHERE org_id = ? AND campaign_id = ?",
+                (org_id, campaign_id),
+            ).fetchall()
+        return [{"id": adgroup_id, "name": name} for adgroup_id, name in rows]
+
+    def campaign_targeting_keywords(self, org_id: str, campaign_id: int) -> list[dict]:
+        """
+        The campaign's live targeting keywords, shaped like API results.
+        """
+
+        with self.lock:
+            rows = self.conn.execute(
+                """
+                SELECT id, adgroup_id, text, match_type FROM targeting_keywords
+                WHERE org_id = ? AND campaign_id = ? AND deleted = 0
+                """,
+                (org_id, campaign_id),
+            ).fetchall()
+        return [
+            {
+                "id": keyword_id,
+                "campaignId": campaign_id,
+                "adGroupId": adgroup_id,
+                "text": text,
+                "matchType": match_type,
+            }
+            for keyword_id, adgroup_id, text, match_type in rows
+        ]
+
+    def campaign_negative_keywords(self, org_id: str, campaign_id: int) -> list[dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                """
+                SELECT id, text, match_type FROM negative_keywords
+                WHERE org_id = ? AND campaign_id = ? AND deleted = 0
+                """,
+                (org_id, campaign_id),
+            ).fetchall()
+        return [
+            {
+                "id": keyword_id,
+                "campaignId": campaign_id,
+                "text": text,
+                "matchType": match_type,
+            }
+            for keyword_id, text, match_type in rows
+        ]
+
+    def diff_targeting_keywords(
+        self,
+        org_id: str,
+        adgroup_id: int,
+        keywords: list[str | dict],
+        match_type: MatchType,
+    ) -> tuple[list[str | dict], list[dict]]:
+        """
+        Split keywords into those the ad group doesn't have yet and bid
+        updates for those it has with a different bid. Keywords that already
+        exist unchanged are dropped.
+        """
+
+        texts = [text_of(keyword) for keyword in keywords]
+        existing = self.targeting_keywords(org_id, adgroup_id, texts)
+
+        missing = []
+        bid_updates = []
+        for keyword in keywords:
+            wanted_match_type = match_type
+            wanted_bid = None
+            if isinstance(keyword, dict):
+                wanted_match_type = keyword.get("matchType") or match_type
+                wanted_bid = keyword.get("bid")
+
+            current = existing.get((text_of(keyword), wanted_match_type.value))
+            if current is None:
+                missing.append(keyword)
+                continue
+
+            keyword_id, current_bid = current
+            if wanted_bid is not None and (
+                current_bid is None or float(current_bid) != wanted_bid
+            ):
+                bid_updates.append({"id": keyword_id, "bid": wanted_bid})
+
+        return missing, bid_updates
+
+
+def text_of(keyword: str | dict) -> str:
+    return keyword["text"] if isinstance(keyword, dict) else keyword
+
+
+def query_chunks(items: list) -> list[list]:
+    items = list(items)
+    return [
+        items[idx : idx + QUERY_CHUNK_SIZE]
+        for idx in range(0, len(items), QUERY_CHUNK_SIZE)
+    ]
+
+
+def get_mirror(ctx: typer.Context, org_id: str) -> Mirror | None:
+    """
+    Return the local mirror when it has been synced for this org within
+    `mirror_max_age` seconds, or None so callers fall back to asking the
+    API. A mirror that is too old is reported once per command.
+    """
+
+    if "mirror" not in ctx.obj:
+        ctx.obj["mirror"] = Mirror() if os.path.exists(MIRROR_PATH) else None
+
+    mirror = ctx.obj["mirror"]
+    age = mirror.sync_age(org_id) if mirror else None
+    if age is None:
+        return None
+
+    max_age = ctx.obj["config"].get("mirror_max_age")
+    if max_age is None:
+        max_age = DEFAULT_MIRROR_MAX_AGE
+
+    if max_age and age > max_age:
+        warned = ctx.obj.setdefault("stale_mirrors", set())
+        if org_id not in warned:
+            warned.add(org_id)
+            typer.echo(
+                f"Warning: The local mirror of org {org_id} was last synced "
+                f"{age / 3600:.0f} hours ago, asking the API instead. "
+                "Run `searchadscli sync` to refresh it.",
+                err=True,
+            )
+        return None
+
+    return mirror
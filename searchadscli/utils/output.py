@@ -0,0 +1,83 @@
+import csv
+import json
+import sys
+from functools import partial
+from enum import Enum
+from typing import Callable, Iterable, TextIO
+
+# Records written between flushes, one API page. Not imported from
+# pagination, which would load the HTTP stack at startup.
+FLUSH_EVERY = 1000
+
+
+class OutputFormat(str, Enum):
+    table = "table"
+    json = "json"
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+def write_records(
+    records: Iterable[dict],
+    format: OutputFormat,
+    csv_columns: dict[str, Callable[[dict], object]] | None = None,
+    stream: TextIO | None = None,
+    flush_every: int = FLUSH_EVERY,
+) -> int:
+    """
+    Write records as they arrive, never holding more than one in memory.
+
+    JSON and NDJSON get the records as returned by the API. CSV gets one
+    column per entry of `csv_columns`, mapping the header to a function
+    that picks the value from a record, or without `csv_columns` one column
+    per key of the first record. Output is flushed after the first
+    record and then once per page, so pipelines see rows while later pages
+    are still downloading. Returns the number of records written.
+    """
+
+    stream = stream or sys.stdout
+    count = 0
+
+    writer = None
+    if format == OutputFormat.csv and csv_columns is not None:
+        writer = csv.writer(stream)
+        writer.writerow(csv_columns)
+
+    if format == OutputFormat.json:
+        stream.write("[")
+
+    for record in records:
+        if format == OutputFormat.csv:
+            if writer is None:
+                csv_columns = {key: partial(field_of, key=key) for key in record}
+                writer = csv.writer(stream)
+                writer.writerow(csv_columns)
+            writer.writerow([value(record) for value in csv_columns.values()])
+        elif format == OutputFormat.json:
+            stream.write(",\n" if count else "\n")
+            stream.write(json.dumps(record))
+        else:
+            stream.write(json.dumps(record))
+            stream.write("\n")
+
+        count += 1
+        if count == 1 or count % flush_every == 0:
+            stream.flush()
+
+    if format == OutputFormat.json:
+        stream.write("\n]\n" if count else "]\n")
+
+    stream.flush()
+    return count
+
+
+def field_of(record: dict, key: str) -> object:
+    return record.get(key, "")
+
+
+def amount_of(record: dict, field: str) -> str:
+    return (record.get(field) or {}).get("amount", "")
+
+
+def currency_of(record: dict, field: str) -> str:
+    return (record.get(field) or {}).get("currency", "")
@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+import requests
+from searchadscli.utils.api_client import SearchAdsAPIError
+
+PAGE_SIZE = 1000
+
+
+def paginate(
+    fetch_page: Callable[[int, int], requests.Response],
+    page_size: int = PAGE_SIZE,
+    prefetch: bool = False,
+    items_of: Callable[[dict], list] = lambda body: body.get("data") or [],
+) -> Iterator[dict]:
+    """
+    Lazily yield every item of a paginated Search Ads endpoint.
+
+    `fetch_page(offset, limit)` requests a single page. Pages are requested
+    until `pagination.totalResults` items have been seen. With `prefetch`
+    the next page is requested in the background while the caller works
+    through the current one. `items_of` picks the items out of a response
+    body, for endpoints that don't return them as `data`.
+    """
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    offset = 0
+
+    try:
+        response = fetch_page(offset, page_size)
+
+        while True:
+            if response.status_code != 200:
+                raise SearchAdsAPIError(response)
+
+            body = response.json()
+            items = items_of(body)
+            pagination = body.get("pagination") or {}
+            total_results = pagination.get("totalResults", offset + len(items))
+
+            offset += len(items)
+            has_more = bool(items) and offset < total_results
+
+            next_page = None
+            if has_more and executor:
+                next_page = executor.submit(fetch_page, offset, page_size)
+
+            yield from items
+
+            if not has_more:
+                return
+
+            response = (
+                next_page.result() if next_page else fetch_page(offset, page_size)
+            )
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def find_selector(conditions: list[dict], offset: int, limit: int) -> dict:
+    """
+    Build the selector body used by the `find` endpoints.
+    """
+
+    return {
+        "pagination": {"offset": offset, "limit": limit},
+        "conditions": conditions,
+    }
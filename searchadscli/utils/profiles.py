@@ -0,0 +1,103 @@
+import click
+import typer
+from typing import Callable
+from searchadscli.utils.concurrency import map_concurrently
+
+DEFAULT_PROFILE = "default"
+
+
+def get_profiles(config: dict) -> dict[str, dict]:
+    """
+    Every profile in the config file with its full settings. The top level
+    values form the "default" profile, and named profiles under `profiles`
+    override them, so shared credentials only need to be set once.
+    """
+
+    base = {key: value for key, value in config.items() if key != "profiles"}
+    profiles = {DEFAULT_PROFILE: base}
+
+    for name, overrides in config.get("profiles", {}).items():
+        profiles[name] = {**base, **overrides}
+
+    return profiles
+
+
+def get_profile_config(config: dict, profile: str | None) -> dict:
+    if not profile or profile == DEFAULT_PROFILE:
+        return get_profiles(config)[DEFAULT_PROFILE]
+
+    profiles = get_profiles(config)
+    if profile not in profiles:
+        typer.echo(
+            f"Error: Unknown profile '{profile}'. Known profiles: {', '.join(profiles)}."
+        )
+        raise typer.Exit(code=1)
+
+    return profiles[profile]
+
+
+def resolve_targets(
+    config: dict, all_profiles: bool, orgs: list[str] | None
+) -> list[tuple[str, dict]]:
+    """
+    Turn `--all-profiles` or `--orgs` into `(label, config)` targets. An org
+    uses the profile configured for it, or the default profile with its
+    org_id swapped. `--all-profiles` runs once for every org that has a
+    profile, under the first profile configured for it.
+    """
+
+    profiles = get_profiles(config)
+
+    by_org = {}
+    for name, profile in profiles.items():
+        if profile.get("org_id"):
+            by_org.setdefault(str(profile["org_id"]), (name, profile))
+
+    if all_profiles:
+        return list(by_org.values())
+
+    return [
+        (
+            org_id,
+            (
+                by_org[org_id][1]
+                if org_id in by_org
+                else {**profiles[DEFAULT_PROFILE], "org_id": org_id}
+            ),
+        )
+        for org_id in dict.fromkeys(orgs)
+    ]
+
+
+def child_context(ctx: typer.Context, config: dict) -> typer.Context:
+    """
+    A context of its own for one target, so each org gets its own access
+    token, API clients, connection pools and caches. The trace is shared.
+    """
+
+    obj = {
+        "config": config,
+        "concurrency": ctx.obj.get("concurrency"),
+        "quiet": True,
+        "tracer": ctx.obj.get("tracer"),
+    }
+    return click.Context(ctx.command, parent=ctx, info_name=ctx.info_name, obj=obj)
+
+
+def run_for_targets(
+    ctx: typer.Context, fn: Callable[[typer.Context], object]
+) -> list[tuple[str, object, Exception | None]]:
+    """
+    Run `fn` for every target at the same time, each with its own context.
+    Returns `(label, result, error)` in target order.
+    """
+
+    targets = ctx.obj["targets"]
+    results = {}
+
+    for (label, config), result, error in map_concurrently(
+        lambda target: fn(child_context(ctx, target[1])), targets, len(targets)
+    ):
+        results[label] = (result, error)
+
+    return [(label, *results[label]) for label, _ in targets]
@@ -0,0 +1,124 @@
+import cProfile
+import os
+import re
+import sys
+import threading
+import typer
+
+# Seconds between stack samples of every thread
+SAMPLE_INTERVAL = 0.005
+
+# `ThreadPoolExecutor-0_3` and `ThreadPoolExecutor-1_0` share one flame graph root
+THREAD_NUMBER = re.compile(r"[-_]\d+")
+
+# Innermost frames of threads that are idle, waiting for work or a lock,
+# as (file name ending, function). Their samples are left out.
+IDLE_FRAMES = {
+    ("concurrent/futures/thread.py", "_worker"),
+    ("threading.py", "Condition.wait"),
+    ("threading.py", "Event.wait"),
+    ("queue.py", "Queue.get"),
+}
+
+
+class Profiler:
+    """
+    Profiles one CLI run two ways:
+
+    - cProfile counts every call on the main thread, written as pstats to
+      `<path>.prof` (snakeviz, `python -m pstats`).
+    - A sampling thread records the stacks of every thread, including the
+      workers of concurrent API calls, written as collapsed stacks to
+      `<path>.collapsed` (flamegraph.pl, speedscope, inferno). Samples are
+      wall clock, so threads waiting on the network show up in socket
+      frames. Idle threads waiting for work are left out.
+    """
+
+    def __init__(self, path: str, interval: float = SAMPLE_INTERVAL):
+        base, extension = os.path.splitext(path)
+        self.base = base if extension in (".prof", ".collapsed") else path
+        self.interval = interval
+        self.profile = cProfile.Profile()
+        self.samples = {}
+        self.labels = {}
+        self.stopped = threading.Event()
+        self.sampler = threading.Thread(
+            target=self.sample, name="searchadscli-profiler", daemon=True
+        )
+
+    def start(self):
+        self.sampler.start()
+        self.profile.enable()
+
+    def stop(self) -> tuple[str, str]:
+        """
+        Stop profiling and write both files. Returns their paths.
+        """
+
+        self.profile.disable()
+        self.stopped.set()
+        self.sampler.join()
+
+        pstats_path = f"{self.base}.prof"
+        collapsed_path = f"{self.base}.collapsed"
+
+        self.profile.dump_stats(pstats_path)
+        with open(collapsed_path, "w") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+
+        return pstats_path, collapsed_path
+
+    def sample(self):
+        own_id = threading.get_ident()
+
+        while not self.stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or is_idle(frame.f_code):
+                    continue
+
+                frames = []
+                while frame is not None:
+                    frames.append(self.label(frame.f_code))
+                    frame = frame.f_back
+
+                thread_name = THREAD_NUMBER.sub("", names.get(thread_id, "thread"))
+                stack = ";".join([thread_name, *reversed(frames)])
+                self.samples[stack] = self.samples.get(stack, 0) + 1
+
+    def label(self, code) -> str:
+        """
+        `function (module/path.py:line)` of a code object, the way py-spy
+        names frames, with the `sys.path` prefix dropped.
+        """
+
+        label = self.labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            for prefix in sorted(sys.path, key=len, reverse=True):
+                if prefix and filename.startswith(prefix + os.sep):
+                    filename = filename[len(prefix) + 1 :]
+                    break
+            label = self.labels[code] = (
+                f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+            )
+        return label
+
+
+def is_idle(code) -> bool:
+    filename = code.co_filename.replace(os.sep, "/")
+    return any(
+        filename.endswith(ending) and code.co_qualname == function
+        for ending, function in IDLE_FRAMES
+    )
+
+
+def report_profile(profiler: Profiler):
+    pstats_path, collapsed_path = profiler.stop()
+    typer.echo(
+        f"Wrote profile to {pstats_path} (pstats) and {collapsed_path} "
+        f"(collapsed stacks, e.g. flamegraph.pl {collapsed_path} > profile.svg)",
+        err=True,
+    )
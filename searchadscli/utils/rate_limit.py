@@ -0,0 +1,78 @@
+import time
+import threading
+import typer
+
+DEFAULT_RATE_LIMIT = 10
+
+_limiters_lock = threading.Lock()
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing `rate` requests per second on average,
+    with bursts of up to `burst` requests. `pause` holds every caller back,
+    e.g. after the API has throttled a request.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.resume_at = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+
+                if now < self.resume_at:
+                    wait = self.resume_at - now
+                else:
+                    self.tokens = min(
+                        self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                    )
+                    self.updated_at = now
+
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+
+                    wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """
+        Stop handing out tokens for `seconds`, then resume from an empty
+        bucket so callers don't burst straight back into the limit.
+        """
+
+        with self.lock:
+            self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+            self.tokens = 0.0
+            self.updated_at = self.resume_at
+
+
+def get_rate_limiter(ctx: typer.Context, orgId: str) -> RateLimiter:
+    """
+    Return the shared limiter for an org, creating it on first use. The
+    org's own limit from `org_rate_limits` wins over the global `rate_limit`.
+    """
+
+    with _limiters_lock:
+        limiters = ctx.obj.setdefault("rate_limiters", {})
+        limiter = limiters.get(orgId)
+
+        if limiter is None:
+            config = ctx.obj["config"]
+            rate = (
+                config.get("org_rate_limits", {}).get(str(orgId))
+                or config.get("rate_limit")
+                or DEFAULT_RATE_LIMIT
+            )
+            limiter = RateLimiter(rate)
+            limiters[orgId] = limiter
+
+        return limiter
@@ -0,0 +1,311 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import typer
+import uuid
+from typing import Iterator
+from searchadscli.utils.concurrency import iterate_concurrently, get_concurrency
+from searchadscli.utils.config import REPORT_CACHE_PATH, ReportLevel, Granularity
+from searchadscli.utils.reports_api import date_chunks, fetch_records
+
+# Apple keeps adjusting report data for a few days. Days newer than this are
+# cached but fetched again on the next run.
+SETTLE_DAYS = 3
+
+# Cached rows read from the database at a time
+QUERY_PAGE_SIZE = 1000
+
+# Fetched report rows written to the cache at a time
+CACHE_WRITE_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS report_days (
+    org_id TEXT NOT NULL,
+    level TEXT NOT NULL,
+    campaign_id INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    fetch_id TEXT NOT NULL,
+    final INTEGER NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (org_id, level, campaign_id, day)
+);
+
+CREATE TABLE IF NOT EXISTS report_rows (
+    org_id TEXT NOT NULL,
+    level TEXT NOT NULL,
+    campaign_id INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    fetch_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS report_rows_day
+    ON report_rows (org_id, level, campaign_id, day, fetch_id);
+"""
+
+
+class ReportCache:
+    """
+    Daily report rows on disk, partitioned by org, report level, campaign
+    and day. A day is only served once it has been fetched completely, and
+    only stops being fetched again once it is older than SETTLE_DAYS.
+
+    Rows of a fetch are written as they arrive under its `fetch_id` and only
+    replace the cached rows of a day once the fetch has succeeded. Campaign
+    reports use campaign ID 0. Safe to share between threads.
+    """
+
+    def __init__(self, path: str = REPORT_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def missing_days(
+        self,
+        org_id: str,
+        level: ReportLevel,
+        campaign_id: int | None,
+        start: datetime.date,
+        end: datetime.date,
+    ) -> list[datetime.date]:
+        """
+        Days of the range that aren't cached or may still change.
+        """
+
+        with self.lock:
+            final = {
+                day
+                for (day,) in self.conn.execute(
+                    "SELECT day FROM report_days WHERE org_id = ? AND level = ? "
+                    "AND campaign_id = ? AND day BETWEEN ? AND ? AND final = 1",
+                    (
+                        org_id,
+                        level.value,
+                        campaign_id or 0,
+                        start.isoformat(),
+                        end.isoformat(),
+                    ),
+                )
+            }
+
+        return [day for day in days_between(start, end) if day.isoformat() not in final]
+
+    def add_rows(
+        self,
+        org_id: str,
+        level: ReportLevel,
+        campaign_id: int | None,
+        fetch_id: str,
+        records: list[dict],
+    ):
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO report_rows VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        org_id,
+                        level.value,
+                        campaign_id or 0,
+                        record["date"],
+                        fetch_id,
+                        json.dumps(record),
+                    )
+                    for record in records
+                ],
+            )
+
+    def complete_days(
+        self,
+        org_id: str,
+        level: ReportLevel,
+        campaign_id: int | None,
+        fetch_id: str,
+        start: datetime.date,
+        end: datetime.date,
+    ):
+        """
+        Serve the rows of `fetch_id` for these days from now on, dropping
+        those of earlier fetches.
+        """
+
+        today = datetime.datetime.utcnow().date()
+        settled = today - datetime.timedelta(days=SETTLE_DAYS)
+        fetched_at = datetime.datetime.utcnow().isoformat(timespec="seconds")
+        key = (org_id, level.value, campaign_id or 0)
+
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM report_rows WHERE org_id = ? AND level = ? "
+                "AND campaign_id = ? AND day BETWEEN ? AND ? AND fetch_id != ?",
+                (*key, start.isoformat(), end.isoformat(), fetch_id),
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO report_days VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (*key, day.isoformat(), fetch_id, int(day < settled), fetched_at)
+                    for day in days_between(start, end)
+                ],
+            )
+
+    def discard_days(
+        self,
+        org_id: str,
+        level: ReportLevel,
+        campaign_id: int | None,
+        fetch_id: str,
+        start: datetime.date,
+        end: datetime.date,
+    ):
+        """
+        Drop the rows a failed fetch left behind for these days.
+        """
+
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM report_rows WHERE org_id = ? AND level = ? "
+                "AND campaign_id = ? AND day BETWEEN ? AND ? AND fetch_id = ?",
+                (
+                    org_id,
+                    level.value,
+                    campaign_id or 0,
+                    start.isoformat(),
+                    end.isoformat(),
+                    fetch_id,
+                ),
+            )
+
+    def rows(
+        self,
+        org_id: str,
+        level: ReportLevel,
+        campaign_id: int | None,
+        start: datetime.date,
+        end: datetime.date,
+    ) -> Iterator[dict]:
+        """
+        Cached rows of the completed days of the range, in date order.
+        """
+
+        with self.lock:
+            cursor = self.conn.execute(
+                "SELECT r.data FROM report_rows r JOIN report_days d "
+                "ON r.org_id = d.org_id AND r.level = d.level "
+                "AND r.campaign_id = d.campaign_id AND r.day = d.day "
+                "AND r.fetch_id = d.fetch_id "
+                "WHERE r.org_id = ? AND r.level = ? AND r.campaign_id = ? "
+                "AND r.day BETWEEN ? AND ? ORDER BY r.day, r.rowid",
+                (
+                    org_id,
+                    level.value,
+                    campaign_id or 0,
+                    start.isoformat(),
+                    end.isoformat(),
+                ),
+            )
+
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(QUERY_PAGE_SIZE)
+            if not rows:
+                return
+            for (data,) in rows:
+                yield json.loads(data)
+
+
+def cached_report(
+    ctx: typer.Context,
+    org_id: str,
+    level: ReportLevel,
+    campaign_ids: list[int | None],
+    start: datetime.date,
+    end: datetime.date,
+    chunk_days: int,
+):
+    """
+    Fetch the days of a daily report that aren't in the report cache or may
+    still change, store them, and return a generator of the whole range
+    from the cache, the failed requests and the number of requests.
+    """
+
+    cache = ReportCache()
+    fetch_id = uuid.uuid4().hex
+
+    report_requests = [
+        (campaign_id, chunk_start, chunk_end)
+        for campaign_id in campaign_ids
+        for range_start, range_end in day_ranges(
+            cache.missing_days(org_id, level, campaign_id, start, end)
+        )
+        for chunk_start, chunk_end in date_chunks(range_start, range_end, chunk_days)
+    ]
+    failures = []
+
+    def records():
+        pending = {}
+        for request, record, error in iterate_concurrently(
+            lambda request: fetch_records(
+                ctx, org_id, level, Granularity.daily, *request
+            ),
+            report_requests,
+            get_concurrency(ctx),
+        ):
+            if error:
+                failures.append((request, error))
+                continue
+
+            rows = pending.setdefault(request[0], [])
+            rows.append(record)
+            if len(rows) >= CACHE_WRITE_SIZE:
+                cache.add_rows(org_id, level, request[0], fetch_id, rows)
+                pending[request[0]] = []
+
+        for campaign_id, rows in pending.items():
+            cache.add_rows(org_id, level, campaign_id, fetch_id, rows)
+
+        failed = {request for request, _ in failures}
+        for campaign_id, chunk_start, chunk_end in report_requests:
+            if (campaign_id, chunk_start, chunk_end) in failed:
+                cache.discard_days(
+                    org_id, level, campaign_id, fetch_id, chunk_start, chunk_end
+                )
+            else:
+                cache.complete_days(
+                    org_id, level, campaign_id, fetch_id, chunk_start, chunk_end
+                )
+
+        for campaign_id in campaign_ids:
+            yield from cache.rows(org_id, level, campaign_id, start, end)
+
+        cache.close()
+
+    return records(), failures, len(report_requests)
+
+
+def days_between(start: datetime.date, end: datetime.date) -> list[datetime.date]:
+    return [
+        start + datetime.timedelta(days=offset)
+        for offset in range((end - start).days + 1)
+    ]
+
+
+def day_ranges(
+    days: list[datetime.date],
+) -> list[tuple[datetime.date, datetime.date]]:
+    """
+    Group sorted days into inclusive ranges of consecutive days.
+    """
+
+    ranges = []
+    for day in days:
+        if ranges and ranges[-1][1] + datetime.timedelta(days=1) == day:
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
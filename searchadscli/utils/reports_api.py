@@ -0,0 +1,198 @@
+import datetime
+import json
+import typer
+from searchadscli.utils.api_client import get_client
+from searchadscli.utils.concurrency import iterate_concurrently, get_concurrency
+from searchadscli.utils.config import ReportLevel, Granularity
+from searchadscli.utils.pagination import paginate
+
+# Days of data a single report request may cover, by granularity. `None`
+# is a report of row totals without a breakdown.
+MAX_CHUNK_DAYS = {
+    Granularity.hourly: 30,
+    Granularity.daily: 90,
+    Granularity.weekly: 365,
+    Granularity.monthly: 365,
+    None: 90,
+}
+
+# Days of data a single report request covers by default, small enough that
+# a long range turns into several requests that are fetched at once
+DEFAULT_CHUNK_DAYS = {
+    Granularity.hourly: 7,
+    Granularity.daily: 30,
+    Granularity.weekly: 365,
+    Granularity.monthly: 365,
+    None: 30,
+}
+
+
+def report_path(level: ReportLevel, campaign_id: int | None = None) -> str:
+    if level == ReportLevel.campaigns:
+        return "reports/campaigns"
+    return f"reports/campaigns/{campaign_id}/{level.value}"
+
+
+def date_chunks(
+    start: datetime.date, end: datetime.date, days: int
+) -> list[tuple[datetime.date, datetime.date]]:
+    """
+    Split the inclusive range from `start` to `end` into consecutive
+    inclusive ranges of at most `days` days.
+    """
+
+    chunks = []
+    while start <= end:
+        chunk_end = min(start + datetime.timedelta(days=days - 1), end)
+        chunks.append((start, chunk_end))
+        start = chunk_end + datetime.timedelta(days=1)
+    return chunks
+
+
+def get_report(
+    ctx: typer.Context,
+    orgId: str,
+    level: ReportLevel,
+    start: datetime.date,
+    end: datetime.date,
+    granularity: Granularity | None = None,
+    campaign_id: int | None = None,
+    prefetch: bool = False,
+):
+    """
+    Lazily yield the rows of one report, requesting further pages of rows
+    for reports larger than a single response.
+    """
+
+    client = get_client(ctx, orgId)
+    path = report_path(level, campaign_id)
+
+    def fetch_page(offset: int, limit: int):
+        data = {
+            "startTime": start.isoformat(),
+            "endTime": end.isoformat(),
+            "selector": {
+                "orderBy": [{"field": "localSpend", "sortOrder": "DESCENDING"}],
+                "pagination": {"offset": offset, "limit": limit},
+            },
+            "timeZone": "UTC",
+            "returnRecordsWithNoMetrics": False,
+            "returnRowTotals": granularity is None,
+            "returnGrandTotals": False,
+        }
+        if granularity:
+            data["granularity"] = granularity.value
+
+        return client.post(path, json=data)
+
+    def rows_of(body: dict) -> list:
+        data = body.get("data") or {}
+        return (data.get("reportingDataResponse") or {}).get("row") or []
+
+    return paginate(fetch_page, prefetch=prefetch, items_of=rows_of)
+
+
+def fetch_report(
+    ctx: typer.Context,
+    org_id: str,
+    level: ReportLevel,
+    campaign_ids: list[int | None],
+    start: datetime.date,
+    end: datetime.date,
+    granularity: Granularity | None,
+    chunk_days: int,
+):
+    """
+    Fetch the report's date chunks at the same time and return a generator
+    of their rows in the order they arrive, the list that failed requests
+    are added to as it runs, and the number of requests.
+    """
+
+    report_requests = [
+        (campaign_id, chunk_start, chunk_end)
+        for campaign_id in campaign_ids
+        for chunk_start, chunk_end in date_chunks(start, end, chunk_days)
+    ]
+    failures = []
+
+    def records():
+        for request, record, error in iterate_concurrently(
+            lambda request: fetch_records(ctx, org_id, level, granularity, *request),
+            report_requests,
+            get_concurrency(ctx),
+        ):
+            if error:
+                failures.append((request, error))
+            else:
+                yield record
+
+    return records(), failures, len(report_requests)
+
+
+def fetch_records(
+    ctx: typer.Context,
+    org_id: str,
+    level: ReportLevel,
+    granularity: Granularity | None,
+    campaign_id: int | None,
+    start: datetime.date,
+    end: datetime.date,
+):
+    for row in get_report(
+        ctx,
+        org_id,
+        level,
+        start,
+        end,
+        granularity,
+        campaign_id,
+        prefetch=True,
+    ):
+        for record in report_records(row, start, end):
+            # Only campaign reports name the campaign in their rows
+            yield {"campaignId": campaign_id, **record} if campaign_id else record
+
+
+def report_records(row: dict, start: datetime.date, end: datetime.date):
+    """
+    Flatten a report row into one record per granularity entry, or a single
+    record of its totals for the chunk's dates.
+    """
+
+    metadata = flatten(row.get("metadata") or {})
+
+    if row.get("granularity"):
+        for entry in row["granularity"]:
+            yield {**metadata, **flatten(entry)}
+    else:
+        yield {
+            **metadata,
+            "startDate": start.isoformat(),
+            "endDate": end.isoformat(),
+            **flatten(row.get("total") or {}),
+        }
+
+
+def flatten(values: dict, prefix: str = "") -> dict:
+    """
+    Turn a nested report object into flat columns. Money becomes an amount
+    column and a `Currency` column, lists of values become space separated.
+    """
+
+    flat = {}
+    for key, value in values.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            if set(value) == {"amount", "currency"}:
+                flat[name] = value["amount"]
+                flat[f"{name}Currency"] = value["currency"]
+            else:
+                flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, list):
+            if all(not isinstance(item, (dict, list)) for item in value):
+                flat[name] = " ".join(str(item) for item in value)
+            else:
+                flat[name] = json.dumps(value)
+        else:
+            flat[name] = value
+    return flat
@@ -0,0 +1,78 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+import requests
+
+# Throttled and transient server errors that are safe to send again
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE"}
+
+
+def is_idempotent(method: str, path: str) -> bool:
+    """
+    Whether sending the request twice has the same effect as sending it
+    once. Besides GET, PUT and DELETE, that holds for the POSTs that only
+    read: `find` selectors and reports. Other POSTs create campaigns, ad
+    groups or keywords.
+    """
+
+    if method.upper() in IDEMPOTENT_METHODS:
+        return True
+
+    path = path.strip("/")
+    return path.endswith("/find") or path == "find" or path.startswith("reports/")
+
+
+def never_reached_server(error: requests.RequestException) -> bool:
+    """
+    Whether a request failed before any of it was sent, so the server can't
+    have acted on it: the connection could not be opened.
+    """
+
+    from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, (ConnectTimeoutError, NewConnectionError))
+
+
+def retry_after_seconds(response: requests.Response) -> float | None:
+    """
+    Seconds to wait according to the response's `Retry-After` header, which
+    may be a number of seconds or an HTTP date.
+    """
+
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: float | None = None) -> float:
+    """
+    Jittered exponential backoff for the given zero-based retry attempt.
+    A `Retry-After` from the server is honored, with a little jitter on top
+    so waiting threads don't all resume at once.
+    """
+
+    if retry_after is not None:
+        retry_after = min(BACKOFF_CAP, retry_after)
+        return retry_after + random.uniform(0, min(BACKOFF_BASE, retry_after / 4))
+
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
@@ -0,0 +1,69 @@
+import os
+import json
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Hold an exclusive lock on `path`.lock for the duration of the block.
+    Parallel CLI processes queue on the lock instead of racing each other.
+    """
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "a") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def read_json(path: str) -> dict:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_json(path: str, data: dict):
+    """
+    Atomically replace `path` with `data`, readable only by the current user.
+    """
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def locked_json_store(path: str):
+    """
+    Yield the JSON object stored at `path` while holding its lock.
+    Changes made to the yielded dict are written back on exit.
+    """
+
+    with file_lock(path):
+        data = read_json(path)
+        original = json.dumps(data, sort_keys=True)
+        yield data
+        if json.dumps(data, sort_keys=True) != original:
+            write_json(path, data)
@@ -0,0 +1,254 @@
+import json
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+import typer
+
+# OpenTelemetry span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+# IDs in API paths, so every campaign's ad groups share one endpoint
+ID_SEGMENT = re.compile(r"(?<=/)\d+(?=/|$)")
+
+
+class Tracer:
+    """
+    Collects timing spans for one CLI run. Spans nest within a thread; spans
+    started on worker threads hang off the run's root span.
+    """
+
+    def __init__(self, name: str):
+        self.trace_id = os.urandom(16).hex()
+        self.spans = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.root = self.new_span(name, SPAN_KIND_INTERNAL, None, {})
+
+    def new_span(self, name: str, kind: int, parent: dict | None, attributes: dict):
+        return {
+            "name": name,
+            "kind": kind,
+            "spanId": os.urandom(8).hex(),
+            "parentSpanId": parent["spanId"] if parent else None,
+            "start": time.time_ns(),
+            "end": None,
+            "attributes": attributes,
+            "error": None,
+        }
+
+    @contextmanager
+    def span(self, name: str, kind: int = SPAN_KIND_INTERNAL, **attributes):
+        """
+        Time the block as a span. Yields its attributes, which the block
+        may add to. An exception leaving the block marks the span failed.
+        """
+
+        stack = self.local.__dict__.setdefault("stack", [])
+        span = self.new_span(name, kind, stack[-1] if stack else self.root, attributes)
+        stack.append(span)
+        try:
+            yield span["attributes"]
+        except BaseException as e:
+            span["error"] = type(e).__name__
+            raise
+        finally:
+            span["end"] = time.time_ns()
+            stack.pop()
+            with self.lock:
+                self.spans.append(span)
+
+    def finish(self):
+        if self.root["end"] is None:
+            self.root["end"] = time.time_ns()
+
+    def summary(self) -> list[dict]:
+        """
+        Count, failures, retries and latency percentiles per span name, slowest
+        total first.
+        """
+
+        by_name = {}
+        with self.lock:
+            for span in self.spans:
+                by_name.setdefault(span["name"], []).append(span)
+
+        rows = []
+        for name, spans in by_name.items():
+            durations = sorted((span["end"] - span["start"]) / 1e6 for span in spans)
+            rows.append(
+                {
+                    "name": name,
+                    "count": len(spans),
+                    "errors": sum(1 for span in spans if span_failed(span)),
+                    "retries": sum(
+                        span["attributes"].get("searchads.retries", 0) for span in spans
+                    ),
+                    "p50": percentile(durations, 0.5),
+                    "p95": percentile(durations, 0.95),
+                    "total": sum(durations) / 1000,
+                }
+            )
+
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def wall_time(self) -> float:
+        end = self.root["end"] or time.time_ns()
+        return (end - self.root["start"]) / 1e9
+
+    def export(self, path: str):
+        """
+        Write every span as OTLP JSON, which OpenTelemetry collectors and
+        trace viewers such as Jaeger import.
+        """
+
+        with self.lock:
+            spans = [self.root, *self.spans]
+
+        document = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": otlp_attributes({"service.name": "searchadscli"})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "searchadscli"},
+                            "spans": [self.otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+        with open(path, "w") as f:
+            json.dump(document, f)
+
+    def otlp_span(self, span: dict) -> dict:
+        otlp = {
+            "traceId": self.trace_id,
+            "spanId": span["spanId"],
+            "name": span["name"],
+            "kind": span["kind"],
+            "startTimeUnixNano": str(span["start"]),
+            "endTimeUnixNano": str(span["end"] or span["start"]),
+            "attributes": otlp_attributes(span["attributes"]),
+            "status": {"code": STATUS_UNSET},
+        }
+        if span["parentSpanId"]:
+            otlp["parentSpanId"] = span["parentSpanId"]
+        if span_failed(span):
+            otlp["status"] = {
+                "code": STATUS_ERROR,
+                "message": span["error"]
+                or f"HTTP {span['attributes']['http.response.status_code']}",
+            }
+        return otlp
+
+
+def span_failed(span: dict) -> bool:
+    return bool(span["error"]) or (
+        span["attributes"].get("http.response.status_code", 0) >= 400
+    )
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    # Nearest rank of sorted values
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+def otlp_attributes(attributes: dict) -> list[dict]:
+    converted = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        converted.append({"key": key, "value": typed})
+    return converted
+
+
+def endpoint_of(method: str, path: str) -> str:
+    """
+    `POST campaigns/{id}/adgroups/{id}/targetingkeywords/bulk` for a path
+    with IDs in it.
+    """
+
+    return f"{method} {ID_SEGMENT.sub('{id}', '/' + path.lstrip('/'))[1:]}"
+
+
+@contextmanager
+def trace_span(
+    ctx: typer.Context, name: str, kind: int = SPAN_KIND_INTERNAL, **attributes
+):
+    """
+    A span on the run's tracer, or nothing when `--trace` is off. Yields the
+    span's attributes either way, so callers can fill them in unconditionally.
+    """
+
+    tracer = ctx.obj.get("tracer")
+    if tracer is None:
+        yield attributes
+        return
+
+    with tracer.span(name, kind, **attributes) as span_attributes:
+        yield span_attributes
+
+
+def report_trace(tracer: Tracer, trace_file: str | None = None):
+    """
+    Print the per-endpoint summary to stderr, and write the spans to
+    `trace_file` if given.
+    """
+
+    from rich.console import Console
+    from rich.table import Table
+
+    tracer.finish()
+
+    table = Table(title=f"Trace: {tracer.wall_time():.2f}s wall time")
+    table.add_column("Span", overflow="fold")
+    for column, style in (
+        ("Count", "cyan"),
+        ("Errors", "red"),
+        ("Retries", "yellow"),
+        ("p50 ms", None),
+        ("p95 ms", None),
+        ("Total s", None),
+    ):
+        table.add_column(column, justify="right", style=style, no_wrap=True)
+
+    for row in tracer.summary():
+        table.add_row(
+            row["name"],
+            str(row["count"]),
+            str(row["errors"]),
+            str(row["retries"]),
+            f"{row['p50']:.1f}",
+            f"{row['p95']:.1f}",
+            f"{row['total']:.2f}",
+        )
+
+    console = Console(stderr=True)
+    console.print(table)
+
+    if trace_file:
+        try:
+            tracer.export(trace_file)
+        except OSError as e:
+            typer.echo(f"Error: Could not write trace to {trace_file}: {e}", err=True)
+        else:
+            typer.echo(f"Wrote trace to {trace_file}", err=True)
@@ -0,0 +1,134 @@
+import datetime as dt
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from searchadscli.utils import api_client
+from searchadscli.utils.api_client import SearchAdsClient
+from searchadscli.utils.retry import is_idempotent
+
+
+class ApplyThenFail(BaseHTTPRequestHandler):
+    """
+    Applies every create, then answers with the status the test asked for,
+    like a server that fails after committing.
+    """
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.received.append((self.path, body))
+        status, headers = self.server.responses.pop(0)
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ApplyThenFail)
+    server.received = []
+    server.responses = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server, monkeypatch):
+    monkeypatch.setattr(api_client.time, "sleep", lambda seconds: None)
+
+    host, port = server.server_address
+    ctx = SimpleNamespace(
+        obj={
+            "config": {"rate_limit": 1_000_000},
+            "access_token": "test",
+            "access_token_expiry": dt.datetime.utcnow() + dt.timedelta(hours=1),
+        }
+    )
+    client = SearchAdsClient(ctx, "1", base_url=f"http://{host}:{port}/api/v4")
+    yield client
+    client.close()
+
+
+def test_create_applied_before_error_is_not_retried(server, client):
+    server.responses = [(500, {}), (200, {})]
+
+    response = client.post("campaigns", json={"name": "SearchAdsCLI_exact_US-1"})
+
+    assert response.status_code == 500
+    assert len(server.received) == 1
+    assert client.stats["retried"] == 0
+    assert client.stats["failed"] == 1
+
+
+def test_create_throttled_with_retry_after_is_retried(server, client):
+    server.responses = [(429, {"Retry-After": "0"}), (200, {})]
+
+    response = client.post("campaigns", json={"name": "SearchAdsCLI_exact_US-1"})
+
+    assert response.status_code == 200
+    assert len(server.received) == 2
+    assert client.stats["throttled"] == 1
+
+
+def test_create_throttled_without_retry_after_is_not_retried(server, client):
+    server.responses = [(429, {}), (200, {})]
+
+    response = client.post("campaigns", json={"name": "SearchAdsCLI_exact_US-1"})
+
+    assert response.status_code == 429
+    assert len(server.received) == 1
+
+
+def test_find_is_retried(server, client):
+    server.responses = [(500, {}), (503, {}), (200, {})]
+
+    response = client.post("campaigns/find", json={})
+
+    assert response.status_code == 200
+    assert len(server.received) == 3
+    assert client.stats["retried"] == 2
+
+
+def test_create_is_retried_when_connection_is_refused(client, monkeypatch):
+    # Nothing listens on the port any more, so nothing was sent
+    unused = ThreadingHTTPServer(("127.0.0.1", 0), ApplyThenFail)
+    host, port = unused.server_address
+    unused.server_close()
+    client.base_url = f"http://{host}:{port}/api/v4"
+
+    with pytest.raises(requests.ConnectionError):
+        client.post("campaigns", json={})
+
+    assert client.stats["requests"] == client.max_retries + 1
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("GET", "campaigns/1", True),
+        ("PUT", "campaigns/1", True),
+        ("DELETE", "campaigns/1/adgroups/2", True),
+        ("POST", "campaigns/find", True),
+        ("POST", "campaigns/1/adgroups/2/targetingkeywords/find", True),
+        ("POST", "reports/campaigns", True),
+        ("POST", "campaigns", False),
+        ("POST", "campaigns/1/adgroups", False),
+        ("POST", "campaigns/1/negativekeywords/bulk", False),
+        ("POST", "campaigns/1/adgroups/2/targetingkeywords/delete/bulk", False),
+    ],
+)
+def test_is_idempotent(method, path, expected):
+    assert is_idempotent(method, path) == expected
@@ -0,0 +1,44 @@
+from searchadscli.utils.campaign_index import CampaignIndex
+from searchadscli.utils.config import CampaignType
+
+
+def campaign(id: int, name: str, status="ENABLED", modified="2024-01-01T00:00:00"):
+    return {"id": id, "name": name, "status": status, "modificationTime": modified}
+
+
+def test_groups_campaign_sets():
+    index = CampaignIndex(
+        [
+            campaign(1, "SearchAdsCLI_exact_US-GB-1234"),
+            campaign(2, "SearchAdsCLI_discovery_US-GB-1234"),
+            campaign(3, "Something else"),
+        ]
+    )
+
+    assert len(index) == 2
+    assert index.get(CampaignType.exact, ("US", "GB"), 1234)["id"] == 1
+    assert set(index.campaign_sets()["US-GB-1234"]) == {
+        CampaignType.exact,
+        CampaignType.discovery,
+    }
+    assert index.collisions == {}
+
+
+def test_prefers_enabled_then_most_recently_modified_campaign():
+    name = "SearchAdsCLI_exact_US-1234"
+    index = CampaignIndex(
+        [
+            campaign(1, name, modified="2024-01-01T00:00:00"),
+            campaign(2, name, modified="2024-03-01T00:00:00"),
+            campaign(3, name, status="PAUSED", modified="2024-05-01T00:00:00"),
+        ]
+    )
+
+    assert index.get(CampaignType.exact, ("US",), "1234")["id"] == 2
+    assert [
+        c["id"] for c in index.collisions[(CampaignType.exact, ("US",), "1234")]
+    ] == [
+        2,
+        1,
+        3,
+    ]
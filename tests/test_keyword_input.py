@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from searchadscli.utils.config import MatchType
+from searchadscli.utils.keyword_input import read_keyword_rows
+
+
+def read_ndjson(tmp_path, records: list) -> list[dict]:
+    path = tmp_path / "keywords.ndjson"
+    path.write_text("\n".join(json.dumps(record) for record in records))
+    return list(read_keyword_rows(str(path)))
+
+
+def test_reads_ndjson_objects_and_strings(tmp_path):
+    rows = read_ndjson(
+        tmp_path,
+        [
+            {"text": "Photo Editor", "bid": "1.234", "matchType": "broad"},
+            "collage maker",
+        ],
+    )
+
+    assert rows == [
+        {"text": "photo editor", "bid": 1.23, "matchType": MatchType.broad},
+        {"text": "collage maker"},
+    ]
+
+
+@pytest.mark.parametrize("bid", [[1], {"amount": 1}, "abc", "nan", "inf", "-3", 0])
+def test_skips_rows_with_invalid_bids(tmp_path, capsys, bid):
+    rows = read_ndjson(tmp_path, [{"text": "photo", "bid": bid}])
+
+    assert rows == []
+    assert "Skipping row 1 (photo)" in capsys.readouterr().err
+
+
+def test_skips_rows_with_invalid_match_types(tmp_path, capsys):
+    rows = read_ndjson(tmp_path, [{"text": "photo", "matchType": "fuzzy"}])
+
+    assert rows == []
+    assert "Skipping row 1 (photo)" in capsys.readouterr().err
+
+
+def test_rejected_row_does_not_hide_a_later_valid_one(tmp_path):
+    rows = read_ndjson(
+        tmp_path, [{"text": "Photo", "bid": "x"}, {"text": "photo", "bid": 1}]
+    )
+
+    assert rows == [{"text": "photo", "bid": 1.0}]
+
+
+@pytest.mark.parametrize("record", [5, [1], None, True])
+def test_skips_ndjson_records_that_are_not_objects_or_strings(tmp_path, capsys, record):
+    rows = read_ndjson(tmp_path, [record, "photo"])
+
+    assert rows == [{"text": "photo"}]
+    assert "Skipping line 1: expected a JSON object or string." in (
+        capsys.readouterr().err
+    )
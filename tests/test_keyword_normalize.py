@@ -0,0 +1,83 @@
+from searchadscli.utils.keyword_normalize import (
+    MAX_KEYWORD_LENGTH,
+    REPORT_EXAMPLE_LIMIT,
+    KeywordNormalizer,
+    describe_report,
+    normalize_keywords,
+)
+
+
+def test_add_returns_normalized_keyword_once():
+    normalizer = KeywordNormalizer()
+
+    assert normalizer.add("  Ｐhoto   Editor\n") == "photo editor"
+    assert normalizer.add("photo editor") is None
+    assert normalizer.add("   ") is None
+
+    report = normalizer.report()
+    assert report["total"] == 3
+    assert report["unique"] == 1
+    assert report["duplicates"] == 1
+
+
+def test_exact_repeats_are_not_collapsed():
+    _, report = normalize_keywords(["Photo", "Photo\n", " Photo "])
+
+    assert report["duplicates"] == 2
+    assert report["collapsed"] == 0
+    assert report["examples"] == {}
+
+
+def test_variants_are_collapsed_with_their_first_form():
+    keywords, report = normalize_keywords(["Photo", "PHOTO", "photo", "PHOTO"])
+
+    assert keywords == ["photo"]
+    assert report["duplicates"] == 3
+    assert report["collapsed"] == 3
+    assert report["examples"] == {"photo": ["Photo", "PHOTO", "photo"]}
+
+
+def test_repeated_too_long_keyword_is_not_a_duplicate():
+    long_keyword = "x" * (MAX_KEYWORD_LENGTH + 10)
+
+    keywords, report = normalize_keywords([long_keyword, long_keyword])
+
+    assert keywords == []
+    assert report["too_long"] == 2
+    assert report["duplicates"] == 0
+    assert report["too_long_examples"] == [long_keyword]
+
+
+def test_repeated_invalid_keyword_is_not_a_duplicate():
+    keywords, report = normalize_keywords(["a\u200bb", "a\u200bb", "ab"])
+
+    assert keywords == ["ab"]
+    assert report["invalid"] == 2
+    assert report["duplicates"] == 0
+    assert report["invalid_examples"] == ["a\u200bb"]
+
+
+def test_examples_are_capped():
+    too_long = [
+        f"{idx} " + "x" * MAX_KEYWORD_LENGTH for idx in range(REPORT_EXAMPLE_LIMIT * 2)
+    ]
+
+    _, report = normalize_keywords(too_long)
+
+    assert report["too_long"] == REPORT_EXAMPLE_LIMIT * 2
+    assert len(report["too_long_examples"]) == REPORT_EXAMPLE_LIMIT
+
+
+def test_describe_report():
+    _, report = normalize_keywords(["Photo", "photo", "x" * (MAX_KEYWORD_LENGTH + 1)])
+
+    lines = describe_report(report)
+
+    assert lines[0] == (
+        "1 duplicate keywords removed, 1 only after normalizing case, spacing or Unicode."
+    )
+    assert lines[1] == "  'Photo', 'photo' -> 'photo'"
+    assert lines[2].startswith(
+        f"1 keywords longer than {MAX_KEYWORD_LENGTH} characters skipped"
+    )
+    assert describe_report(normalize_keywords(["photo"])[1]) == []